@@ -10,19 +10,36 @@ import numpy as np
 import os
 from datetime import datetime
 
+from class_names import GRADE_DTYPE, GRADES, extract_grade, map_distinct, standardize_class_name
+from excel_reader import read_excel_rows
+from roster_cache import build_name_index, load_roster_cache, save_roster_cache
+
 class StudentIDMatcher:
     def __init__(self):
         self.student_info_file = "25.8.19学生信息.xls"
         self.score_file = "2025年09月23日-2025年09月24日 成绩.xlsx" 
         self.output_file = "2025年09月23日-2025年09月24日 成绩_含学号.xlsx"
+        # 学生信息按姓名建立的行号索引 {姓名: 行号数组}，由 load_student_info 生成
+        self.name_index = None
         
     def load_student_info(self):
         """加载学生信息文件"""
         print("=== 加载学生信息文件 ===")
         try:
-            # 尝试读取Excel文件
-            df_info = pd.read_excel(self.student_info_file)
-            print(f"成功读取学生信息文件，共{len(df_info)}条记录")
+            # 学生信息文件未变化时直接使用缓存
+            cached = load_roster_cache(self.student_info_file)
+            if cached is not None:
+                df_info, self.name_index = cached
+                print(f"使用学生信息缓存，共{len(df_info)}条记录")
+            else:
+                # 尝试读取Excel文件
+                df_info = read_excel_rows(self.student_info_file)
+                print(f"成功读取学生信息文件，共{len(df_info)}条记录")
+                df_info = self.roster_table(df_info)
+                name_columns, _, _ = self.info_columns(df_info)
+                if name_columns:
+                    self.name_index = build_name_index(df_info[name_columns[0]])
+                    save_roster_cache(self.student_info_file, df_info, self.name_index)
             print("学生信息文件列名:", df_info.columns.tolist())
             
             # 显示前几行数据以了解结构
@@ -39,7 +56,7 @@ class StudentIDMatcher:
         """加载成绩数据文件"""
         print("\n=== 加载成绩数据文件 ===")
         try:
-            df_score = pd.read_excel(self.score_file)
+            df_score = read_excel_rows(self.score_file)
             print(f"成功读取成绩文件，共{len(df_score)}条记录")
             print("成绩文件列名:", df_score.columns.tolist())
             
@@ -53,21 +70,32 @@ class StudentIDMatcher:
             print(f"读取成绩数据文件失败: {e}")
             return None
     
+    def info_columns(self, df_info):
+        """学生信息文件中的姓名、班级、教育ID候选列"""
+        name_columns = [col for col in df_info.columns if '姓名' in str(col) or 'name' in str(col).lower()]
+        class_columns = [col for col in df_info.columns if '班' in str(col) or 'class' in str(col).lower()]
+        id_columns = [col for col in df_info.columns if 'ID' in str(col).upper() or '号' in str(col) or '编号' in str(col)]
+        return name_columns, class_columns, id_columns
+    
+    def roster_table(self, df_info):
+        """只保留匹配用到的列（姓名、年级、班级、教育ID），列顺序不变，选出的匹配字段与完整数据相同"""
+        keep = {'姓名', '年级', '班级'}
+        for candidates in self.info_columns(df_info):
+            if candidates:
+                keep.add(candidates[0])
+        return df_info[[col for col in df_info.columns if col in keep]].copy()
+    
     def find_matching_columns(self, df_info, df_score):
         """分析两个文件的匹配字段"""
         print("\n=== 分析匹配字段 ===")
         
-        # 尝试找到姓名相关的列
-        name_columns_info = [col for col in df_info.columns if '姓名' in str(col) or 'name' in str(col).lower()]
-        name_columns_score = [col for col in df_score.columns if '姓名' in str(col) or 'name' in str(col).lower()]
+        # 尝试找到学生信息文件中姓名、班级、教育ID相关的列
+        name_columns_info, class_columns_info, id_columns_info = self.info_columns(df_info)
         
-        # 尝试找到班级相关的列
-        class_columns_info = [col for col in df_info.columns if '班' in str(col) or 'class' in str(col).lower()]
+        # 尝试找到成绩文件中姓名、班级相关的列
+        name_columns_score = [col for col in df_score.columns if '姓名' in str(col) or 'name' in str(col).lower()]
         class_columns_score = [col for col in df_score.columns if '班级名称' in str(col) or '班' in str(col)]
         
-        # 尝试找到教育ID相关的列
-        id_columns_info = [col for col in df_info.columns if 'ID' in str(col).upper() or '号' in str(col) or '编号' in str(col)]
-        
         print(f"学生信息文件中的姓名列: {name_columns_info}")
         print(f"成绩文件中的姓名列: {name_columns_score}")
         print(f"学生信息文件中的班级列: {class_columns_info}")
@@ -93,51 +121,11 @@ class StudentIDMatcher:
     
     def standardize_class_name(self, class_name):
         """标准化班级名称格式"""
-        if pd.isna(class_name):
-            return ""
-        
-        class_str = str(class_name).strip()
-        
-        # 提取年级和班号
-        import re
-        # 匹配各种可能的班级格式
-        patterns = [
-            r'([一二三四五六]年级)?(\d+)班',
-            r'([1-6])年级(\d+)班',
-            r'([一二三四五六])(\d+)班',
-            r'(\d+)年级(\d+)班'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, class_str)
-            if match:
-                if len(match.groups()) == 2:
-                    grade_part = match.group(1)
-                    class_num = match.group(2)
-                    
-                    # 标准化年级部分
-                    if grade_part:
-                        if grade_part.isdigit():
-                            grade_map = {'1': '一年级', '2': '二年级', '3': '三年级', 
-                                       '4': '四年级', '5': '五年级', '6': '六年级'}
-                            grade_part = grade_map.get(grade_part, grade_part + '年级')
-                        elif grade_part in ['一', '二', '三', '四', '五', '六']:
-                            grade_part += '年级'
-                    
-                    return f"{grade_part}{class_num}班"
-        
-        return class_str
+        return standardize_class_name(class_name)
     
     def extract_grade_from_class_name(self, class_name):
         """从班级名称中提取年级"""
-        if pd.isna(class_name):
-            return ""
-        
-        class_str = str(class_name).strip()
-        for grade in ['一年级', '二年级', '三年级', '四年级', '五年级', '六年级']:
-            if grade in class_str:
-                return grade
-        return ""
+        return extract_grade(class_name, missing="")
     
     def match_students(self, df_info, df_score, columns):
         """匹配学生信息 - 要求姓名+年级+班级三重匹配"""
@@ -150,20 +138,25 @@ class StudentIDMatcher:
         # 准备匹配用的数据
         print("准备匹配数据...")
         
+        # 按姓名查找学生信息的行号索引（未经 load_student_info 加载时现场建立）
+        name_index = self.name_index
+        if name_index is None:
+            name_index = build_name_index(df_info[columns['name_info']])
+        
         # 学生信息文件已经有独立的年级和班级列，不需要从班级名称中提取
         # df_info['年级'] 已经存在，使用原有数据
-        df_info['标准化班级'] = df_info[columns['class_info']].apply(self.standardize_class_name)
+        # 每种班级名称只解析一次
+        df_info['标准化班级'] = map_distinct(df_info[columns['class_info']], standardize_class_name)
         
         # 从成绩文件提取年级和班级信息
-        df_score['年级'] = df_score[columns['class_score']].apply(self.extract_grade_from_class_name)
-        df_score['标准化班级'] = df_score[columns['class_score']].apply(self.standardize_class_name)
+        df_score['年级'] = map_distinct(df_score[columns['class_score']], self.extract_grade_from_class_name)
+        df_score['标准化班级'] = map_distinct(df_score[columns['class_score']], standardize_class_name)
         
         # 创建学号字段（如果不存在）
         if '学籍号' not in df_score.columns:
             df_score['学籍号'] = np.nan
         
         # 匹配统计
-        matched_count = 0
         total_score_students = len(df_score)
         duplicate_warnings = []  # 收集重复学生的警告
         
@@ -173,7 +166,7 @@ class StudentIDMatcher:
         # 按年级统计学生数量
         grade_counts_score = df_score['年级'].value_counts()
         print(f"\n成绩文件各年级学生数量:")
-        for grade in ['一年级', '二年级', '三年级', '四年级', '五年级', '六年级']:
+        for grade in GRADES:
             count = grade_counts_score.get(grade, 0)
             if count > 0:
                 print(f"  {grade}: {count} 名")
@@ -181,7 +174,7 @@ class StudentIDMatcher:
         # 显示学生信息文件中的年级分布
         grade_counts_info = df_info['年级'].value_counts()
         print(f"\n学生信息文件各年级学生数量:")
-        for grade in ['一年级', '二年级', '三年级', '四年级', '五年级', '六年级']:
+        for grade in GRADES:
             count = grade_counts_info.get(grade, 0)
             if count > 0:
                 print(f"  {grade}: {count} 名")
@@ -217,88 +210,83 @@ class StudentIDMatcher:
             for cls in sample_classes:
                 print(f"  原始班级: {cls}")
         
-        # 逐个匹配
-        for idx, score_row in df_score.iterrows():
-            name = score_row[columns['name_score']]
-            score_grade = score_row.get('年级', '')
-            score_class = score_row.get('标准化班级', '')
-            
-            if pd.isna(name):
-                continue
-            
-            # 如果是一年级，跳过匹配（一年级学生没有学号）
-            if score_grade == '一年级':
-                continue
-            
+        # 预先建立学生信息的索引（行号按原顺序排列）：
+        # 姓名 → 行号（name_index）、(姓名, 年级) → 行号、(姓名, 年级, 班级) → 行号
+        info_ids = df_info[columns['id_info']].to_numpy()
+        info_names = df_info[columns['name_info']].reset_index(drop=True)
+        info_grades = df_info['年级'].reset_index(drop=True)
+        info_classes = df_info['班级'].reset_index(drop=True)
+        positions = pd.Series(np.arange(len(df_info)))
+        grade_index = positions.groupby([info_names, info_grades], sort=False).indices
+        class_index = positions.groupby([info_names, info_grades, info_classes], sort=False).indices
+        
+        # 成绩文件的年级和班级转换为学生信息文件的格式
+        # 成绩文件：年级="二年级"，班级="二年级1班"
+        # 学生信息文件：年级="2年级"，班级="1班"
+        grade_numbers = {grade: f"{number}年级" for number, grade in enumerate(GRADES, 1)}
+        score_grades_converted = df_score['年级'].replace(grade_numbers)
+        score_class_nums = (df_score['标准化班级'].str.extract(r'(\d+)班', expand=False) + '班').fillna('')
+        
+        # 一年级学生没有学号，不参与匹配
+        score_names = df_score[columns['name_score']]
+        eligible = np.flatnonzero(score_names.notna() & (df_score['年级'] != '一年级'))
+        
+        # 逐个查找索引，匹配到的行最后一次写入学籍号
+        matched_rows = []
+        matched_positions = []
+        for row, name, score_grade, score_grade_converted, score_class_num in zip(
+                eligible,
+                score_names.to_numpy()[eligible],
+                df_score['年级'].to_numpy()[eligible],
+                score_grades_converted.to_numpy()[eligible],
+                score_class_nums.to_numpy()[eligible]):
             # 第一步：按姓名匹配
-            name_matches = df_info[df_info[columns['name_info']] == name]
+            name_matches = name_index.get(name, [])
             
             if len(name_matches) == 0:
                 # 没有姓名匹配项
                 continue
             elif len(name_matches) == 1:
                 # 唯一姓名匹配
-                student_id = name_matches.iloc[0][columns['id_info']]
-                df_score.loc[idx, '学籍号'] = student_id
-                matched_count += 1
+                position = name_matches[0]
             else:
                 # 多个同名学生，用年级+班级进一步区分
-                # 成绩文件：年级="二年级"，班级="二年级1班"
-                # 学生信息文件：年级="2年级"，班级="1班"
-                
-                # 转换年级格式：二年级 -> 2年级
-                score_grade_converted = score_grade.replace('一年级', '1年级').replace('二年级', '2年级').replace('三年级', '3年级').replace('四年级', '4年级').replace('五年级', '5年级').replace('六年级', '6年级')
-                
-                # 从成绩文件的班级名称中提取班号："二年级1班" -> "1班"
-                import re
-                class_num_match = re.search(r'(\d+)班', score_class)
-                if class_num_match:
-                    score_class_num = class_num_match.group(1) + '班'  # "1班"
-                else:
-                    score_class_num = ""
-                
                 # 第二步：按年级匹配
-                grade_matches = name_matches[name_matches['年级'] == score_grade_converted]
+                grade_matches = grade_index.get((name, score_grade_converted), [])
                 
                 if len(grade_matches) == 0:
                     # 年级不匹配，报告并使用第一个记录
-                    duplicate_warnings.append(f"⚠️ 学生 {name} 年级不匹配 (成绩文件:{score_grade} vs 学生信息:{name_matches['年级'].unique()})")
-                    student_id = name_matches.iloc[0][columns['id_info']]
-                    df_score.loc[idx, '学籍号'] = student_id
-                    matched_count += 1
+                    duplicate_warnings.append(f"⚠️ 学生 {name} 年级不匹配 (成绩文件:{score_grade} vs 学生信息:{pd.unique(info_grades.to_numpy()[name_matches])})")
+                    position = name_matches[0]
                 elif len(grade_matches) == 1:
                     # 年级唯一匹配，使用该记录
-                    student_id = grade_matches.iloc[0][columns['id_info']]
-                    df_score.loc[idx, '学籍号'] = student_id
-                    matched_count += 1
-                else:
+                    position = grade_matches[0]
+                elif score_class_num:
                     # 第三步：按班级进一步匹配
-                    if score_class_num:
-                        class_matches = grade_matches[grade_matches['班级'] == score_class_num]
-                        
-                        if len(class_matches) == 1:
-                            # 完美匹配：姓名+年级+班级
-                            student_id = class_matches.iloc[0][columns['id_info']]
-                            df_score.loc[idx, '学籍号'] = student_id
-                            matched_count += 1
-                        elif len(class_matches) > 1:
-                            # 姓名+年级+班级都相同，真正的重复记录
-                            duplicate_warnings.append(f"❌ 学生 {name} ({score_grade_converted} {score_class_num}) 真正重复记录")
-                            student_id = class_matches.iloc[0][columns['id_info']]
-                            df_score.loc[idx, '学籍号'] = student_id
-                            matched_count += 1
-                        else:
-                            # 班级不匹配，报告并使用同年级第一个记录
-                            duplicate_warnings.append(f"⚠️ 学生 {name} 班级不匹配 (成绩文件:{score_class_num} vs 学生信息:{grade_matches['班级'].unique()})")
-                            student_id = grade_matches.iloc[0][columns['id_info']]
-                            df_score.loc[idx, '学籍号'] = student_id
-                            matched_count += 1
+                    class_matches = class_index.get((name, score_grade_converted, score_class_num), [])
+                    
+                    if len(class_matches) == 1:
+                        # 完美匹配：姓名+年级+班级
+                        position = class_matches[0]
+                    elif len(class_matches) > 1:
+                        # 姓名+年级+班级都相同，真正的重复记录
+                        duplicate_warnings.append(f"❌ 学生 {name} ({score_grade_converted} {score_class_num}) 真正重复记录")
+                        position = class_matches[0]
                     else:
-                        # 无法提取班级信息，使用同年级第一个记录
-                        duplicate_warnings.append(f"⚠️ 学生 {name} 无法提取班级信息，使用同年级第一个记录")
-                        student_id = grade_matches.iloc[0][columns['id_info']]
-                        df_score.loc[idx, '学籍号'] = student_id
-                        matched_count += 1
+                        # 班级不匹配，报告并使用同年级第一个记录
+                        duplicate_warnings.append(f"⚠️ 学生 {name} 班级不匹配 (成绩文件:{score_class_num} vs 学生信息:{pd.unique(info_classes.to_numpy()[grade_matches])})")
+                        position = grade_matches[0]
+                else:
+                    # 无法提取班级信息，使用同年级第一个记录
+                    duplicate_warnings.append(f"⚠️ 学生 {name} 无法提取班级信息，使用同年级第一个记录")
+                    position = grade_matches[0]
+            
+            matched_rows.append(row)
+            matched_positions.append(position)
+        
+        matched_count = len(matched_rows)
+        if matched_rows:
+            df_score.iloc[matched_rows, df_score.columns.get_loc('学籍号')] = info_ids[matched_positions]
         
         print(f"\n匹配结果:")
         print(f"成功匹配: {matched_count}/{total_score_students} 名学生")
@@ -333,11 +321,11 @@ class StudentIDMatcher:
         print(f"\n=== 保存结果到 {self.output_file} ===")
         try:
             # 按年级排序：一年级到六年级
-            grade_order = ['一年级', '二年级', '三年级', '四年级', '五年级', '六年级']
-            df_score['年级排序'] = df_score['年级'].apply(lambda x: grade_order.index(x) if x in grade_order else 99)
+            grade_rank = pd.Categorical(df_score['年级'], dtype=GRADE_DTYPE).codes
+            df_score['年级排序'] = np.where(grade_rank < 0, 99, grade_rank)
             
             # 按年级、班级、姓名排序
-            df_sorted = df_score.sort_values(['年级排序', '标准化班级', '姓名']).drop('年级排序', axis=1)
+            df_sorted = df_score.sort_values(['年级排序', '标准化班级', '姓名']).drop('年级排序', axis=1).reset_index(drop=True)
             
             df_sorted.to_excel(self.output_file, index=False)
             print("✅ 文件保存成功")
@@ -351,7 +339,7 @@ class StudentIDMatcher:
             
             # 按年级统计填充情况
             print(f"\n各年级学籍号填充情况:")
-            for grade in grade_order:
+            for grade in GRADES:
                 grade_students = df_score[df_score['年级'] == grade]
                 if len(grade_students) > 0:
                     filled = len(grade_students[grade_students['学籍号'].notna()])
@@ -361,11 +349,14 @@ class StudentIDMatcher:
                     else:
                         print(f"  {grade}: {filled}/{total} 名学生已填充学号 ({filled/total*100:.1f}%)")
             
+            return df_sorted
+            
         except Exception as e:
             print(f"❌ 保存文件失败: {e}")
+            return None
     
     def process(self):
-        """主处理流程"""
+        """主处理流程，返回已添加学籍号的成绩数据（与保存的文件内容一致）"""
         print("学生信息匹配脚本")
         print("=" * 50)
         
@@ -402,11 +393,12 @@ class StudentIDMatcher:
             return
         
         # 保存结果
-        self.save_result(result_df)
+        df_sorted = self.save_result(result_df)
         
         print("\n=== 处理完成 ===")
         print(f"新文件: {self.output_file}")
         print("请检查匹配结果，确认学籍号填充是否正确")
+        return df_sorted
 
 def main():
     matcher = StudentIDMatcher()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+体测统计聚合
+每名学生对班级/年级统计的贡献表示为一行计数（0或1），统计结果即各学生贡献之和。
+form_and_class.py 的 calculate_statistics 由此计算；补测增量处理时只需
+减去补测学生的旧贡献、加上新贡献即可更新已保存的统计
+"""
+
+import numpy as np
+import pandas as pd
+
+# 参与单项等级统计的项目
+PROJECTS = ["BMI", "肺活量", "50米跑", "坐位体前屈", "跳绳", "仰卧起坐", "往返跑"]
+
+# 等级与统计键名的对应关系
+LEVEL_KEYS = {"优秀": "excellent", "良好": "good", "及格": "pass", "不及格": "fail"}
+
+
+def student_counts(df, standards):
+    """逐行计算每名学生对统计数据的贡献，返回与 df 同索引的计数表"""
+    male = (df["性别"] == "男").to_numpy()
+    female = (df["性别"] == "女").to_numpy()
+    overall = df["综合等级"].astype(object).to_numpy()
+    tested = overall != "未测"
+
+    counts = {
+        "total_count": np.ones(len(df), dtype=bool),
+        "male_count": male,
+        "female_count": female,
+        "tested_total": tested,
+        "tested_male": tested & male,
+        "tested_female": tested & female,
+    }
+
+    # 综合等级统计（只统计实际参与测试的学生）
+    for level, key in LEVEL_KEYS.items():
+        hit = tested & (overall == level)
+        counts[f"{key}_total"] = hit
+        counts[f"{key}_male"] = hit & male
+        counts[f"{key}_female"] = hit & female
+
+    # 各项目等级人数统计（根据各自得分计算）
+    for project in PROJECTS:
+        score_col = f"{project}得分"
+        if score_col in df.columns:
+            levels = np.asarray(standards.levels(df[score_col]), dtype=object)
+        else:
+            levels = np.full(len(df), "未测", dtype=object)
+        for level, key in LEVEL_KEYS.items():
+            counts[f"{project}_{key}"] = levels == level
+
+    return pd.DataFrame(counts, index=df.index).astype(np.int64)
+
+
+def group_counts(df, standards, by):
+    """按 by 列分组汇总学生贡献，返回 {分组: {统计键: 人数}}"""
+    counts = student_counts(df, standards).groupby(df[by].to_numpy()).sum()
+    return {
+        group: {key: int(value) for key, value in row.items()}
+        for group, row in counts.iterrows()
+    }
+
+
+def apply_delta(totals, old_counts, new_counts):
+    """在已保存的统计上减去旧贡献、加上新贡献（就地修改并返回 totals）"""
+    for counts, sign in ((old_counts, -1), (new_counts, 1)):
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + sign * int(value)
+    return totals
+
+
+def stats_from_counts(counts):
+    """由汇总计数生成与 calculate_statistics 相同结构的统计数据"""
+    stats = {key: int(value) for key, value in counts.items()}
+
+    # 计算实查比率
+    stats["total_ratio"] = (
+        f"{stats['tested_total']/stats['total_count']*100:.1f}%"
+        if stats["total_count"] > 0
+        else "0%"
+    )
+    stats["male_ratio"] = (
+        f"{stats['tested_male']/stats['male_count']*100:.1f}%"
+        if stats["male_count"] > 0
+        else "0%"
+    )
+    stats["female_ratio"] = (
+        f"{stats['tested_female']/stats['female_count']*100:.1f}%"
+        if stats["female_count"] > 0
+        else "0%"
+    )
+    return stats
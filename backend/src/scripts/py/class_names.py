@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+班级名称解析
+各脚本共用的年级、班号和简化班级名称（如"四年级1班" -> 四年级、1、四1班）。
+
+成绩文件中每个学生一行，但全校只有几十种不同的班级名称。
+parse_class_name 按班级名称缓存解析结果，每种名称只做一次字符串查找和正则匹配；
+normalize_class_names 对整列班级名称先取出不同的值逐个解析，再按行映射回去
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+# 年级（按从低到高排列）
+GRADES = ["一年级", "二年级", "三年级", "四年级", "五年级", "六年级"]
+
+# 年级简称（四年级 -> 四），用于"四1班"形式的班级名称
+GRADE_SHORT = {grade: grade[0] for grade in GRADES}
+
+# 年级的有序分类类型，排序时按一年级到六年级
+GRADE_DTYPE = pd.CategoricalDtype(GRADES, ordered=True)
+
+# 数字年级（4 -> 四年级）
+_DIGIT_GRADES = {str(number): grade for number, grade in enumerate(GRADES, 1)}
+
+_CLASS_NUMBER = re.compile(r"(\d+)班")
+
+# 学生信息文件等来源中的班级名称格式，依次尝试，最后为不含年级的"1班"
+_CLASS_PATTERNS = [
+    re.compile(r"([一二三四五六]年级)(\d+)班"),
+    re.compile(r"(?<!\d)([1-6])年级(\d+)班"),
+    re.compile(r"([一二三四五六])(\d+)班"),
+    re.compile(r"(\d+)年级(\d+)班"),
+    re.compile(r"()(\d+)班"),
+]
+
+
+class ClassName(NamedTuple):
+    """班级名称的解析结果，无法识别的部分为 None"""
+
+    grade: Optional[str]
+    number: Optional[int]
+    short_name: Optional[str]
+
+
+EMPTY = ClassName(None, None, None)
+
+
+def short_class_name(grade, class_num):
+    """简化的班级名称（四年级, 1 -> 四1班），不是一至六年级时保留原年级名称"""
+    return f"{GRADE_SHORT.get(grade, grade)}{class_num}班"
+
+
+@lru_cache(maxsize=None)
+def _parse(class_str):
+    grade = next((grade for grade in GRADES if grade in class_str), None)
+    match = _CLASS_NUMBER.search(class_str)
+    number = int(match.group(1)) if match else None
+    short_name = None
+    if number is not None:
+        short_name = short_class_name(grade or "", number)
+    return ClassName(grade, number, short_name)
+
+
+def parse_class_name(class_name):
+    """解析班级名称，得到年级、班号和简化班级名称（结果按名称缓存）"""
+    if pd.isna(class_name):
+        return EMPTY
+    return _parse(str(class_name))
+
+
+def extract_grade(class_name, missing=None):
+    """从班级名称中提取年级，没有年级时返回 missing"""
+    return parse_class_name(class_name).grade or missing
+
+
+def class_number(class_name):
+    """从班级名称中提取班号（如"六年级10班" -> 10），没有班号时返回 None"""
+    return parse_class_name(class_name).number
+
+
+@lru_cache(maxsize=None)
+def _standardize(class_str):
+    for pattern in _CLASS_PATTERNS:
+        match = pattern.search(class_str)
+        if match:
+            grade_part, class_num = match.groups()
+            # 标准化年级部分
+            if not grade_part:
+                grade_part = ""
+            elif grade_part.isdigit():
+                grade_part = _DIGIT_GRADES.get(grade_part, grade_part + "年级")
+            elif grade_part in GRADE_SHORT.values():
+                grade_part += "年级"
+            return f"{grade_part}{class_num}班"
+    return class_str
+
+
+def standardize_class_name(class_name):
+    """统一班级名称格式（"4年级1班"、"四1班" -> "四年级1班"），无法识别时返回原名称"""
+    if pd.isna(class_name):
+        return ""
+    return _standardize(str(class_name).strip())
+
+
+def _distinct_results(values, func):
+    """对一列值中每个不同的值调用一次 func，返回 (各行编号, 各不同值的结果)
+
+    空值的编号为 -1，对应追加在结果最后的 func(None)
+    """
+    codes, uniques = pd.factorize(pd.Series(values))
+    results = np.empty(len(uniques) + 1, dtype=object)
+    results[:] = [func(value) for value in uniques] + [func(None)]
+    return codes, results
+
+
+def map_distinct(values, func):
+    """对一列值中每个不同的值调用一次 func，再按行映射回去"""
+    values = pd.Series(values)
+    codes, results = _distinct_results(values, func)
+    return pd.Series(results[codes], index=values.index, dtype=object)
+
+
+def normalize_class_names(class_names):
+    """解析一列班级名称，每种名称只解析一次
+
+    返回与 class_names 行对应的表：年级（有序分类）、班号（整数，可为空）、
+    班级简称（如"四1班"，没有班号时为空）
+    """
+    class_names = pd.Series(class_names)
+    codes, parsed = _distinct_results(class_names, parse_class_name)
+    grades, numbers, short_names = (
+        np.array(field, dtype=object) for field in zip(*parsed)
+    )
+    return pd.DataFrame(
+        {
+            "年级": pd.Categorical(grades[codes], dtype=GRADE_DTYPE),
+            "班号": pd.array(numbers[codes], dtype="Int64"),
+            "班级简称": short_names[codes],
+        },
+        index=class_names.index,
+    )
+
+
+def grade_column(class_names, missing=None):
+    """由一列班级名称得到年级列（普通字符串，没有年级时为 missing）"""
+    return map_distinct(class_names, lambda name: extract_grade(name, missing))
@@ -2,10 +2,16 @@ import pandas as pd
 import numpy as np
 import os
 import glob
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl import Workbook, load_workbook
 from datetime import datetime
 
+from class_names import GRADE_SHORT, class_number, extract_grade, grade_column, short_class_name
+from excel_reader import read_excel_rows
+from excel_writer import save_workbook
+from report_styles import apply_style
+from scored_cache import load_scored_cache
+from stats_sidecar import load_stats
+
 class ClassRankingGenerator:
     def __init__(self):
         self.input_file = "2025年09月23日-2025年09月24日 成绩_含学号.xlsx"
@@ -22,25 +28,42 @@ class ClassRankingGenerator:
     
     def extract_grade_from_class(self, class_name):
         """从班级名称中提取年级"""
-        if pd.isna(class_name):
-            return None
-        
-        class_str = str(class_name)
-        for grade in ['一年级', '二年级', '三年级', '四年级', '五年级', '六年级']:
-            if grade in class_str:
-                return grade
-        return None
+        return extract_grade(class_name)
     
-    def load_grade_data(self):
-        """加载Excel文件，获取班级基本信息"""
+    def load_grade_data(self, student_data=None):
+        """加载Excel文件，获取班级基本信息
+        
+        student_data 为上一步已加载的学生数据时直接使用，不再读取输入文件
+        """
         grade_class_info = {}
         
         print("=== 加载学生数据获取班级信息 ===")
-        print(f"读取文件: {self.input_file}")
+        
+        # 优先使用 whole_school.py 保存的评分缓存
+        if student_data is None:
+            cached = load_scored_cache(
+                os.path.join(self.output_dir, '全校学生体质健康测试成绩总表.xlsx'),
+                ['四年级', '六年级'],
+                source_file=self.input_file,
+            )
+            if cached is not None:
+                student_data = cached['scored']
+        
+        if student_data is None:
+            print(f"读取文件: {self.input_file}")
         print("只处理四年级和六年级的数据")
         
         try:
-            df = pd.read_excel(self.input_file)
+            if student_data is None:
+                # 只读取统计用到的列和四年级、六年级的行
+                df = read_excel_rows(
+                    self.input_file,
+                    columns=['学籍号', '姓名', '班级名称', '身高(cm)', '体重(kg)', '肺活量(ml)',
+                             '50米跑(s)', '坐位体前屈(cm)', '一分钟跳绳(个）'],
+                    filters={'班级名称': lambda name: self.extract_grade_from_class(name) in ['四年级', '六年级']},
+                )
+            else:
+                df = student_data
             print(f"读取到 {len(df)} 条数据")
             
             # 列名映射以适应新的Excel格式
@@ -56,7 +79,7 @@ class ClassRankingGenerator:
             print(f"清理后剩余 {len(df_clean)} 条有效数据")
             
             # 添加年级信息
-            df_clean['年级'] = df_clean['班级名称'].apply(self.extract_grade_from_class)
+            df_clean['年级'] = grade_column(df_clean['班级名称'])
             
             # 过滤只保留四年级和六年级
             target_grades = ['四年级', '六年级']
@@ -75,15 +98,12 @@ class ClassRankingGenerator:
                     class_df = grade_data[grade_data['班级名称'] == class_name]
                     
                     # 提取班号
-                    import re
-                    match = re.search(r'(\d+)班', str(class_name))
-                    class_num = int(match.group(1)) if match else 999
+                    class_num = class_number(class_name)
+                    if class_num is None:
+                        class_num = 999
                     
                     # 格式化班级名
-                    grade_map = {'一年级': '一', '二年级': '二', '三年级': '三', 
-                               '四年级': '四', '五年级': '五', '六年级': '六'}
-                    grade_short = grade_map.get(grade, grade)
-                    formatted_class_name = f"{grade_short}{class_num}班"
+                    formatted_class_name = short_class_name(grade, class_num)
                     
                     # 统计基本信息 - 使用更严格的测试数据检查
                     total_students = len(class_df)
@@ -123,14 +143,13 @@ class ClassRankingGenerator:
         
         # 查找所有班级汇总表 - 修复文件名模式匹配
         # 将"四年级"转换为"四"来匹配实际文件名格式
-        grade_map = {'一年级': '一', '二年级': '二', '三年级': '三', 
-                     '四年级': '四', '五年级': '五', '六年级': '六'}
-        grade_short = grade_map.get(grade, grade)
+        grade_short = GRADE_SHORT.get(grade, grade)
         pattern = os.path.join(grade_dir, f"{grade_short}*班_班级统计汇总表.xlsx")
         summary_files = glob.glob(pattern)
         
         print(f"在{grade}目录中找到 {len(summary_files)} 个班级汇总表")
         
+        from_stats = 0
         for file_path in summary_files:
             try:
                 # 从文件名提取班级信息
@@ -143,43 +162,13 @@ class ClassRankingGenerator:
                 
                 class_name = match.group(1)  # 如: 四10班
                 
-                # 读取Excel文件
-                df = pd.read_excel(file_path, header=None)
-                
-                # 提取关键数据
-                summary_info = {}
-                
-                # 查找应查人数行
-                for idx, row in df.iterrows():
-                    if pd.notna(row.iloc[0]) and '应查人数' in str(row.iloc[0]):
-                        summary_info['total_students'] = row.iloc[6] if pd.notna(row.iloc[6]) else 0
-                        break
-                
-                # 查找实查人数行
-                for idx, row in df.iterrows():
-                    if pd.notna(row.iloc[0]) and '实查人数' in str(row.iloc[0]):
-                        summary_info['tested_students'] = row.iloc[6] if pd.notna(row.iloc[6]) else 0
-                        break
-                
-                # 查找实查比率行
-                for idx, row in df.iterrows():
-                    if pd.notna(row.iloc[0]) and '实查比率' in str(row.iloc[0]):
-                        rate_str = str(row.iloc[6]) if pd.notna(row.iloc[6]) else "0%"
-                        summary_info['test_rate'] = float(rate_str.replace('%', '')) if '%' in rate_str else 0
-                        break
-                
-                # 查找各等级人数和占比
-                for idx, row in df.iterrows():
-                    if pd.notna(row.iloc[7]) and '一级（优秀）' in str(row.iloc[7]):
-                        summary_info['excellent_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
-                        rate_str = str(row.iloc[17]) if pd.notna(row.iloc[17]) else "0%"
-                        summary_info['excellent_rate'] = float(rate_str.replace('%', '')) if '%' in rate_str else 0
-                    elif pd.notna(row.iloc[7]) and '二级（良好）' in str(row.iloc[7]):
-                        summary_info['good_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
-                    elif pd.notna(row.iloc[7]) and '三级（及格）' in str(row.iloc[7]):
-                        summary_info['pass_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
-                    elif pd.notna(row.iloc[7]) and '四级（不及格）' in str(row.iloc[7]):
-                        summary_info['fail_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
+                # 优先读取 form_and_class.py 保存汇总表时写入的统计数据
+                sidecar = load_stats(file_path)
+                if sidecar is not None:
+                    summary_info = self.summary_from_stats(sidecar['stats'])
+                    from_stats += 1
+                else:
+                    summary_info = self.parse_class_summary(file_path)
                 
                 # 计算平均分（基于等级分布估算）
                 total_tested = summary_info.get('tested_students', 0)
@@ -196,19 +185,78 @@ class ClassRankingGenerator:
                     summary_info['average_score'] = 0
                 
                 # 提取班级序号用于排序
-                num_match = re.search(r'([一二三四五六])(\d+)班', class_name)
-                if num_match:
-                    summary_info['class_num'] = int(num_match.group(2))
-                else:
-                    summary_info['class_num'] = 999
+                class_num = class_number(class_name)
+                summary_info['class_num'] = 999 if class_num is None else class_num
                 
                 class_summary_data[class_name] = summary_info
                 
             except Exception as e:
                 print(f"读取班级汇总表 {file_path} 时出错: {e}")
         
+        if from_stats < len(summary_files):
+            print(f"其中 {len(summary_files) - from_stats} 个没有对应的统计数据，已从汇总表中解析")
+        
         return class_summary_data
     
+    def summary_from_stats(self, stats):
+        """由班级统计数据（calculate_statistics 的结果）得到与汇总表中相同的人数和比率"""
+        total_count = stats.get('total_count', 0)
+        excellent_count = stats.get('excellent_total', 0)
+        rate_str = stats.get('total_ratio', '0%')
+        return {
+            'total_students': total_count,
+            'tested_students': stats.get('tested_total', 0),
+            'test_rate': float(rate_str.replace('%', '')) if '%' in rate_str else 0,
+            'excellent_count': excellent_count,
+            # 与汇总表“占比率%”一列相同，按总人数取整
+            'excellent_rate': float(round(excellent_count / total_count * 100)) if total_count > 0 else 0,
+            'good_count': stats.get('good_total', 0),
+            'pass_count': stats.get('pass_total', 0),
+            'fail_count': stats.get('fail_total', 0),
+        }
+    
+    def parse_class_summary(self, file_path):
+        """从班级汇总表中按单元格位置解析人数和比率（没有统计数据文件时使用）"""
+        # 读取Excel文件
+        df = read_excel_rows(file_path, header=None)
+        
+        # 提取关键数据
+        summary_info = {}
+        
+        # 查找应查人数行
+        for idx, row in df.iterrows():
+            if pd.notna(row.iloc[0]) and '应查人数' in str(row.iloc[0]):
+                summary_info['total_students'] = row.iloc[6] if pd.notna(row.iloc[6]) else 0
+                break
+        
+        # 查找实查人数行
+        for idx, row in df.iterrows():
+            if pd.notna(row.iloc[0]) and '实查人数' in str(row.iloc[0]):
+                summary_info['tested_students'] = row.iloc[6] if pd.notna(row.iloc[6]) else 0
+                break
+        
+        # 查找实查比率行
+        for idx, row in df.iterrows():
+            if pd.notna(row.iloc[0]) and '实查比率' in str(row.iloc[0]):
+                rate_str = str(row.iloc[6]) if pd.notna(row.iloc[6]) else "0%"
+                summary_info['test_rate'] = float(rate_str.replace('%', '')) if '%' in rate_str else 0
+                break
+        
+        # 查找各等级人数和占比
+        for idx, row in df.iterrows():
+            if pd.notna(row.iloc[7]) and '一级（优秀）' in str(row.iloc[7]):
+                summary_info['excellent_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
+                rate_str = str(row.iloc[17]) if pd.notna(row.iloc[17]) else "0%"
+                summary_info['excellent_rate'] = float(rate_str.replace('%', '')) if '%' in rate_str else 0
+            elif pd.notna(row.iloc[7]) and '二级（良好）' in str(row.iloc[7]):
+                summary_info['good_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
+            elif pd.notna(row.iloc[7]) and '三级（及格）' in str(row.iloc[7]):
+                summary_info['pass_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
+            elif pd.notna(row.iloc[7]) and '四级（不及格）' in str(row.iloc[7]):
+                summary_info['fail_count'] = row.iloc[16] if pd.notna(row.iloc[16]) else 0
+        
+        return summary_info
+    
     def calculate_rankings(self, class_data):
         """计算各项排名"""
         classes = list(class_data.keys())
@@ -291,22 +339,12 @@ class ClassRankingGenerator:
         """创建年级排名表"""
         ws = wb.create_sheet(title=grade)
         
-        # 创建边框样式
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
         # 表头
         headers = ['项目', '班级名称', '参测人数', '未测人数', '优良率', '排名', '及格率', '排名', '平均分', '排名', '排名汇总', '总排名']
         
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=1, column=col, value=header)
-            cell.border = thin_border
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
+            apply_style(cell, 'ranking_header')
 
 
        
@@ -349,8 +387,7 @@ class ClassRankingGenerator:
             
             # 应用边框
             for col in range(1, 13):
-                ws.cell(row=row, column=col).border = thin_border
-                ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+                apply_style(ws.cell(row=row, column=col), 'ranking_cell')
             
             row += 1
         
@@ -360,8 +397,6 @@ class ClassRankingGenerator:
             ws.column_dimensions[chr(64 + i)].width = width
 
          # === 新增：设置 F, G, J, K, M 列为浅蓝色背景（雾蓝色） ===
-        light_blue_fill = PatternFill(start_color="D9E8F5", end_color="D9E8F5", fill_type="solid")  # 雾蓝色
-
         # 要上色的列（列字母）
         blue_cols = ['E', 'F', 'I', 'J', 'l']
 
@@ -369,15 +404,15 @@ class ClassRankingGenerator:
             # 设置整列从第2行开始到底部的背景色
             for row in range(1, ws.max_row+1):
                 cell = ws[f"{col_letter}{row}"]
-                cell.fill = light_blue_fill
+                apply_style(cell, 'light_blue')
         
     
-    def generate_ranking_report(self):
+    def generate_ranking_report(self, student_data=None):
         """生成班级排名报告"""
         print("=== 开始生成班级排名报告 ===")
         
         # 加载年级数据（获取班级总人数）
-        grade_class_info = self.load_grade_data()
+        grade_class_info = self.load_grade_data(student_data)
     
         # 创建工作簿
         wb = Workbook()
@@ -419,14 +454,55 @@ class ClassRankingGenerator:
         
         # 保存文件
         try:
-            wb.save(self.output_file)
+            save_workbook(wb, self.output_file)
             print(f"\n=== 报告生成完成 ===")
             print(f"保存位置: {self.output_file}")
         except PermissionError:
             alt_filename = f"{self.output_dir}\班级排名统计表_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            wb.save(alt_filename)
+            save_workbook(wb, alt_filename)
             print(f"保存位置: {alt_filename}")
 
+    def update_ranking_sheets(self, grades, grade_class_info=None):
+        """只重新生成指定年级的排名表，其余年级的工作表保持不变"""
+        if not os.path.exists(self.output_file):
+            self.generate_ranking_report()
+            return
+        
+        print(f"=== 更新班级排名表: {'、'.join(grades)} ===")
+        
+        # 班级总人数，未提供时从学生数据中加载
+        if grade_class_info is None:
+            grade_class_info = self.load_grade_data()
+        
+        wb = load_workbook(self.output_file)
+        
+        for grade in grades:
+            class_data = self.load_class_summary_data(grade)
+            if not class_data:
+                print(f"{grade}没有找到班级汇总数据")
+                continue
+            
+            # 注入 total_students（班级总人数）
+            for class_name, info in grade_class_info.get(grade, {}).items():
+                if class_name in class_data:
+                    class_data[class_name]['total_students'] = info['total_students']
+            
+            rankings = self.calculate_rankings(class_data)
+            
+            # 替换原有的年级工作表，并保持其在工作簿中的位置
+            if grade in wb.sheetnames:
+                position = wb.sheetnames.index(grade)
+                wb.remove(wb[grade])
+            else:
+                position = len(wb.sheetnames)
+            self.create_ranking_sheet(wb, grade, class_data, rankings)
+            wb.move_sheet(grade, offset=position - wb.sheetnames.index(grade))
+            
+            print(f"{grade}排名表更新完成，共{len(class_data)}个班级")
+        
+        save_workbook(wb, self.output_file)
+        print(f"保存位置: {self.output_file}")
+
 def main():
     generator = ClassRankingGenerator()
     generator.generate_ranking_report()
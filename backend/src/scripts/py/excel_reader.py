@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 读取
+所有脚本通过 read_excel_rows 读取 Excel，逐行读取工作表，只保留需要的列，
+不满足过滤条件的行读取后立即丢弃，内存占用和解析时间与选中的数据量成正比。
+单元格转换和类型推断与 pd.read_excel 相同，结果等价于读取整个工作表后再选列、过滤行。
+
+读取引擎：
+  default   xlsx 使用 openpyxl 只读模式，xls 使用 xlrd（与 pd.read_excel 相同）
+  calamine  使用 python-calamine（Rust 实现，需另行安装），xlsx 和 xls 均可读取
+  auto      安装 python-calamine 时使用 calamine，否则使用 default（默认）
+可通过 set_read_engine、环境变量 EXCEL_READ_ENGINE 或各脚本的 --read-engine 参数指定。
+
+命令行对比各引擎的读取耗时并检查结果是否一致:
+python excel_reader.py "成绩.xlsx" "全校学生体质健康测试成绩总表.xlsx:7"
+（文件名后的 :7 表示跳过前7行）
+"""
+
+import argparse
+import os
+import time
+from contextlib import contextmanager
+from datetime import date, time as dt_time, timedelta
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+try:
+    import python_calamine
+except ImportError:  # python-calamine 为可选依赖
+    python_calamine = None
+
+# 指定读取引擎的环境变量：auto（默认）、default、calamine
+READ_ENGINE_ENV = "EXCEL_READ_ENGINE"
+
+READ_ENGINES = ["auto", "default", "calamine"]
+
+# set_read_engine 指定的读取引擎
+_read_engine = None
+
+# 本进程中每次读取的 (文件名, 引擎, 行数, 耗时)
+read_timings = []
+
+
+def set_read_engine(engine):
+    """指定本进程默认的读取引擎，None 表示使用环境变量或 auto"""
+    global _read_engine
+    if engine is not None and engine.lower() not in READ_ENGINES:
+        raise ValueError(f"未知的读取引擎: {engine}（可选 {'、'.join(READ_ENGINES)}）")
+    _read_engine = engine
+
+
+def resolve_engine(engine=None):
+    """确定实际使用的读取引擎：default 或 calamine"""
+    engine = (
+        engine or _read_engine or os.environ.get(READ_ENGINE_ENV) or "auto"
+    ).lower()
+    if engine not in READ_ENGINES:
+        raise ValueError(f"未知的读取引擎: {engine}（可选 {'、'.join(READ_ENGINES)}）")
+    if engine == "auto":
+        return "calamine" if python_calamine is not None else "default"
+    if engine == "calamine" and python_calamine is None:
+        print("⚠️ 未安装 python-calamine，使用默认读取引擎")
+        return "default"
+    return engine
+
+
+def _convert_openpyxl(value):
+    """与 pandas 的 openpyxl 读取器相同的单元格转换：整数值的浮点数转为整数，错误值为空"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return float("nan")
+    return value
+
+
+def _convert_calamine(value):
+    """与 pandas 的 calamine 读取器相同的单元格转换"""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, date):
+        return pd.Timestamp(value)
+    if isinstance(value, timedelta):
+        return pd.Timedelta(value)
+    if isinstance(value, dt_time):
+        return value
+    return value
+
+
+@contextmanager
+def _open_rows(path, sheet_name, engine):
+    """打开工作表，返回 (逐行原始值迭代器, 单元格转换函数, 引擎名称)"""
+    if engine == "calamine":
+        wb = python_calamine.load_workbook(path)
+        try:
+            if isinstance(sheet_name, int):
+                sheet = wb.get_sheet_by_index(sheet_name)
+            else:
+                sheet = wb.get_sheet_by_name(sheet_name)
+            yield sheet.iter_rows(), _convert_calamine, "calamine"
+        finally:
+            wb.close()
+        return
+
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        if isinstance(sheet_name, int):
+            ws = wb.worksheets[sheet_name]
+        else:
+            ws = wb[sheet_name]
+        ws.reset_dimensions()
+        yield ws.iter_rows(values_only=True), _convert_openpyxl, "openpyxl"
+    finally:
+        wb.close()
+
+
+def _is_empty(value):
+    """空单元格（openpyxl 为 None，calamine 为空字符串）"""
+    return value is None or value == ""
+
+
+def unique_columns(headers):
+    """与 pandas 相同的列名处理：空列名为 Unnamed: 序号，重复的列名依次加 .1、.2 后缀"""
+    seen = {}
+    columns = []
+    for i, header in enumerate(headers):
+        if header is None or header == "":
+            header = f"Unnamed: {i}"
+        count = seen.get(header, 0)
+        columns.append(f"{header}.{count}" if count else header)
+        seen[header] = count + 1
+    return columns
+
+
+def read_excel_rows(
+    path,
+    columns=None,
+    filters=None,
+    skiprows=0,
+    sheet_name=0,
+    engine=None,
+    header=0,
+):
+    """逐行读取工作表，返回 DataFrame
+
+    columns: 需要的列名列表，文件中不存在的列忽略；None 表示读取全部列
+    filters: {列名: 判断函数}，判断函数接收单元格原始值（空单元格为 None），
+             任一函数返回 False 的行不会被保存
+    skiprows: 表头之前跳过的行数，与 pd.read_excel 的 skiprows 相同
+    engine: 读取引擎，默认由 set_read_engine 或环境变量 EXCEL_READ_ENGINE 决定
+    header: 0 表示第一行为表头；None 表示没有表头，列名为列序号（不能与 columns、filters 同时使用）
+
+    返回结果的 attrs["rows_read"] 为过滤前的数据行数
+    """
+    engine = resolve_engine(engine)
+    start_time = time.perf_counter()
+
+    # 默认引擎下 xls 文件无法流式读取，使用 xlrd 读取后再选列、过滤
+    if engine == "default" and not str(path).lower().endswith((".xlsx", ".xlsm")):
+        df = pd.read_excel(
+            path, sheet_name=sheet_name, skiprows=skiprows, header=header
+        )
+        rows_read = len(df)
+        for name, check in (filters or {}).items():
+            df = df[[check(None if pd.isna(v) else v) for v in df[name]]]
+        if columns is not None:
+            df = df[[name for name in df.columns if name in set(columns)]]
+        df = df.reset_index(drop=True)
+        df.attrs["rows_read"] = rows_read
+        _record_timing(path, "xlrd", df, start_time)
+        return df
+
+    filters = filters or {}
+    with _open_rows(path, sheet_name, engine) as (rows, convert, engine_name):
+        # 跳过表头之前的行
+        for _ in range(skiprows):
+            if next(rows, None) is None:
+                break
+        if header is None:
+            df = _read_without_header(rows, convert)
+            _record_timing(path, engine_name, df, start_time)
+            return df
+
+        header_row = next(rows, None)
+        if header_row is None:
+            return pd.DataFrame()
+        header_row = [convert(value) for value in header_row]
+
+        while header_row and header_row[-1] == "":
+            header_row.pop()
+        names = unique_columns(header_row)
+
+        # 列投影：需要保留的列序号
+        if columns is None:
+            keep = list(range(len(names)))
+        else:
+            wanted = set(columns)
+            keep = [i for i, name in enumerate(names) if name in wanted]
+        checks = [
+            (names.index(name), check)
+            for name, check in filters.items()
+            if name in names
+        ]
+        if len(checks) < len(filters):
+            missing = [name for name in filters if name not in names]
+            raise KeyError(f"过滤条件中的列不存在: {missing}")
+
+        data = [[names[i] for i in keep]]
+        rows_read = 0
+        # 与 pd.read_excel 一样保留中间的空行、去掉末尾的空行：空行暂存，遇到非空行时再加入
+        blank_rows = []
+        blank_count = 0
+        for row in rows:
+            width = len(row)
+            blank = all(_is_empty(value) for value in row)
+            if blank:
+                blank_count += 1
+            else:
+                rows_read += blank_count + 1
+                blank_count = 0
+                data.extend(blank_rows)
+                blank_rows = []
+            if not all(
+                check(None if i >= width or _is_empty(row[i]) else row[i])
+                for i, check in checks
+            ):
+                continue
+            values = [convert(row[i]) if i < width else "" for i in keep]
+            if blank:
+                blank_rows.append(values)
+            else:
+                data.append(values)
+
+    df = TextParser(data, header=0, skip_blank_lines=False).read()
+    df.attrs["rows_read"] = rows_read
+    _record_timing(path, engine_name, df, start_time)
+    return df
+
+
+def _read_without_header(rows, convert):
+    """读取没有表头的工作表，与 pd.read_excel(header=None) 相同：
+    各行去掉末尾的空单元格后补齐到最大宽度，去掉末尾的空行"""
+    data = []
+    last_row_with_data = -1
+    for row in rows:
+        values = [convert(value) for value in row]
+        while values and values[-1] == "":
+            values.pop()
+        if values:
+            last_row_with_data = len(data)
+        data.append(values)
+    data = data[: last_row_with_data + 1]
+    if not data:
+        return pd.DataFrame()
+
+    width = max(len(values) for values in data)
+    data = [values + [""] * (width - len(values)) for values in data]
+    df = TextParser(data, header=None, skip_blank_lines=False).read()
+    df.attrs["rows_read"] = len(df)
+    return df
+
+
+def _record_timing(path, engine_name, df, start_time):
+    """记录并输出一次读取的耗时"""
+    elapsed = time.perf_counter() - start_time
+    read_timings.append((os.path.basename(path), engine_name, len(df), elapsed))
+    print(
+        f"读取 {os.path.basename(path)}: {len(df)} 行，"
+        f"用时 {elapsed:.2f}秒（{engine_name}）"
+    )
+
+
+def print_timing_summary():
+    """按引擎汇总输出本进程中的读取耗时"""
+    if not read_timings:
+        return
+    totals = {}
+    for _, engine_name, rows, elapsed in read_timings:
+        count, total_rows, total_time = totals.get(engine_name, (0, 0, 0.0))
+        totals[engine_name] = (count + 1, total_rows + rows, total_time + elapsed)
+    print("Excel读取耗时:")
+    for engine_name, (count, rows, elapsed) in totals.items():
+        print(f"  {engine_name}: {count} 次读取，{rows} 行，共 {elapsed:.2f}秒")
+
+
+def benchmark(files, repeat=3):
+    """用每个可用引擎读取文件，输出最短耗时，并检查结果与默认引擎是否一致"""
+    engines = ["default"] + (["calamine"] if python_calamine is not None else [])
+    if python_calamine is None:
+        print("未安装 python-calamine，只测试默认读取引擎")
+
+    for spec in files:
+        path, skip = spec, 0
+        name, sep, suffix = spec.rpartition(":")
+        if sep and suffix.isdigit():
+            path, skip = name, int(suffix)
+        print(f"\n=== {path}（跳过前{skip}行）===")
+        reference = None
+        for engine in engines:
+            best = None
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                df = read_excel_rows(path, skiprows=skip, engine=engine)
+                elapsed = time.perf_counter() - start_time
+                best = elapsed if best is None else min(best, elapsed)
+            if reference is None:
+                reference = df
+                same = "基准"
+            else:
+                same = "一致" if df.equals(reference) else "不一致"
+            print(f"结果 {engine}: 最短用时 {best:.3f}秒，{len(df)} 行，{same}")
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="对比各读取引擎的耗时和结果")
+    parser.add_argument("files", nargs="+", help="Excel文件路径，可加 :N 表示跳过前N行")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="每个引擎读取次数")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    benchmark(args.files, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
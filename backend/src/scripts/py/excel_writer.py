@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 写入
+各脚本仍用 openpyxl 的工作表接口排版（单元格、合并、字体、边框、填充、列宽、行高），
+保存时统一调用 save_workbook，由写入引擎把排好的工作簿写成文件；
+全校总表这类按行顺序生成的大表使用 RowWriter 逐行写入。
+
+写入引擎：
+  openpyxl    使用 openpyxl 保存（与原来相同）
+  xlsxwriter  使用 xlsxwriter 写出相同的内容和格式，每种样式组合只生成一次格式
+  auto        安装 xlsxwriter 时使用 xlsxwriter，否则使用 openpyxl（默认）
+可通过 set_write_engine、环境变量 EXCEL_WRITE_ENGINE 或各脚本的 --write-engine 参数指定。
+工作簿含有 xlsxwriter 写法不支持的内容（如主题颜色、图片、数据验证）时自动改用 openpyxl 保存
+"""
+
+import io
+import math
+import numbers
+import os
+import re
+import zipfile
+from datetime import date, datetime, time
+
+from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.compat.strings import safe_string
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+
+try:
+    import xlsxwriter
+except ImportError:  # xlsxwriter 为可选依赖
+    xlsxwriter = None
+
+# 指定写入引擎的环境变量：auto（默认）、openpyxl、xlsxwriter
+WRITE_ENGINE_ENV = "EXCEL_WRITE_ENGINE"
+
+WRITE_ENGINES = ["auto", "openpyxl", "xlsxwriter"]
+
+# set_write_engine 指定的写入引擎
+_write_engine = None
+
+# openpyxl 边框样式与 xlsxwriter 边框编号的对应关系
+BORDER_STYLES = {
+    "thin": 1,
+    "medium": 2,
+    "dashed": 3,
+    "dotted": 4,
+    "thick": 5,
+    "double": 6,
+    "hair": 7,
+    "mediumDashed": 8,
+    "dashDot": 9,
+    "mediumDashDot": 10,
+    "dashDotDot": 11,
+    "mediumDashDotDot": 12,
+    "slantDashDot": 13,
+}
+
+# openpyxl 对齐方式与 xlsxwriter 的对应关系
+HORIZONTAL_ALIGNMENTS = {
+    "left": "left",
+    "center": "center",
+    "right": "right",
+    "fill": "fill",
+    "justify": "justify",
+    "centerContinuous": "center_across",
+    "distributed": "distributed",
+}
+VERTICAL_ALIGNMENTS = {
+    "top": "top",
+    "center": "vcenter",
+    "bottom": "bottom",
+    "justify": "vjustify",
+    "distributed": "vdistributed",
+}
+
+
+class UnsupportedFormat(Exception):
+    """工作簿含有 xlsxwriter 写法不支持的内容"""
+
+
+def set_write_engine(engine):
+    """指定本进程默认的写入引擎，None 表示使用环境变量或 auto"""
+    global _write_engine
+    if engine is not None and engine.lower() not in WRITE_ENGINES:
+        raise ValueError(f"未知的写入引擎: {engine}（可选 {'、'.join(WRITE_ENGINES)}）")
+    _write_engine = engine
+
+
+def resolve_write_engine(engine=None):
+    """确定实际使用的写入引擎：openpyxl 或 xlsxwriter"""
+    engine = (
+        engine or _write_engine or os.environ.get(WRITE_ENGINE_ENV) or "auto"
+    ).lower()
+    if engine not in WRITE_ENGINES:
+        raise ValueError(f"未知的写入引擎: {engine}（可选 {'、'.join(WRITE_ENGINES)}）")
+    if engine == "auto":
+        return "xlsxwriter" if xlsxwriter is not None else "openpyxl"
+    if engine == "xlsxwriter" and xlsxwriter is None:
+        print("⚠️ 未安装 xlsxwriter，使用 openpyxl 写入")
+        return "openpyxl"
+    return engine
+
+
+def _color(color):
+    """openpyxl 颜色转为 #RRGGBB，不是 RGB 颜色时无法转换"""
+    if color is None:
+        return None
+    if color.type != "rgb" or not isinstance(color.rgb, str):
+        raise UnsupportedFormat(f"颜色类型 {color.type}")
+    return f"#{color.rgb[-6:]}"
+
+
+def format_properties(
+    font=None, fill=None, border=None, alignment=None, number_format=None
+):
+    """把 openpyxl 的样式对象转换为 xlsxwriter 的格式属性"""
+    props = {}
+    if font is not None:
+        if font.name:
+            props["font_name"] = font.name
+        if font.sz:
+            props["font_size"] = font.sz
+        if font.b:
+            props["bold"] = True
+        if font.i:
+            props["italic"] = True
+        if font.strike:
+            props["font_strikeout"] = True
+        if font.u:
+            props["underline"] = {"single": 1, "double": 2}.get(font.u, 1)
+        if font.color is not None and font.color.type == "rgb":
+            props["font_color"] = _color(font.color)
+        if font.vertAlign:
+            raise UnsupportedFormat("上标/下标")
+
+    if fill is not None and fill.fill_type is not None:
+        if fill.fill_type != "solid":
+            raise UnsupportedFormat(f"填充类型 {fill.fill_type}")
+        props["pattern"] = 1
+        props["bg_color"] = _color(fill.fgColor)
+
+    if border is not None:
+        for side_name in ["left", "right", "top", "bottom"]:
+            side = getattr(border, side_name)
+            if side is None or side.style is None:
+                continue
+            if side.style not in BORDER_STYLES:
+                raise UnsupportedFormat(f"边框样式 {side.style}")
+            props[side_name] = BORDER_STYLES[side.style]
+            if side.color is not None:
+                props[f"{side_name}_color"] = _color(side.color)
+        if border.diagonal is not None and border.diagonal.style is not None:
+            raise UnsupportedFormat("对角线边框")
+
+    if alignment is not None:
+        if alignment.horizontal and alignment.horizontal != "general":
+            props["align"] = HORIZONTAL_ALIGNMENTS[alignment.horizontal]
+        if alignment.vertical:
+            props["valign"] = VERTICAL_ALIGNMENTS[alignment.vertical]
+        if alignment.wrap_text:
+            props["text_wrap"] = True
+        if alignment.shrink_to_fit:
+            props["shrink"] = True
+        if alignment.indent:
+            props["indent"] = int(alignment.indent)
+        if alignment.text_rotation:
+            props["rotation"] = alignment.text_rotation
+
+    if number_format and number_format != "General":
+        props["num_format"] = number_format
+    return props
+
+
+def _cell_properties(cell):
+    """单元格样式对应的 xlsxwriter 格式属性"""
+    return format_properties(
+        cell.font, cell.fill, cell.border, cell.alignment, cell.number_format
+    )
+
+
+def _column_pixels(width):
+    """openpyxl 列宽（字符数）对应的像素宽度，xlsxwriter 按像素写出时得到相同的列宽"""
+    return round(width * 7)
+
+
+def _write_value(xw_ws, row, col, value, fmt, formula=None):
+    """按 openpyxl 的类型规则写入单元格：以 = 开头的字符串为公式，空字符串和 NaN 写为空单元格"""
+    if formula is None:
+        formula = isinstance(value, str) and len(value) > 1 and value.startswith("=")
+    if (
+        value is None
+        or value == ""
+        or (isinstance(value, float) and not math.isfinite(value))
+    ):
+        if fmt is not None:
+            xw_ws.write_blank(row, col, None, fmt)
+    elif formula:
+        xw_ws.write_formula(row, col, value, fmt, "")
+    elif isinstance(value, str):
+        xw_ws.write_string(row, col, value, fmt)
+    elif isinstance(value, bool):
+        xw_ws.write_boolean(row, col, value, fmt)
+    elif isinstance(value, numbers.Number):
+        xw_ws.write_number(row, col, value, fmt)
+    elif isinstance(value, (datetime, date, time)):
+        xw_ws.write_datetime(row, col, value, fmt)
+    else:
+        raise UnsupportedFormat(f"单元格值类型 {type(value).__name__}")
+
+
+def _check_supported(wb):
+    """检查工作簿是否只使用了 xlsxwriter 写法支持的内容"""
+    if wb.defined_names:
+        raise UnsupportedFormat("定义名称")
+    for ws in wb.worksheets:
+        if (
+            ws._images
+            or ws._charts
+            or ws.data_validations.dataValidation
+            or ws.conditional_formatting
+            or ws.tables
+            or ws._hyperlinks
+            or ws.freeze_panes
+        ):
+            raise UnsupportedFormat(f"工作表 {ws.title} 含有图片、图表、数据验证等内容")
+    if wb.chartsheets:
+        raise UnsupportedFormat("图表工作表")
+
+
+def _save_with_xlsxwriter(wb, path):
+    """用 xlsxwriter 写出 openpyxl 工作簿的内容和格式"""
+    _check_supported(wb)
+
+    # 先转换全部样式：相同样式组合的单元格共用一个格式，遇到不支持的内容时不生成文件
+    style_properties = {}
+    for ws in wb.worksheets:
+        for cell in ws._cells.values():
+            if cell.has_style:
+                key = tuple(cell._style)
+                if key not in style_properties:
+                    style_properties[key] = _cell_properties(cell)
+
+    # xlsxwriter 只在 close 时写出文件
+    xw_wb = xlsxwriter.Workbook(path, {"nan_inf_to_errors": True, "in_memory": True})
+    formats = {key: xw_wb.add_format(props) for key, props in style_properties.items()}
+
+    for ws in wb.worksheets:
+        xw_ws = xw_wb.add_worksheet(ws.title)
+
+        # 列宽
+        for dimension in ws.column_dimensions.values():
+            if dimension.width and dimension.customWidth:
+                # 新建的列只有列字母，min/max 在 openpyxl 保存时才填写
+                first = dimension.min or column_index_from_string(dimension.index)
+                last = dimension.max or first
+                xw_ws.set_column_pixels(
+                    first - 1,
+                    last - 1,
+                    _column_pixels(dimension.width),
+                    None,
+                    {"hidden": True} if dimension.hidden else None,
+                )
+
+        # 行高
+        for row_idx, dimension in ws.row_dimensions.items():
+            if dimension.height is not None:
+                xw_ws.set_row(row_idx - 1, dimension.height)
+
+        # 合并单元格（只记录合并区域，各单元格按自身的值和格式写入）
+        for merged_range in ws.merged_cells.ranges:
+            min_col, min_row, max_col, max_row = range_boundaries(merged_range.coord)
+            xw_ws.merge_range(min_row - 1, min_col - 1, max_row - 1, max_col - 1, None)
+
+        # 单元格
+        for (row, col), cell in ws._cells.items():
+            fmt = formats[tuple(cell._style)] if cell.has_style else None
+            _write_value(
+                xw_ws, row - 1, col - 1, cell.value, fmt, cell.data_type == "f"
+            )
+
+    if wb.active is not None:
+        xw_wb.worksheets_objs[wb.index(wb.active)].activate()
+    xw_wb.close()
+
+
+def save_workbook(wb, path, engine=None):
+    """保存 openpyxl 工作簿，写入引擎由 engine、set_write_engine 或环境变量决定
+
+    path 也可以是 io.BytesIO 等文件对象
+    """
+    if resolve_write_engine(engine) == "xlsxwriter":
+        try:
+            _save_with_xlsxwriter(wb, path)
+            return
+        except UnsupportedFormat as e:
+            name = os.path.basename(path) if isinstance(path, str) else "工作簿"
+            print(f"⚠️ {name} 含有 xlsxwriter 不支持的内容（{e}），使用 openpyxl 保存")
+    wb.save(path)
+
+
+class RowWriter:
+    """按行顺序写入单个工作表，写出的行不保留在内存中
+
+    列宽和合并单元格须在写入数据之前设置；append 的 style 为 {"font": ..., "alignment": ...}
+    形式的 openpyxl 样式对象，作用于该行的每个单元格
+    """
+
+    def __init__(self, path, title, engine=None):
+        self.path = path
+        self.engine = resolve_write_engine(engine)
+        if self.engine == "xlsxwriter":
+            # 合并区域跨越多行时无法使用 constant_memory 模式，单元格以紧凑的元组形式暂存
+            self.wb = xlsxwriter.Workbook(path, {"nan_inf_to_errors": True})
+            self.ws = self.wb.add_worksheet(title)
+            self.formats = {}
+            self.row = 0
+        else:
+            self.wb = Workbook(write_only=True)
+            self.ws = self.wb.create_sheet(title)
+
+    def set_column_width(self, col_letter, width):
+        """设置列宽（字符数）"""
+        if self.engine == "xlsxwriter":
+            self.ws.set_column_pixels(
+                f"{col_letter}:{col_letter}", _column_pixels(width)
+            )
+        else:
+            self.ws.column_dimensions[col_letter].width = width
+
+    def merge(self, cell_range):
+        """合并单元格，如 "B1:E1"（值由 append 写入左上角单元格）"""
+        if self.engine == "xlsxwriter":
+            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+            self.ws.merge_range(
+                min_row - 1, min_col - 1, max_row - 1, max_col - 1, None
+            )
+        else:
+            self.ws.merged_cells.add(cell_range)
+
+    def append(self, values, style=None):
+        """写入一行，None 表示空单元格；设置 style 时空单元格也写入格式"""
+        if self.engine == "xlsxwriter":
+            fmt = None
+            if style is not None:
+                key = tuple(sorted(style.items()))
+                if key not in self.formats:
+                    self.formats[key] = self.wb.add_format(format_properties(**style))
+                fmt = self.formats[key]
+            for col, value in enumerate(values):
+                _write_value(self.ws, self.row, col, value, fmt)
+            self.row += 1
+        elif style is None:
+            self.ws.append(values)
+        else:
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(self.ws, value=value)
+                for name, obj in style.items():
+                    setattr(cell, name, obj)
+                cells.append(cell)
+            self.ws.append(cells)
+
+    def close(self):
+        """保存文件"""
+        if self.engine == "xlsxwriter":
+            self.wb.close()
+        else:
+            self.wb.save(self.path)
+
+
+class WorkbookTemplate:
+    """按版式模板批量生成工作簿
+
+    模板工作簿只保存一次，生成每个文件时复制模板的各个文件部件，只重新写出第一个工作表的单元格数据，
+    不再逐个创建单元格对象和样式。模板中需要填值的单元格都须已存在（带样式、不含值），
+    save 按坐标填入值，结果与在模板工作簿中逐个赋值后用 openpyxl 保存相同。
+    模板总是用 openpyxl 保存，不受写入引擎设置影响
+    """
+
+    def __init__(self, wb):
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        with zipfile.ZipFile(buffer) as package:
+            self.parts = [(info, package.read(info)) for info in package.infolist()]
+
+        # 用于按 openpyxl 的规则判断值的类型
+        self.worksheet = wb.worksheets[0]
+        self.sheet_part = "xl/worksheets/sheet1.xml"
+        parts = {info.filename: data for info, data in self.parts}
+        xml = parts[self.sheet_part].decode("utf-8")
+        start = xml.index("<sheetData>") + len("<sheetData>")
+        end = xml.index("</sheetData>")
+        self.prefix = xml[:start].encode("utf-8")
+        self.suffix = xml[end:].encode("utf-8")
+
+        # [(行属性, [(坐标, 单元格属性), ...]), ...]，单元格属性不含类型（写入时按值确定）
+        self.rows = []
+        for row_attributes, row_xml in re.findall(
+            r"<row ([^>]*)>(.*?)</row>", xml[start:end]
+        ):
+            cells = re.findall(r'<c (r="([A-Z]+\d+)"[^>]*?)(?:/>|></c>)', row_xml)
+            if len(cells) != row_xml.count("<c "):
+                raise ValueError("模板工作表中的单元格不能含有值")
+            cells = [
+                (coordinate, re.sub(r' t="\w+"', "", attrs))
+                for attrs, coordinate in cells
+            ]
+            self.rows.append((row_attributes, cells))
+
+    def _cell_xml(self, attributes, value):
+        """单元格的 XML（与 openpyxl 写出的相同）"""
+        cell = Cell(self.worksheet, value=value)
+        data_type, value = cell.data_type, cell._value
+        if data_type == "s":
+            attributes += ' t="inlineStr"'
+            if value == "":
+                return f"<c {attributes}></c>"
+            space = ' xml:space="preserve"' if value != value.strip() else ""
+            return f"<c {attributes}><is><t{space}>{_xml_text(value)}</t></is></c>"
+        if data_type not in ("n", "b", "e"):
+            # 公式、日期等按单元格格式写出的值
+            raise UnsupportedFormat(f"模板不支持 {data_type} 类型的值: {value!r}")
+        attributes += f' t="{data_type}"'
+        if value is None or value == "":
+            return f"<c {attributes}></c>"
+        return f"<c {attributes}><v>{_xml_text(safe_string(value))}</v></c>"
+
+    def render_sheet(self, values):
+        """填入值后的工作表 XML"""
+        values = dict(values)
+        parts = [self.prefix]
+        for row_attributes, cells in self.rows:
+            row = [f"<row {row_attributes}>"]
+            for coordinate, attributes in cells:
+                row.append(self._cell_xml(attributes, values.pop(coordinate, None)))
+            row.append("</row>")
+            # 与 openpyxl 相同，非 ASCII 字符写成字符引用
+            parts.append("".join(row).encode("ascii", "xmlcharrefreplace"))
+        if values:
+            raise ValueError(f"模板中没有这些单元格: {', '.join(values)}")
+        parts.append(self.suffix)
+        return b"".join(parts)
+
+    def save(self, values, path):
+        """把 {坐标: 值} 填入模板并保存为文件（path 也可以是文件对象）"""
+        sheet = self.render_sheet(values)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+            for info, data in self.parts:
+                package.writestr(
+                    info, sheet if info.filename == self.sheet_part else data
+                )
+
+    def save_sheets(self, sheets, path):
+        """把多组值分别填入模板，保存为一个多工作表的工作簿
+
+        sheets 为 [(工作表名称, {坐标: 值}), ...]，各工作表共用模板的样式。
+        工作簿结构（工作表列表、关系和内容类型）取自只含空工作表的工作簿
+        """
+        rendered = [self.render_sheet(values) for _, values in sheets]
+
+        skeleton = Workbook()
+        skeleton.active.title = sheets[0][0]
+        for title, _ in sheets[1:]:
+            skeleton.create_sheet(title)
+        buffer = io.BytesIO()
+        skeleton.save(buffer)
+
+        template_parts = {info.filename: data for info, data in self.parts}
+        with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(
+            path, "w", zipfile.ZIP_DEFLATED
+        ) as package:
+            for info in source.infolist():
+                match = re.fullmatch(r"xl/worksheets/sheet(\d+)\.xml", info.filename)
+                if match:
+                    data = rendered[int(match.group(1)) - 1]
+                elif (
+                    info.filename in template_parts
+                    and info.filename not in WORKBOOK_STRUCTURE_PARTS
+                ):
+                    # 样式、主题等与模板相同
+                    data = template_parts[info.filename]
+                else:
+                    data = source.read(info)
+                package.writestr(info, data)
+
+
+# 随工作表数量和名称变化的文件部件
+WORKBOOK_STRUCTURE_PARTS = {
+    "[Content_Types].xml",
+    "docProps/app.xml",
+    "xl/workbook.xml",
+    "xl/_rels/workbook.xml.rels",
+}
+
+
+def _xml_text(text):
+    """转义 XML 文本"""
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("\r", "&#13;")
+    )
@@ -2,17 +2,53 @@ import pandas as pd
 import numpy as np
 import os
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 import re
 from datetime import datetime
 import json
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregates import stats_from_counts, student_counts
+from class_names import (
+    GRADES,
+    class_number,
+    extract_grade,
+    normalize_class_names,
+    short_class_name,
+)
+from excel_reader import READ_ENGINES, read_excel_rows, set_read_engine
+from excel_writer import (
+    WRITE_ENGINES,
+    resolve_write_engine,
+    save_workbook,
+    set_write_engine,
+)
+from report_styles import (
+    BOLD,
+    BOLD_CALIBRI,
+    CENTER,
+    CENTER_WRAP,
+    HORIZONTAL_CENTER,
+    MEDIUM,
+    MEDIUM_BLACK,
+    alignment,
+    apply_style,
+    border,
+    font,
+)
+from scored_cache import differing_columns, load_scored_cache
+from scoring import ScoringEngine
+from standards import load_standards
+from stats_sidecar import save_stats
 
 
 class GradeClassProcessor:
-    def __init__(self, year_class_filter=None):
+    # 默认参与评分的年级
+    DEFAULT_GRADES = ["四年级", "六年级"]
+
+    def __init__(self, year_class_filter=None, target_grades=None):
         self.input_file = "2025年09月23日-2025年09月24日 成绩_含学号.xlsx"
         self.output_dir = r"25年9月体测成绩得分等级汇总"
         self.today = datetime.now().strftime("%Y/%m/%d")
@@ -24,6 +60,17 @@ class GradeClassProcessor:
         if self.year_class_filter:
             self.validate_year_class_filter()
 
+        # 参与评分的年级：优先使用参数，其次使用过滤参数中的年级
+        if target_grades:
+            self.target_grades = list(target_grades)
+        elif self.year_class_filter:
+            self.target_grades = list(self.year_class_filter)
+        else:
+            self.target_grades = list(self.DEFAULT_GRADES)
+
+        # 同时生成汇总表的进程数（1 为在当前进程中依次生成）
+        self.workers = 1
+
         # 国家标准评分系统
         self.setup_national_standards()
 
@@ -32,11 +79,9 @@ class GradeClassProcessor:
         if not isinstance(self.year_class_filter, dict):
             raise ValueError("year_class_filter 必须是字典格式")
 
-        valid_grades = ["一年级", "二年级", "三年级", "四年级", "五年级", "六年级"]
-
         for year, classes in self.year_class_filter.items():
-            if year not in valid_grades:
-                raise ValueError(f"无效的年级: {year}。有效年级: {valid_grades}")
+            if year not in GRADES:
+                raise ValueError(f"无效的年级: {year}。有效年级: {GRADES}")
 
             if not isinstance(classes, list):
                 raise ValueError(f"年级 {year} 的班级列表必须是列表格式")
@@ -110,1471 +155,38 @@ class GradeClassProcessor:
             },
         }
 
-        # BMI评分标准（根据标准文档表1-1、1-2）
-        self.bmi_standards = {
-            "男": {
-                "一年级": {
-                    "正常": (13.5, 18.1),
-                    "低体重": (0, 13.4),
-                    "超重": (18.2, 20.3),
-                    "肥胖": (20.4, 50),
-                },
-                "二年级": {
-                    "正常": (13.7, 18.4),
-                    "低体重": (0, 13.6),
-                    "超重": (18.5, 20.4),
-                    "肥胖": (20.5, 50),
-                },
-                "三年级": {
-                    "正常": (13.9, 19.4),
-                    "低体重": (0, 13.8),
-                    "超重": (19.5, 22.1),
-                    "肥胖": (22.2, 50),
-                },
-                "四年级": {
-                    "正常": (14.2, 20.1),
-                    "低体重": (0, 14.1),
-                    "超重": (20.2, 22.6),
-                    "肥胖": (22.7, 50),
-                },
-                "五年级": {
-                    "正常": (14.4, 21.4),
-                    "低体重": (0, 14.3),
-                    "超重": (21.5, 24.1),
-                    "肥胖": (24.2, 50),
-                },
-                "六年级": {
-                    "正常": (14.7, 21.8),
-                    "低体重": (0, 14.6),
-                    "超重": (21.9, 24.5),
-                    "肥胖": (24.6, 50),
-                },
-            },
-            "女": {
-                "一年级": {
-                    "正常": (13.3, 17.3),
-                    "低体重": (0, 13.2),
-                    "超重": (17.4, 19.2),
-                    "肥胖": (19.3, 50),
-                },
-                "二年级": {
-                    "正常": (13.5, 17.8),
-                    "低体重": (0, 13.4),
-                    "超重": (17.9, 20.2),
-                    "肥胖": (20.3, 50),
-                },
-                "三年级": {
-                    "正常": (13.6, 18.6),
-                    "低体重": (0, 13.5),
-                    "超重": (18.7, 21.1),
-                    "肥胖": (21.2, 50),
-                },
-                "四年级": {
-                    "正常": (13.7, 19.4),
-                    "低体重": (0, 13.6),
-                    "超重": (19.5, 22.0),
-                    "肥胖": (22.1, 50),
-                },
-                "五年级": {
-                    "正常": (13.8, 20.5),
-                    "低体重": (0, 13.7),
-                    "超重": (20.6, 22.9),
-                    "肥胖": (23.0, 50),
-                },
-                "六年级": {
-                    "正常": (14.2, 20.8),
-                    "低体重": (0, 14.1),
-                    "超重": (20.9, 23.6),
-                    "肥胖": (23.7, 50),
-                },
-            },
-        }
-
-        # 肺活量评分标准（完全按照标准.md表1-3、1-4）
-        self.lung_standards = {
-            "男": {
-                "一年级": [
-                    (1700, 100),
-                    (1600, 95),
-                    (1500, 90),
-                    (1400, 85),
-                    (1300, 80),
-                    (1240, 78),
-                    (1180, 76),
-                    (1120, 74),
-                    (1060, 72),
-                    (1000, 70),
-                    (940, 68),
-                    (880, 66),
-                    (820, 64),
-                    (760, 62),
-                    (700, 60),
-                    (660, 50),
-                    (620, 40),
-                    (580, 30),
-                    (540, 20),
-                    (500, 10),
-                ],
-                "二年级": [
-                    (2000, 100),
-                    (1900, 95),
-                    (1800, 90),
-                    (1650, 85),
-                    (1500, 80),
-                    (1430, 78),
-                    (1360, 76),
-                    (1290, 74),
-                    (1220, 72),
-                    (1150, 70),
-                    (1080, 68),
-                    (1010, 66),
-                    (940, 64),
-                    (870, 62),
-                    (800, 60),
-                    (750, 50),
-                    (700, 40),
-                    (650, 30),
-                    (600, 20),
-                    (550, 10),
-                ],
-                "三年级": [
-                    (2300, 100),
-                    (2200, 95),
-                    (2100, 90),
-                    (1900, 85),
-                    (1700, 80),
-                    (1620, 78),
-                    (1540, 76),
-                    (1460, 74),
-                    (1380, 72),
-                    (1300, 70),
-                    (1220, 68),
-                    (1140, 66),
-                    (1060, 64),
-                    (980, 62),
-                    (900, 60),
-                    (840, 50),
-                    (780, 40),
-                    (720, 30),
-                    (660, 20),
-                    (600, 10),
-                ],
-                "四年级": [
-                    (2600, 100),
-                    (2500, 95),
-                    (2400, 90),
-                    (2150, 85),
-                    (1900, 80),
-                    (1820, 78),
-                    (1740, 76),
-                    (1660, 74),
-                    (1580, 72),
-                    (1500, 70),
-                    (1420, 68),
-                    (1340, 66),
-                    (1260, 64),
-                    (1180, 62),
-                    (1100, 60),
-                    (1030, 50),
-                    (960, 40),
-                    (890, 30),
-                    (820, 20),
-                    (750, 10),
-                ],
-                "五年级": [
-                    (2900, 100),
-                    (2800, 95),
-                    (2700, 90),
-                    (2450, 85),
-                    (2200, 80),
-                    (2110, 78),
-                    (2020, 76),
-                    (1930, 74),
-                    (1840, 72),
-                    (1750, 70),
-                    (1660, 68),
-                    (1570, 66),
-                    (1480, 64),
-                    (1390, 62),
-                    (1300, 60),
-                    (1220, 50),
-                    (1140, 40),
-                    (1060, 30),
-                    (980, 20),
-                    (900, 10),
-                ],
-                "六年级": [
-                    (3200, 100),
-                    (3100, 95),
-                    (3000, 90),
-                    (2750, 85),
-                    (2500, 80),
-                    (2400, 78),
-                    (2300, 76),
-                    (2200, 74),
-                    (2100, 72),
-                    (2000, 70),
-                    (1900, 68),
-                    (1800, 66),
-                    (1700, 64),
-                    (1600, 62),
-                    (1500, 60),
-                    (1410, 50),
-                    (1320, 40),
-                    (1230, 30),
-                    (1140, 20),
-                    (1050, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (1400, 100),
-                    (1300, 95),
-                    (1200, 90),
-                    (1100, 85),
-                    (1000, 80),
-                    (960, 78),
-                    (920, 76),
-                    (880, 74),
-                    (840, 72),
-                    (800, 70),
-                    (760, 68),
-                    (720, 66),
-                    (680, 64),
-                    (640, 62),
-                    (600, 60),
-                    (580, 50),
-                    (560, 40),
-                    (540, 30),
-                    (520, 20),
-                    (500, 10),
-                ],
-                "二年级": [
-                    (1600, 100),
-                    (1500, 95),
-                    (1400, 90),
-                    (1300, 85),
-                    (1200, 80),
-                    (1150, 78),
-                    (1100, 76),
-                    (1050, 74),
-                    (1000, 72),
-                    (950, 70),
-                    (900, 68),
-                    (850, 66),
-                    (800, 64),
-                    (750, 62),
-                    (700, 60),
-                    (680, 50),
-                    (660, 40),
-                    (640, 30),
-                    (620, 20),
-                    (600, 10),
-                ],
-                "三年级": [
-                    (1800, 100),
-                    (1700, 95),
-                    (1600, 90),
-                    (1500, 85),
-                    (1400, 80),
-                    (1340, 78),
-                    (1280, 76),
-                    (1220, 74),
-                    (1160, 72),
-                    (1100, 70),
-                    (1040, 68),
-                    (980, 66),
-                    (920, 64),
-                    (860, 62),
-                    (800, 60),
-                    (780, 50),
-                    (760, 40),
-                    (740, 30),
-                    (720, 20),
-                    (700, 10),
-                ],
-                "四年级": [
-                    (2000, 100),
-                    (1900, 95),
-                    (1800, 90),
-                    (1700, 85),
-                    (1600, 80),
-                    (1530, 78),
-                    (1460, 76),
-                    (1390, 74),
-                    (1320, 72),
-                    (1250, 70),
-                    (1180, 68),
-                    (1110, 66),
-                    (1040, 64),
-                    (970, 62),
-                    (900, 60),
-                    (880, 50),
-                    (860, 40),
-                    (840, 30),
-                    (820, 20),
-                    (800, 10),
-                ],
-                "五年级": [
-                    (2250, 100),
-                    (2150, 95),
-                    (2050, 90),
-                    (1950, 85),
-                    (1850, 80),
-                    (1770, 78),
-                    (1690, 76),
-                    (1610, 74),
-                    (1530, 72),
-                    (1450, 70),
-                    (1370, 68),
-                    (1290, 66),
-                    (1210, 64),
-                    (1130, 62),
-                    (1050, 60),
-                    (1020, 50),
-                    (990, 40),
-                    (960, 30),
-                    (930, 20),
-                    (900, 10),
-                ],
-                "六年级": [
-                    (2500, 100),
-                    (2400, 95),
-                    (2300, 90),
-                    (2200, 85),
-                    (2100, 80),
-                    (2010, 78),
-                    (1920, 76),
-                    (1830, 74),
-                    (1740, 72),
-                    (1650, 70),
-                    (1560, 68),
-                    (1470, 66),
-                    (1380, 64),
-                    (1290, 62),
-                    (1200, 60),
-                    (1170, 50),
-                    (1140, 40),
-                    (1110, 30),
-                    (1080, 20),
-                    (1050, 10),
-                ],
-            },
-        }
+        # 各项评分表（BMI、肺活量、50米跑、坐位体前屈、跳绳、仰卧起坐、往返跑）
+        # 统一从 backend/src/data/persistent 下的评分表编译加载
+        self.standards = load_standards()
 
-        # 50米跑评分标准（表1-5、1-6）- 时间越少分数越高
-        self.run50_standards = {
-            "男": {
-                "一年级": [
-                    (10.2, 100),
-                    (10.3, 95),
-                    (10.4, 90),
-                    (10.5, 85),
-                    (10.6, 80),
-                    (10.8, 78),
-                    (11.0, 76),
-                    (11.2, 74),
-                    (11.4, 72),
-                    (11.6, 70),
-                    (11.8, 68),
-                    (12.0, 66),
-                    (12.2, 64),
-                    (12.4, 62),
-                    (12.6, 60),
-                    (12.8, 50),
-                    (13.0, 40),
-                    (13.2, 30),
-                    (13.4, 20),
-                    (13.6, 10),
-                ],
-                "二年级": [
-                    (9.6, 100),
-                    (9.7, 95),
-                    (9.8, 90),
-                    (9.9, 85),
-                    (10.0, 80),
-                    (10.2, 78),
-                    (10.4, 76),
-                    (10.6, 74),
-                    (10.8, 72),
-                    (11.0, 70),
-                    (11.2, 68),
-                    (11.4, 66),
-                    (11.6, 64),
-                    (11.8, 62),
-                    (12.0, 60),
-                    (12.2, 50),
-                    (12.4, 40),
-                    (12.6, 30),
-                    (12.8, 20),
-                    (13.0, 10),
-                ],
-                "三年级": [
-                    (9.1, 100),
-                    (9.2, 95),
-                    (9.3, 90),
-                    (9.4, 85),
-                    (9.5, 80),
-                    (9.7, 78),
-                    (9.9, 76),
-                    (10.1, 74),
-                    (10.3, 72),
-                    (10.5, 70),
-                    (10.7, 68),
-                    (10.9, 66),
-                    (11.1, 64),
-                    (11.3, 62),
-                    (11.5, 60),
-                    (11.7, 50),
-                    (11.9, 40),
-                    (12.1, 30),
-                    (12.3, 20),
-                    (12.5, 10),
-                ],
-                "四年级": [
-                    (8.7, 100),
-                    (8.8, 95),
-                    (8.9, 90),
-                    (9.0, 85),
-                    (9.1, 80),
-                    (9.3, 78),
-                    (9.5, 76),
-                    (9.7, 74),
-                    (9.9, 72),
-                    (10.1, 70),
-                    (10.3, 68),
-                    (10.5, 66),
-                    (10.7, 64),
-                    (10.9, 62),
-                    (11.1, 60),
-                    (11.3, 50),
-                    (11.5, 40),
-                    (11.7, 30),
-                    (11.9, 20),
-                    (12.1, 10),
-                ],
-                "五年级": [
-                    (8.4, 100),
-                    (8.5, 95),
-                    (8.6, 90),
-                    (8.7, 85),
-                    (8.8, 80),
-                    (9.0, 78),
-                    (9.2, 76),
-                    (9.4, 74),
-                    (9.6, 72),
-                    (9.8, 70),
-                    (10.0, 68),
-                    (10.2, 66),
-                    (10.4, 64),
-                    (10.6, 62),
-                    (10.8, 60),
-                    (11.0, 50),
-                    (11.2, 40),
-                    (11.4, 30),
-                    (11.6, 20),
-                    (11.8, 10),
-                ],
-                "六年级": [
-                    (8.2, 100),
-                    (8.3, 95),
-                    (8.4, 90),
-                    (8.5, 85),
-                    (8.6, 80),
-                    (8.8, 78),
-                    (9.0, 76),
-                    (9.2, 74),
-                    (9.4, 72),
-                    (9.6, 70),
-                    (9.8, 68),
-                    (10.0, 66),
-                    (10.2, 64),
-                    (10.4, 62),
-                    (10.6, 60),
-                    (10.8, 50),
-                    (11.0, 40),
-                    (11.2, 30),
-                    (11.4, 20),
-                    (11.6, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (11.0, 100),
-                    (11.1, 95),
-                    (11.2, 90),
-                    (11.5, 85),
-                    (11.8, 80),
-                    (12.0, 78),
-                    (12.2, 76),
-                    (12.4, 74),
-                    (12.6, 72),
-                    (12.8, 70),
-                    (13.0, 68),
-                    (13.2, 66),
-                    (13.4, 64),
-                    (13.6, 62),
-                    (13.8, 60),
-                    (14.0, 50),
-                    (14.2, 40),
-                    (14.4, 30),
-                    (14.6, 20),
-                    (14.8, 10),
-                ],
-                "二年级": [
-                    (10.0, 100),
-                    (10.1, 95),
-                    (10.2, 90),
-                    (10.5, 85),
-                    (10.8, 80),
-                    (11.0, 78),
-                    (11.2, 76),
-                    (11.4, 74),
-                    (11.6, 72),
-                    (11.8, 70),
-                    (12.0, 68),
-                    (12.2, 66),
-                    (12.4, 64),
-                    (12.6, 62),
-                    (12.8, 60),
-                    (13.0, 50),
-                    (13.2, 40),
-                    (13.4, 30),
-                    (13.6, 20),
-                    (13.8, 10),
-                ],
-                "三年级": [
-                    (9.2, 100),
-                    (9.3, 95),
-                    (9.4, 90),
-                    (9.7, 85),
-                    (10.0, 80),
-                    (10.2, 78),
-                    (10.4, 76),
-                    (10.6, 74),
-                    (10.8, 72),
-                    (11.0, 70),
-                    (11.2, 68),
-                    (11.4, 66),
-                    (11.6, 64),
-                    (11.8, 62),
-                    (12.0, 60),
-                    (12.2, 50),
-                    (12.4, 40),
-                    (12.6, 30),
-                    (12.8, 20),
-                    (13.0, 10),
-                ],
-                "四年级": [
-                    (8.7, 100),
-                    (8.8, 95),
-                    (8.9, 90),
-                    (9.2, 85),
-                    (9.5, 80),
-                    (9.7, 78),
-                    (9.9, 76),
-                    (10.1, 74),
-                    (10.3, 72),
-                    (10.5, 70),
-                    (10.7, 68),
-                    (10.9, 66),
-                    (11.1, 64),
-                    (11.3, 62),
-                    (11.5, 60),
-                    (11.7, 50),
-                    (11.9, 40),
-                    (12.1, 30),
-                    (12.3, 20),
-                    (12.5, 10),
-                ],
-                "五年级": [
-                    (8.3, 100),
-                    (8.4, 95),
-                    (8.5, 90),
-                    (8.8, 85),
-                    (9.1, 80),
-                    (9.3, 78),
-                    (9.5, 76),
-                    (9.7, 74),
-                    (9.9, 72),
-                    (10.1, 70),
-                    (10.3, 68),
-                    (10.5, 66),
-                    (10.7, 64),
-                    (10.9, 62),
-                    (11.1, 60),
-                    (11.3, 50),
-                    (11.5, 40),
-                    (11.7, 30),
-                    (11.9, 20),
-                    (12.1, 10),
-                ],
-                "六年级": [
-                    (8.2, 100),
-                    (8.3, 95),
-                    (8.4, 90),
-                    (8.7, 85),
-                    (9.0, 80),
-                    (9.2, 78),
-                    (9.4, 76),
-                    (9.6, 74),
-                    (9.8, 72),
-                    (10.0, 70),
-                    (10.2, 68),
-                    (10.4, 66),
-                    (10.6, 64),
-                    (10.8, 62),
-                    (11.0, 60),
-                    (11.2, 50),
-                    (11.4, 40),
-                    (11.6, 30),
-                    (11.8, 20),
-                    (12.0, 10),
-                ],
-            },
-        }
-
-        # 坐位体前屈评分标准（表1-7、1-8）
-        self.sitreach_standards = {
-            "男": {
-                "一年级": [
-                    (16.1, 100),
-                    (14.6, 95),
-                    (13.0, 90),
-                    (12.0, 85),
-                    (11.0, 80),
-                    (9.9, 78),
-                    (8.8, 76),
-                    (7.7, 74),
-                    (6.6, 72),
-                    (5.5, 70),
-                    (4.4, 68),
-                    (3.3, 66),
-                    (2.2, 64),
-                    (1.1, 62),
-                    (0.0, 60),
-                    (-0.8, 50),
-                    (-1.6, 40),
-                    (-2.4, 30),
-                    (-3.2, 20),
-                    (-4.0, 10),
-                ],
-                "二年级": [
-                    (16.2, 100),
-                    (14.7, 95),
-                    (13.2, 90),
-                    (11.9, 85),
-                    (10.6, 80),
-                    (9.5, 78),
-                    (8.4, 76),
-                    (7.3, 74),
-                    (6.2, 72),
-                    (5.1, 70),
-                    (4.0, 68),
-                    (2.9, 66),
-                    (1.8, 64),
-                    (0.7, 62),
-                    (-0.4, 60),
-                    (-1.2, 50),
-                    (-2.0, 40),
-                    (-2.8, 30),
-                    (-3.6, 20),
-                    (-4.4, 10),
-                ],
-                "三年级": [
-                    (16.3, 100),
-                    (14.9, 95),
-                    (13.4, 90),
-                    (11.8, 85),
-                    (10.2, 80),
-                    (9.1, 78),
-                    (8.0, 76),
-                    (6.9, 74),
-                    (5.8, 72),
-                    (4.7, 70),
-                    (3.6, 68),
-                    (2.5, 66),
-                    (1.4, 64),
-                    (0.3, 62),
-                    (-0.8, 60),
-                    (-1.6, 50),
-                    (-2.4, 40),
-                    (-3.2, 30),
-                    (-4.0, 20),
-                    (-4.8, 10),
-                ],
-                "四年级": [
-                    (16.4, 100),
-                    (15.0, 95),
-                    (13.6, 90),
-                    (11.7, 85),
-                    (9.8, 80),
-                    (8.6, 78),
-                    (7.4, 76),
-                    (6.2, 74),
-                    (5.0, 72),
-                    (3.8, 70),
-                    (2.6, 68),
-                    (1.4, 66),
-                    (0.2, 64),
-                    (-1.0, 62),
-                    (-2.2, 60),
-                    (-3.2, 50),
-                    (-4.2, 40),
-                    (-5.2, 30),
-                    (-6.2, 20),
-                    (-7.2, 10),
-                ],
-                "五年级": [
-                    (16.5, 100),
-                    (15.2, 95),
-                    (13.8, 90),
-                    (11.6, 85),
-                    (9.4, 80),
-                    (8.2, 78),
-                    (7.0, 76),
-                    (5.8, 74),
-                    (4.6, 72),
-                    (3.4, 70),
-                    (2.2, 68),
-                    (1.0, 66),
-                    (-0.2, 64),
-                    (-1.4, 62),
-                    (-2.6, 60),
-                    (-3.6, 50),
-                    (-4.6, 40),
-                    (-5.6, 30),
-                    (-6.6, 20),
-                    (-7.6, 10),
-                ],
-                "六年级": [
-                    (16.6, 100),
-                    (15.3, 95),
-                    (14.0, 90),
-                    (11.5, 85),
-                    (9.0, 80),
-                    (7.7, 78),
-                    (6.4, 76),
-                    (5.1, 74),
-                    (3.8, 72),
-                    (2.5, 70),
-                    (1.2, 68),
-                    (-0.1, 66),
-                    (-1.4, 64),
-                    (-2.7, 62),
-                    (-4.0, 60),
-                    (-5.0, 50),
-                    (-6.0, 40),
-                    (-7.0, 30),
-                    (-8.0, 20),
-                    (-9.0, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (18.6, 100),
-                    (17.3, 95),
-                    (16.0, 90),
-                    (14.7, 85),
-                    (13.4, 80),
-                    (12.3, 78),
-                    (11.2, 76),
-                    (10.1, 74),
-                    (9.0, 72),
-                    (7.9, 70),
-                    (6.8, 68),
-                    (5.7, 66),
-                    (4.6, 64),
-                    (3.5, 62),
-                    (2.4, 60),
-                    (1.6, 50),
-                    (0.8, 40),
-                    (0.0, 30),
-                    (-0.8, 20),
-                    (-1.6, 10),
-                ],
-                "二年级": [
-                    (18.9, 100),
-                    (17.6, 95),
-                    (16.3, 90),
-                    (14.8, 85),
-                    (13.3, 80),
-                    (12.2, 78),
-                    (11.1, 76),
-                    (10.0, 74),
-                    (8.9, 72),
-                    (7.8, 70),
-                    (6.7, 68),
-                    (5.6, 66),
-                    (4.5, 64),
-                    (3.4, 62),
-                    (2.3, 60),
-                    (1.5, 50),
-                    (0.7, 40),
-                    (-0.1, 30),
-                    (-0.9, 20),
-                    (-1.7, 10),
-                ],
-                "三年级": [
-                    (19.2, 100),
-                    (17.9, 95),
-                    (16.6, 90),
-                    (14.9, 85),
-                    (13.2, 80),
-                    (12.1, 78),
-                    (11.0, 76),
-                    (9.9, 74),
-                    (8.8, 72),
-                    (7.7, 70),
-                    (6.6, 68),
-                    (5.5, 66),
-                    (4.4, 64),
-                    (3.3, 62),
-                    (2.2, 60),
-                    (1.4, 50),
-                    (0.6, 40),
-                    (-0.2, 30),
-                    (-1.0, 20),
-                    (-1.8, 10),
-                ],
-                "四年级": [
-                    (19.5, 100),
-                    (18.1, 95),
-                    (16.9, 90),
-                    (15.0, 85),
-                    (13.1, 80),
-                    (12.0, 78),
-                    (10.9, 76),
-                    (9.8, 74),
-                    (8.7, 72),
-                    (7.6, 70),
-                    (6.5, 68),
-                    (5.4, 66),
-                    (4.3, 64),
-                    (3.2, 62),
-                    (2.1, 60),
-                    (1.3, 50),
-                    (0.5, 40),
-                    (-0.3, 30),
-                    (-1.1, 20),
-                    (-1.9, 10),
-                ],
-                "五年级": [
-                    (19.8, 100),
-                    (18.5, 95),
-                    (17.2, 90),
-                    (15.1, 85),
-                    (13.0, 80),
-                    (11.9, 78),
-                    (10.8, 76),
-                    (9.7, 74),
-                    (8.6, 72),
-                    (7.5, 70),
-                    (6.4, 68),
-                    (5.3, 66),
-                    (4.2, 64),
-                    (3.1, 62),
-                    (2.0, 60),
-                    (1.2, 50),
-                    (0.4, 40),
-                    (-0.4, 30),
-                    (-1.2, 20),
-                    (-2.0, 10),
-                ],
-                "六年级": [
-                    (19.9, 100),
-                    (18.7, 95),
-                    (17.5, 90),
-                    (15.2, 85),
-                    (12.9, 80),
-                    (11.8, 78),
-                    (10.7, 76),
-                    (9.6, 74),
-                    (8.5, 72),
-                    (7.4, 70),
-                    (6.3, 68),
-                    (5.2, 66),
-                    (4.1, 64),
-                    (3.0, 62),
-                    (1.9, 60),
-                    (1.1, 50),
-                    (0.3, 40),
-                    (-0.5, 30),
-                    (-1.3, 20),
-                    (-2.1, 10),
-                ],
-            },
-        }
-        # 跳绳评分标准（表1-9、1-10）
-        self.rope_standards = {
-            "男": {
-                "一年级": [
-                    (109, 100),
-                    (104, 95),
-                    (99, 90),
-                    (93, 85),
-                    (87, 80),
-                    (80, 78),
-                    (73, 76),
-                    (66, 74),
-                    (59, 72),
-                    (52, 70),
-                    (45, 68),
-                    (38, 66),
-                    (31, 64),
-                    (24, 62),
-                    (17, 60),
-                    (14, 50),
-                    (11, 40),
-                    (8, 30),
-                    (5, 20),
-                    (2, 10),
-                ],
-                "二年级": [
-                    (117, 100),
-                    (112, 95),
-                    (107, 90),
-                    (101, 85),
-                    (95, 80),
-                    (88, 78),
-                    (81, 76),
-                    (74, 74),
-                    (67, 72),
-                    (60, 70),
-                    (53, 68),
-                    (46, 66),
-                    (39, 64),
-                    (32, 62),
-                    (25, 60),
-                    (22, 50),
-                    (19, 40),
-                    (16, 30),
-                    (13, 20),
-                    (10, 10),
-                ],
-                "三年级": [
-                    (126, 100),
-                    (121, 95),
-                    (116, 90),
-                    (110, 85),
-                    (104, 80),
-                    (97, 78),
-                    (90, 76),
-                    (83, 74),
-                    (76, 72),
-                    (69, 70),
-                    (62, 68),
-                    (55, 66),
-                    (48, 64),
-                    (41, 62),
-                    (34, 60),
-                    (31, 50),
-                    (28, 40),
-                    (25, 30),
-                    (22, 20),
-                    (19, 10),
-                ],
-                "四年级": [
-                    (137, 100),
-                    (132, 95),
-                    (127, 90),
-                    (121, 85),
-                    (115, 80),
-                    (108, 78),
-                    (101, 76),
-                    (94, 74),
-                    (87, 72),
-                    (80, 70),
-                    (73, 68),
-                    (66, 66),
-                    (59, 64),
-                    (52, 62),
-                    (45, 60),
-                    (42, 50),
-                    (39, 40),
-                    (36, 30),
-                    (33, 20),
-                    (30, 10),
-                ],
-                "五年级": [
-                    (148, 100),
-                    (143, 95),
-                    (138, 90),
-                    (132, 85),
-                    (126, 80),
-                    (119, 78),
-                    (112, 76),
-                    (105, 74),
-                    (98, 72),
-                    (91, 70),
-                    (84, 68),
-                    (77, 66),
-                    (70, 64),
-                    (63, 62),
-                    (56, 60),
-                    (53, 50),
-                    (50, 40),
-                    (47, 30),
-                    (44, 20),
-                    (41, 10),
-                ],
-                "六年级": [
-                    (157, 100),
-                    (152, 95),
-                    (147, 90),
-                    (141, 85),
-                    (135, 80),
-                    (128, 78),
-                    (121, 76),
-                    (114, 74),
-                    (107, 72),
-                    (100, 70),
-                    (93, 68),
-                    (86, 66),
-                    (79, 64),
-                    (72, 62),
-                    (65, 60),
-                    (62, 50),
-                    (59, 40),
-                    (56, 30),
-                    (53, 20),
-                    (50, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (117, 100),
-                    (110, 95),
-                    (103, 90),
-                    (95, 85),
-                    (87, 80),
-                    (80, 78),
-                    (73, 76),
-                    (66, 74),
-                    (59, 72),
-                    (52, 70),
-                    (45, 68),
-                    (38, 66),
-                    (31, 64),
-                    (24, 62),
-                    (17, 60),
-                    (14, 50),
-                    (11, 40),
-                    (8, 30),
-                    (5, 20),
-                    (2, 10),
-                ],
-                "二年级": [
-                    (127, 100),
-                    (120, 95),
-                    (113, 90),
-                    (105, 85),
-                    (97, 80),
-                    (90, 78),
-                    (83, 76),
-                    (76, 74),
-                    (69, 72),
-                    (62, 70),
-                    (55, 68),
-                    (48, 66),
-                    (41, 64),
-                    (34, 62),
-                    (27, 60),
-                    (24, 50),
-                    (21, 40),
-                    (18, 30),
-                    (15, 20),
-                    (12, 10),
-                ],
-                "三年级": [
-                    (139, 100),
-                    (132, 95),
-                    (125, 90),
-                    (117, 85),
-                    (109, 80),
-                    (102, 78),
-                    (95, 76),
-                    (88, 74),
-                    (81, 72),
-                    (74, 70),
-                    (67, 68),
-                    (60, 66),
-                    (53, 64),
-                    (46, 62),
-                    (39, 60),
-                    (36, 50),
-                    (33, 40),
-                    (30, 30),
-                    (27, 20),
-                    (24, 10),
-                ],
-                "四年级": [
-                    (149, 100),
-                    (142, 95),
-                    (135, 90),
-                    (127, 85),
-                    (119, 80),
-                    (112, 78),
-                    (105, 76),
-                    (98, 74),
-                    (91, 72),
-                    (84, 70),
-                    (77, 68),
-                    (70, 66),
-                    (63, 64),
-                    (56, 62),
-                    (49, 60),
-                    (46, 50),
-                    (43, 40),
-                    (40, 30),
-                    (37, 20),
-                    (34, 10),
-                ],
-                "五年级": [
-                    (158, 100),
-                    (151, 95),
-                    (144, 90),
-                    (136, 85),
-                    (128, 80),
-                    (121, 78),
-                    (114, 76),
-                    (107, 74),
-                    (100, 72),
-                    (93, 70),
-                    (86, 68),
-                    (79, 66),
-                    (72, 64),
-                    (65, 62),
-                    (58, 60),
-                    (55, 50),
-                    (52, 40),
-                    (49, 30),
-                    (46, 20),
-                    (43, 10),
-                ],
-                "六年级": [
-                    (166, 100),
-                    (159, 95),
-                    (152, 90),
-                    (144, 85),
-                    (136, 80),
-                    (129, 78),
-                    (122, 76),
-                    (115, 74),
-                    (108, 72),
-                    (101, 70),
-                    (94, 68),
-                    (87, 66),
-                    (80, 64),
-                    (73, 62),
-                    (66, 60),
-                    (63, 50),
-                    (60, 40),
-                    (57, 30),
-                    (54, 20),
-                    (51, 10),
-                ],
-            },
-        }
-        # 仰卧起坐评分标准（表1-13、1-14）
-        self.situp_standards = {
-            "男": {
-                "三年级": [
-                    (48, 100),
-                    (45, 95),
-                    (42, 90),
-                    (39, 85),
-                    (36, 80),
-                    (34, 78),
-                    (32, 76),
-                    (30, 74),
-                    (28, 72),
-                    (26, 70),
-                    (24, 68),
-                    (22, 66),
-                    (20, 64),
-                    (18, 62),
-                    (16, 60),
-                    (14, 50),
-                    (12, 40),
-                    (10, 30),
-                    (8, 20),
-                    (6, 10),
-                ],
-                "四年级": [
-                    (49, 100),
-                    (46, 95),
-                    (43, 90),
-                    (40, 85),
-                    (37, 80),
-                    (35, 78),
-                    (33, 76),
-                    (31, 74),
-                    (29, 72),
-                    (27, 70),
-                    (25, 68),
-                    (23, 66),
-                    (21, 64),
-                    (19, 62),
-                    (17, 60),
-                    (15, 50),
-                    (13, 40),
-                    (11, 30),
-                    (9, 20),
-                    (7, 10),
-                ],
-                "五年级": [
-                    (50, 100),
-                    (47, 95),
-                    (44, 90),
-                    (41, 85),
-                    (38, 80),
-                    (36, 78),
-                    (34, 76),
-                    (32, 74),
-                    (30, 72),
-                    (28, 70),
-                    (26, 68),
-                    (24, 66),
-                    (22, 64),
-                    (20, 62),
-                    (18, 60),
-                    (16, 50),
-                    (14, 40),
-                    (12, 30),
-                    (10, 20),
-                    (8, 10),
-                ],
-                "六年级": [
-                    (51, 100),
-                    (48, 95),
-                    (45, 90),
-                    (42, 85),
-                    (39, 80),
-                    (37, 78),
-                    (35, 76),
-                    (33, 74),
-                    (31, 72),
-                    (29, 70),
-                    (27, 68),
-                    (25, 66),
-                    (23, 64),
-                    (21, 62),
-                    (19, 60),
-                    (17, 50),
-                    (15, 40),
-                    (13, 30),
-                    (11, 20),
-                    (9, 10),
-                ],
-            },
-            "女": {
-                "三年级": [
-                    (46, 100),
-                    (44, 95),
-                    (42, 90),
-                    (39, 85),
-                    (36, 80),
-                    (34, 78),
-                    (32, 76),
-                    (30, 74),
-                    (28, 72),
-                    (26, 70),
-                    (24, 68),
-                    (22, 66),
-                    (20, 64),
-                    (18, 62),
-                    (16, 60),
-                    (14, 50),
-                    (12, 40),
-                    (10, 30),
-                    (8, 20),
-                    (6, 10),
-                ],
-                "四年级": [
-                    (47, 100),
-                    (45, 95),
-                    (43, 90),
-                    (40, 85),
-                    (37, 80),
-                    (35, 78),
-                    (33, 76),
-                    (31, 74),
-                    (29, 72),
-                    (27, 70),
-                    (25, 68),
-                    (23, 66),
-                    (21, 64),
-                    (19, 62),
-                    (17, 60),
-                    (15, 50),
-                    (13, 40),
-                    (11, 30),
-                    (9, 20),
-                    (7, 10),
-                ],
-                "五年级": [
-                    (48, 100),
-                    (46, 95),
-                    (44, 90),
-                    (41, 85),
-                    (38, 80),
-                    (36, 78),
-                    (34, 76),
-                    (32, 74),
-                    (30, 72),
-                    (28, 70),
-                    (26, 68),
-                    (24, 66),
-                    (22, 64),
-                    (20, 62),
-                    (18, 60),
-                    (16, 50),
-                    (14, 40),
-                    (12, 30),
-                    (10, 20),
-                    (8, 10),
-                ],
-                "六年级": [
-                    (49, 100),
-                    (47, 95),
-                    (45, 90),
-                    (42, 85),
-                    (39, 80),
-                    (37, 78),
-                    (35, 76),
-                    (33, 74),
-                    (31, 72),
-                    (29, 70),
-                    (27, 68),
-                    (25, 66),
-                    (23, 64),
-                    (21, 62),
-                    (19, 60),
-                    (17, 50),
-                    (15, 40),
-                    (13, 30),
-                    (11, 20),
-                    (9, 10),
-                ],
-            },
-        }
-        # 50米×8往返跑评分标准（表1-15、1-16）- 时间转换为秒数，越少分数越高
-        self.run8_standards = {
-            "男": {
-                "五年级": [
-                    (96, 100),
-                    (99, 95),
-                    (102, 90),
-                    (105, 85),
-                    (108, 80),
-                    (111, 78),
-                    (114, 76),
-                    (117, 74),
-                    (120, 72),
-                    (123, 70),
-                    (126, 68),
-                    (129, 66),
-                    (132, 64),
-                    (135, 62),
-                    (138, 60),
-                    (142, 50),
-                    (146, 40),
-                    (150, 30),
-                    (154, 20),
-                    (158, 10),
-                ],
-                "六年级": [
-                    (90, 100),
-                    (93, 95),
-                    (96, 90),
-                    (99, 85),
-                    (102, 80),
-                    (105, 78),
-                    (108, 76),
-                    (111, 74),
-                    (114, 72),
-                    (117, 70),
-                    (120, 68),
-                    (123, 66),
-                    (126, 64),
-                    (129, 62),
-                    (132, 60),
-                    (136, 50),
-                    (140, 40),
-                    (144, 30),
-                    (148, 20),
-                    (152, 10),
-                ],
-            },
-            "女": {
-                "五年级": [
-                    (101, 100),
-                    (104, 95),
-                    (107, 90),
-                    (110, 85),
-                    (113, 80),
-                    (116, 78),
-                    (119, 76),
-                    (122, 74),
-                    (125, 72),
-                    (128, 70),
-                    (131, 68),
-                    (134, 66),
-                    (137, 64),
-                    (140, 62),
-                    (143, 60),
-                    (147, 50),
-                    (151, 40),
-                    (155, 30),
-                    (159, 20),
-                    (163, 10),
-                ],
-                "六年级": [
-                    (97, 100),
-                    (100, 95),
-                    (103, 90),
-                    (106, 85),
-                    (109, 80),
-                    (112, 78),
-                    (115, 76),
-                    (118, 74),
-                    (121, 72),
-                    (124, 70),
-                    (127, 68),
-                    (130, 66),
-                    (133, 64),
-                    (136, 62),
-                    (139, 60),
-                    (143, 50),
-                    (147, 40),
-                    (151, 30),
-                    (155, 20),
-                    (159, 10),
-                ],
-            },
-        }
+        # 批量评分引擎
+        self.scoring_engine = ScoringEngine(self)
 
     def extract_grade_from_class(self, class_name):
         """从班级名称中提取年级"""
-        if pd.isna(class_name):
-            return None
-
-        class_str = str(class_name)
-        for grade in ["一年级", "二年级", "三年级", "四年级", "五年级", "六年级"]:
-            if grade in class_str:
-                return grade
-        return None
+        return extract_grade(class_name)
 
     def get_class_number(self, class_name):
         """从班级名称中提取班号"""
-        if pd.isna(class_name):
-            return None
+        return class_number(class_name)
 
-        match = re.search(r"(\d+)班", str(class_name))
-        if match:
-            return int(match.group(1))
-        return None
+    def is_selected_class(self, class_name):
+        """班级是否被选中处理（读取成绩文件时的行过滤条件，与 apply_year_class_filter 一致）"""
+        grade = self.extract_grade_from_class(class_name)
+        if not self.year_class_filter:
+            return grade in self.target_grades
+
+        if grade not in self.year_class_filter:
+            return False
+        classes = self.year_class_filter[grade]
+        if not classes:
+            return True
+        class_numbers = [
+            int(match.group(1))
+            for match in (re.search(r"^(\d+)班$", name) for name in classes)
+            if match
+        ]
+        return self.get_class_number(class_name) in class_numbers
 
     def apply_year_class_filter(self, df):
         """根据年级班级过滤参数过滤数据"""
@@ -1620,90 +232,19 @@ class GradeClassProcessor:
         else:
             return df
 
-    def calculate_bmi(self, height, weight):
-        """计算BMI"""
-        try:
-            height_m = float(height) / 100
-            weight_kg = float(weight)
-            return round(weight_kg / (height_m**2), 1)
-        except:
-            return None
-
-    def get_score_from_table(self, value, standards_table, reverse=False):
-        """根据评分表获取分数"""
-        if pd.isna(value):
-            return np.nan
-
-        for threshold, score in standards_table:
-            if reverse:  # 对于时间类项目，数值越小分数越高
-                if value <= threshold:
-                    return score
-            else:  # 对于其他项目，数值越大分数越高
-                if value >= threshold:
-                    return score
-
-        # 如果都不满足，返回最低分
-        return standards_table[-1][1]
-
-    def get_bmi_score_and_grade(self, bmi, gender, grade):
-        """获取BMI分数和等级"""
-        if pd.isna(bmi) or grade not in self.bmi_standards.get(gender, {}):
-            return np.nan, "未测"
-
-        standards = self.bmi_standards[gender][grade]
-
-        if standards["正常"][0] <= bmi <= standards["正常"][1]:
-            return 100, "正常"
-        elif bmi <= standards["低体重"][1]:
-            return 80, "低体重"
-        elif standards["超重"][0] <= bmi <= standards["超重"][1]:
-            return 80, "超重"
-        elif bmi >= standards["肥胖"][0]:
-            return 60, "肥胖"
-        else:
-            return 80, "正常"  # 默认
-
     def get_grade_from_score(self, score):
         """根据分数获取等级"""
-        if pd.isna(score):
-            return "未测"
-        elif score >= 90:
-            return "优秀"
-        elif score >= 80:
-            return "良好"
-        elif score >= 60:
-            return "及格"
-        else:
-            return "不及格"
-
-    def convert_time_to_seconds(self, time_str):
-        """将时间字符串转换为秒数"""
-        if pd.isna(time_str):
-            return np.nan
-
-        try:
-            # 处理可能的时间格式
-            time_str = str(time_str).strip()
-            if ":" in time_str:
-                parts = time_str.split(":")
-                minutes = float(parts[0])
-                seconds = float(parts[1])
-                return minutes * 60 + seconds
-            else:
-                return float(time_str)
-        except:
-            return np.nan
+        return self.standards.levels([score])[0]
 
-    def calculate_all_scores_by_standards(self, df):
-        """根据国家标准计算所有项目得分"""
+    def calculate_all_scores_by_standards(self, df, grades=None):
+        """根据国家标准计算所有项目得分，grades 为参与评分的年级（默认 target_grades）"""
         print("根据国家标准计算各项目得分...")
 
         # 先确保BMI列存在
         if "BMI" not in df.columns:
             if "身高(cm)" in df.columns and "体重(kg)" in df.columns:
-                df["BMI"] = df.apply(
-                    lambda row: self.calculate_bmi(row["身高(cm)"], row["体重(kg)"]),
-                    axis=1,
+                df["BMI"] = self.scoring_engine.bmi_values(
+                    df["身高(cm)"], df["体重(kg)"], require_positive=False
                 )
             else:
                 print("警告：缺少身高或体重数据，无法计算BMI")
@@ -1712,316 +253,33 @@ class GradeClassProcessor:
         df["BMI得分"] = np.nan
         df["BMI等级"] = "未测"
         df["肺活量得分"] = np.nan
-        df["肺活量等级"] = "未测"
+        df["肺活量等级"] = self.scoring_engine.untested_levels(df)
         df["50米跑得分"] = np.nan
-        df["50米跑等级"] = "未测"
+        df["50米跑等级"] = self.scoring_engine.untested_levels(df)
         df["坐位体前屈得分"] = np.nan
-        df["坐位体前屈等级"] = "未测"
+        df["坐位体前屈等级"] = self.scoring_engine.untested_levels(df)
         df["跳绳得分"] = np.nan
-        df["跳绳等级"] = "未测"
+        df["跳绳等级"] = self.scoring_engine.untested_levels(df)
         df["仰卧起坐得分"] = np.nan
-        df["仰卧起坐等级"] = "未测"
+        df["仰卧起坐等级"] = self.scoring_engine.untested_levels(df)
         df["往返跑得分"] = np.nan
-        df["往返跑等级"] = "未测"
+        df["往返跑等级"] = self.scoring_engine.untested_levels(df)
         df["附加分"] = 0
 
-        # 按年级和性别分组计算 - 只处理四年级和六年级
-        for grade in ["四年级", "六年级"]:
-            for gender in ["男", "女"]:
-                mask = (df["年级"] == grade) & (df["性别"] == gender)
-                if not mask.any():
-                    continue
-
-                print(f"计算{grade}{gender}学生得分...")
-
-                # BMI评分
-                for idx in df[mask].index:
-                    if "BMI" in df.columns:
-                        bmi = df.loc[idx, "BMI"]
-                        score, grade_level = self.get_bmi_score_and_grade(
-                            bmi, gender, grade
-                        )
-                        df.loc[idx, "BMI得分"] = score
-                        df.loc[idx, "BMI等级"] = grade_level
-
-                # 肺活量评分
-                if (
-                    gender in self.lung_standards
-                    and grade in self.lung_standards[gender]
-                ):
-                    standards = self.lung_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = (
-                            df.loc[idx, "肺活量(ml)"]
-                            if "肺活量(ml)" in df.columns
-                            else np.nan
-                        )
-                        score = self.get_score_from_table(
-                            value, standards, reverse=False
-                        )
-                        df.loc[idx, "肺活量得分"] = score
-                        df.loc[idx, "肺活量等级"] = self.get_grade_from_score(score)
-
-                # 50米跑评分
-                if (
-                    gender in self.run50_standards
-                    and grade in self.run50_standards[gender]
-                ):
-                    standards = self.run50_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = df.loc[idx, "50米跑(s)"]
-                        # 数据有效性检查：如果为空值，得分留空，等级为'未测'
-                        if pd.isna(value):
-                            score = np.nan
-                            grade_level = "未测"
-                        elif value <= 0 or value > 60:
-                            score = 0  # 无效数据给0分
-                            grade_level = self.get_grade_from_score(score)
-                        else:
-                            score = self.get_score_from_table(
-                                value, standards, reverse=True
-                            )
-                            grade_level = self.get_grade_from_score(score)
-                        df.loc[idx, "50米跑得分"] = score
-                        df.loc[idx, "50米跑等级"] = grade_level
-
-                # 坐位体前屈评分
-                if (
-                    gender in self.sitreach_standards
-                    and grade in self.sitreach_standards[gender]
-                ):
-                    standards = self.sitreach_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = (
-                            df.loc[idx, "坐位体前屈(cm)"]
-                            if "坐位体前屈(cm)" in df.columns
-                            else np.nan
-                        )
-                        score = self.get_score_from_table(
-                            value, standards, reverse=False
-                        )
-                        df.loc[idx, "坐位体前屈得分"] = score
-                        df.loc[idx, "坐位体前屈等级"] = self.get_grade_from_score(score)
-
-                # 跳绳评分
-                if (
-                    gender in self.rope_standards
-                    and grade in self.rope_standards[gender]
-                ):
-                    standards = self.rope_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = df.loc[idx, "一分钟跳绳(个）"]
-                        score = self.get_score_from_table(
-                            value, standards, reverse=False
-                        )
-                        df.loc[idx, "跳绳得分"] = score
-                        df.loc[idx, "跳绳等级"] = self.get_grade_from_score(score)
-
-                        # 计算跳绳加分（小学跳绳为加分项目）
-                        if pd.notna(score) and score == 100:
-                            # 如果达到100分，计算超出部分的加分
-                            max_standard = standards[0][0]  # 100分对应的次数
-                            if pd.notna(value) and value > max_standard:
-                                # 按照加分表计算，每超出一定次数给对应加分
-                                extra_count = value - max_standard
-                                # 跳绳加分标准（根据国家标准）
-                                # 跳绳加分：每超出2个给1分，最高20分
-                                bonus_score = min(20, extra_count // 2)
-                                df.loc[idx, "附加分"] = bonus_score
-
-                # 仰卧起坐评分（三年级及以上）
-                if grade in ["三年级", "四年级", "五年级", "六年级"]:
-                    if (
-                        gender in self.situp_standards
-                        and grade in self.situp_standards[gender]
-                    ):
-                        standards = self.situp_standards[gender][grade]
-                        for idx in df[mask].index:
-                            value = (
-                                df.loc[idx, "一分钟仰卧起坐(个)"]
-                                if "一分钟仰卧起坐(个)" in df.columns
-                                else np.nan
-                            )
-                            score = self.get_score_from_table(
-                                value, standards, reverse=False
-                            )
-                            df.loc[idx, "仰卧起坐得分"] = score
-                            df.loc[idx, "仰卧起坐等级"] = self.get_grade_from_score(
-                                score
-                            )
-
-                # 50米×8往返跑评分（五六年级）
-                if grade in ["五年级", "六年级"]:
-                    if (
-                        gender in self.run8_standards
-                        and grade in self.run8_standards[gender]
-                    ):
-                        standards = self.run8_standards[gender][grade]
-                        for idx in df[mask].index:
-                            value = df.loc[idx, "50米×8往返跑(s)"]
-                            if pd.notna(value):
-                                # 如果是时间格式，转换为秒数
-                                seconds = self.convert_time_to_seconds(value)
-                                # 数据有效性检查：往返跑时间必须在合理范围内（30-300秒）
-                                if pd.isna(seconds) or seconds <= 0 or seconds > 300:
-                                    score = 0  # 无效数据给0分
-                                else:
-                                    score = self.get_score_from_table(
-                                        seconds, standards, reverse=True
-                                    )
-                                df.loc[idx, "往返跑得分"] = score
-                                df.loc[idx, "往返跑等级"] = self.get_grade_from_score(
-                                    score
-                                )
+        # 按(年级, 性别)一次分组，批量计算BMI和各单项得分
+        self.scoring_engine.score_all(df, grades or self.target_grades)
 
     def calculate_comprehensive_score(self, df):
         """根据国家标准权重计算综合得分"""
         print("计算综合得分...")
 
-        df["标准分"] = 0.0
-
-        for idx, row in df.iterrows():
-            grade = row["年级"]
-            if grade not in self.weights:
-                continue
-
-            weights = self.weights[grade]
-            total_score = 0
-
-            # 根据年级计算加权总分
-            if pd.notna(row["BMI得分"]):
-                total_score += row["BMI得分"] * weights.get("BMI", 0)
-
-            if pd.notna(row["肺活量得分"]):
-                total_score += row["肺活量得分"] * weights.get("肺活量", 0)
-
-            if pd.notna(row["50米跑得分"]):
-                total_score += row["50米跑得分"] * weights.get("50米跑", 0)
-
-            if pd.notna(row["坐位体前屈得分"]):
-                total_score += row["坐位体前屈得分"] * weights.get("坐位体前屈", 0)
-
-            if pd.notna(row["跳绳得分"]):
-                total_score += row["跳绳得分"] * weights.get("跳绳", 0)
-
-            if grade in ["三年级", "四年级", "五年级", "六年级"] and pd.notna(
-                row["仰卧起坐得分"]
-            ):
-                total_score += row["仰卧起坐得分"] * weights.get("仰卧起坐", 0)
-
-            if grade in ["五年级", "六年级"] and pd.notna(row["往返跑得分"]):
-                total_score += row["往返跑得分"] * weights.get("往返跑", 0)
-
-            df.loc[idx, "标准分"] = round(total_score, 1)  # 改成 float
-
-        # 综合得分 = 标准分 + 附加分
-        df["综合得分"] = df["标准分"] + df["附加分"]
-
-        # 设置综合等级，如果所有测试项目都没有参与则为'未测'
-        def get_comprehensive_grade(row):
-            # 检查主要测试项目是否都为空（BMI、肺活量、50米跑、坐位体前屈、跳绳）
-            main_scores = [
-                row["BMI得分"],
-                row["肺活量得分"],
-                row["50米跑得分"],
-                row["坐位体前屈得分"],
-                row["跳绳得分"],
-            ]
-            # 对于三年级及以上还要检查仰卧起坐
-            if row["年级"] in ["三年级", "四年级", "五年级", "六年级"]:
-                main_scores.append(row["仰卧起坐得分"])
-            # 对于五六年级还要检查往返跑
-            if row["年级"] in ["五年级", "六年级"]:
-                main_scores.append(row["往返跑得分"])
-
-            # 如果所有主要项目都是空值，则为'未测'
-            if all(pd.isna(score) for score in main_scores):
-                return "未测"
-            else:
-                return self.get_grade_from_score(row["综合得分"])
-
-        df["综合等级"] = df.apply(get_comprehensive_grade, axis=1)
+        # 得分矩阵 × 年级权重矩阵，一次性计算标准分、综合得分和综合等级
+        self.scoring_engine.score_comprehensive(df)
 
     def calculate_statistics(self, df):
-        """计算统计数据"""
-        stats = {}
-
-        # 基本统计
-        stats["total_count"] = len(df)
-        stats["male_count"] = len(df[df["性别"] == "男"])
-        stats["female_count"] = len(df[df["性别"] == "女"])
-
-        # 实查人数（有综合等级且不为'未测'的学生）
-        tested_students = df[df["综合等级"] != "未测"]
-        stats["tested_total"] = len(tested_students)
-        stats["tested_male"] = len(tested_students[tested_students["性别"] == "男"])
-        stats["tested_female"] = len(tested_students[tested_students["性别"] == "女"])
-
-        # 计算实查比率
-        stats["total_ratio"] = f"{stats['tested_total']/stats['total_count']*100:.1f}%"
-        stats["male_ratio"] = (
-            f"{stats['tested_male']/stats['male_count']*100:.1f}%"
-            if stats["male_count"] > 0
-            else "0%"
-        )
-        stats["female_ratio"] = (
-            f"{stats['tested_female']/stats['female_count']*100:.1f}%"
-            if stats["female_count"] > 0
-            else "0%"
-        )
-
-        # 综合等级统计（只统计实际参与测试的学生，排除'未测'）
-        tested_grade_counts = tested_students["综合等级"].value_counts()
-        stats["excellent_total"] = tested_grade_counts.get("优秀", 0)
-        stats["good_total"] = tested_grade_counts.get("良好", 0)
-        stats["pass_total"] = tested_grade_counts.get("及格", 0)
-        stats["fail_total"] = tested_grade_counts.get("不及格", 0)
-
-        # 分性别统计综合等级（只统计实际参与测试的学生）
-        tested_male = tested_students[tested_students["性别"] == "男"]
-        tested_female = tested_students[tested_students["性别"] == "女"]
-        male_grades = tested_male["综合等级"].value_counts()
-        female_grades = tested_female["综合等级"].value_counts()
-
-        stats["excellent_male"] = male_grades.get("优秀", 0)
-        stats["excellent_female"] = female_grades.get("优秀", 0)
-        stats["good_male"] = male_grades.get("良好", 0)
-        stats["good_female"] = female_grades.get("良好", 0)
-        stats["pass_male"] = male_grades.get("及格", 0)
-        stats["pass_female"] = female_grades.get("及格", 0)
-        stats["fail_male"] = male_grades.get("不及格", 0)
-        stats["fail_female"] = female_grades.get("不及格", 0)
-
-        # 各项目等级人数统计（根据各自得分计算）
-        for project in [
-            "BMI",
-            "肺活量",
-            "50米跑",
-            "坐位体前屈",
-            "跳绳",
-            "仰卧起坐",
-            "往返跑",
-        ]:
-            score_col = f"{project}得分"
-            if score_col in df.columns:
-                project_scores = df[score_col].dropna()
-                stats[f"{project}_excellent"] = len(
-                    project_scores[project_scores >= 90]
-                )
-                stats[f"{project}_good"] = len(
-                    project_scores[(project_scores >= 80) & (project_scores < 90)]
-                )
-                stats[f"{project}_pass"] = len(
-                    project_scores[(project_scores >= 60) & (project_scores < 80)]
-                )
-                stats[f"{project}_fail"] = len(project_scores[project_scores < 60])
-            else:
-                stats[f"{project}_excellent"] = 0
-                stats[f"{project}_good"] = 0
-                stats[f"{project}_pass"] = 0
-                stats[f"{project}_fail"] = 0
-
-        return stats
+        """计算统计数据（各学生统计贡献之和）"""
+        counts = student_counts(df, self.standards).sum()
+        return stats_from_counts(counts)
 
     def create_directories(self, student_data):
         """为每个年级创建对应的文件夹"""
@@ -2041,48 +299,123 @@ class GradeClassProcessor:
     def load_student_data(self):
         """加载学生数据"""
         print("=== 加载学生数据 ===")
-        print("只处理四年级和六年级的数据")
+        print(f"只处理{'、'.join(self.target_grades)}的数据")
+
+        # 优先使用 whole_school.py 保存的评分缓存
+        cached = self.load_cached_student_data()
+        if cached is not None:
+            return cached
+
+        return self.read_student_data()
+
+    def load_cached_student_data(self):
+        """由 whole_school.py 保存的评分缓存得到学生数据，缓存不可用时返回 None"""
+        cached = load_scored_cache(
+            os.path.join(self.output_dir, "全校学生体质健康测试成绩总表.xlsx"),
+            self.target_grades,
+            source_file=self.input_file,
+            standards_hash=self.standards.source_hash,
+        )
+        if cached is None:
+            return None
+        return self.prepare_student_data(cached["scored"], scored=True)
 
+    def read_student_data(self):
+        """读取输入文件并评分"""
         print(f"读取文件: {self.input_file}")
 
         try:
-            df = pd.read_excel(self.input_file)
-            print(f"读取到 {len(df)} 条数据")
+            # 只读取评分用到的列和选中年级班级的行
+            df = read_excel_rows(
+                self.input_file,
+                columns=ScoringEngine.INPUT_COLUMNS,
+                filters={"班级名称": self.is_selected_class},
+            )
+            print(
+                f"读取到 {len(df)} 条选中年级班级的数据（共 {df.attrs['rows_read']} 条）"
+            )
 
-            # 列名映射以适应新的Excel格式
-            column_mapping = {"学籍号": "学号"}
+            return self.prepare_student_data(df)
 
-            # 应用列名映射
-            df = df.rename(columns=column_mapping)
+        except Exception as e:
+            print(f"读取文件 {self.input_file} 时出错: {e}")
+            return pd.DataFrame()
 
-            # 数据清理（只检查姓名）
-            df_clean = df.dropna(subset=["姓名"])
-            print(f"清理后剩余 {len(df_clean)} 条有效数据")
+    def prepare_student_data(self, df, scored=False):
+        """清理、过滤学生数据并计算得分
 
-            # 添加年级信息
-            df_clean["年级"] = df_clean["班级名称"].apply(self.extract_grade_from_class)
-            df_clean["班号"] = df_clean["班级名称"].apply(self.get_class_number)
+        scored 为 True 时 df 为 whole_school.py 已评分的学生数据，直接使用其中的得分
+        """
+        # 列名映射以适应新的Excel格式
+        column_mapping = {"学籍号": "学号"}
 
-            # 应用年级班级过滤
-            if self.year_class_filter:
-                df_clean = self.apply_year_class_filter(df_clean)
-                print(f"应用年级班级过滤后剩余 {len(df_clean)} 条数据")
-            else:
-                # 默认过滤只保留四年级和六年级
-                target_grades = ["四年级", "六年级"]
-                df_clean = df_clean[df_clean["年级"].isin(target_grades)]
-                print(f"过滤后剩余 {len(df_clean)} 条四年级和六年级数据")
+        # 应用列名映射
+        df = df.rename(columns=column_mapping)
+
+        # 数据清理（只检查姓名）
+        df_clean = df.dropna(subset=["姓名"])
+        print(f"清理后剩余 {len(df_clean)} 条有效数据")
+
+        # 添加年级信息（每种班级名称只解析一次）
+        class_info = normalize_class_names(df_clean["班级名称"])
+        # 年级存为普通字符串列（分类列分组时会包含没有学生的年级）
+        df_clean["年级"] = class_info["年级"].astype(object)
+        df_clean["班号"] = class_info["班号"]
+
+        # 应用年级班级过滤
+        if self.year_class_filter:
+            df_clean = self.apply_year_class_filter(df_clean)
+            print(f"应用年级班级过滤后剩余 {len(df_clean)} 条数据")
+        else:
+            # 默认过滤只保留参与评分的年级
+            df_clean = df_clean[df_clean["年级"].isin(self.target_grades)]
+            print(f"过滤后剩余 {len(df_clean)} 条{'、'.join(self.target_grades)}数据")
 
-            # 计算所有项目得分（包括BMI计算）
+        # 计算所有项目得分（包括BMI计算）
+        if not scored:
             self.calculate_all_scores_by_standards(df_clean)
             self.calculate_comprehensive_score(df_clean)
+        else:
+            self.restore_source_bmi(df_clean)
 
-            print(f"总共处理了 {len(df_clean)} 名学生的数据")
-            return df_clean
+        print(f"总共处理了 {len(df_clean)} 名学生的数据")
+        return df_clean
 
-        except Exception as e:
-            print(f"读取文件 {self.input_file} 时出错: {e}")
-            return pd.DataFrame()
+    def verify_scored_cache(self):
+        """校验评分缓存：重新读取并评分输入文件，与沿用缓存得到的学生数据逐列比较
+
+        返回不一致的列名列表，缓存不可用时返回 None
+        """
+        cached = self.load_cached_student_data()
+        if cached is None:
+            return None
+        scored = self.read_student_data()
+        return differing_columns(scored, cached)
+
+    def restore_source_bmi(self, df):
+        """沿用 whole_school.py 的评分结果时，按本脚本的规则恢复BMI
+
+        whole_school.py 总是按身高体重重新计算BMI（保留1位小数，身高或体重不大于0时为空值），
+        本脚本以成绩文件原有的BMI列为准，没有BMI列时才按身高体重计算。
+        BMI有变化的学生需要重新计算BMI得分、等级和综合得分
+        """
+        if ScoringEngine.SOURCE_BMI_COLUMN in df.columns:
+            bmi = df.pop(ScoringEngine.SOURCE_BMI_COLUMN)
+        elif "身高(cm)" in df.columns and "体重(kg)" in df.columns:
+            bmi = self.scoring_engine.bmi_values(
+                df["身高(cm)"], df["体重(kg)"], require_positive=False
+            )
+        else:
+            return
+
+        old = pd.to_numeric(df["BMI"], errors="coerce")
+        df["BMI"] = bmi
+        new = pd.to_numeric(df["BMI"], errors="coerce")
+        changed = (old != new) & ~(old.isna() & new.isna())
+        if changed.any():
+            print(f"{changed.sum()} 名学生的BMI与全校总表不同，重新计算BMI得分")
+            self.scoring_engine.rescore_bmi(df, self.target_grades)
+            self.calculate_comprehensive_score(df)
 
     def process(self):
         all_data = self.load_student_data()
@@ -2100,8 +433,8 @@ class GradeClassProcessor:
 
         print("✅ 测试完成，仅生成一个班级的汇总表，可用于检查格式")
 
-    def create_class_summary(self, class_data, grade, class_num):
-        """创建班级汇总表"""
+    def create_class_summary(self, class_data, grade, class_num, stats=None):
+        """创建班级汇总表，stats 为已计算好的班级统计（默认由 class_data 计算）"""
         wb = Workbook()
         ws = wb.active
         ws.title = "初中，高中，大学级"
@@ -2109,40 +442,31 @@ class GradeClassProcessor:
         # 设置标题
         ws["A1"] = "班级综合评级人数汇总统计"
         ws.merge_cells("A1:R1")
-        ws["A1"].font = Font(bold=True, size=24)
-        ws["A1"].alignment = Alignment(horizontal="center")
+        ws["A1"].font = font(bold=True, size=24)
+        ws["A1"].alignment = HORIZONTAL_CENTER
 
         # 班级信息行
-        grade_map = {
-            "一年级": "一",
-            "二年级": "二",
-            "三年级": "三",
-            "四年级": "四",
-            "五年级": "五",
-            "六年级": "六",
-        }
-        grade_short = grade_map.get(grade, grade)
-        class_name = f"{grade_short}{class_num}班"
+        class_name = short_class_name(grade, class_num)
 
         ws.merge_cells("A2:C2")
         ws["A2"] = "班级名称："
-        ws["A2"].font = Font(size=14)
+        ws["A2"].font = font(size=14)
 
         ws.merge_cells("D2:F2")
         ws["D2"] = class_name
-        ws["D2"].font = Font(size=14)
+        ws["D2"].font = font(size=14)
 
         ws["G2"] = "测评人："
-        ws["G2"].font = Font(size=14)
+        ws["G2"].font = font(size=14)
 
         ws.merge_cells("J2:K2")
         ws["J2"] = "本次体测日期："
-        ws["J2"].font = Font(size=14)
+        ws["J2"].font = font(size=14)
 
         ws.merge_cells("L2:N2")
         # 根据年级设置测试日期
         ws["L2"] = "2025/09/23-2025/09/24"
-        ws["L2"].font = Font(size=14)
+        ws["L2"].font = font(size=14)
 
         # 统计数据
         total_students = len(class_data)
@@ -2150,7 +474,8 @@ class GradeClassProcessor:
         female_count = len(class_data[class_data["性别"] == "女"])
 
         # 根据实际数据计算统计信息
-        stats = self.calculate_statistics(class_data)
+        if stats is None:
+            stats = self.calculate_statistics(class_data)
 
         excellent_count = stats["excellent_total"]
         good_count = stats["good_total"]
@@ -2177,33 +502,26 @@ class GradeClassProcessor:
         # 计算 R9:R12 的总和，并写入 R13
         ws["R13"] = f"=SUM(R9:R12)"
         # 可选：设置单元格样式（居中、加粗等）
-        ws["R13"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["R13"].font = Font(bold=True)
+        ws["R13"].alignment = CENTER
+        ws["R13"].font = BOLD
 
         # 此时再获取最大行列（必须放在这里！）
         max_row = ws.max_row
         max_col = ws.max_column
 
-        thin_border = Side(border_style="thin", color="000000")
-        thick_border = Side(border_style="medium", color="000000")
+        thick_border = MEDIUM_BLACK
 
         # --- 1. 给从第3行到最后一行，所有列加细线边框 + 居中 ---
         for row in ws.iter_rows(min_row=3, max_row=max_row, min_col=1, max_col=max_col):
             for cell in row:
-                cell.border = Border(
-                    left=thin_border,
-                    right=thin_border,
-                    top=thin_border,
-                    bottom=thin_border,
-                )
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+                apply_style(cell, "black_grid")
 
         # --- 2. 加粗外框：左、右、上、下 ---
         for row_idx in range(3, max_row + 1):  # 修复：包含最后一行
             # 左列
             left_cell = ws.cell(row=row_idx, column=1)
             current = left_cell.border
-            left_cell.border = Border(
+            left_cell.border = border(
                 left=thick_border,
                 right=current.right,
                 top=current.top,
@@ -2213,7 +531,7 @@ class GradeClassProcessor:
             # 右列
             right_cell = ws.cell(row=row_idx, column=max_col)
             current = right_cell.border
-            right_cell.border = Border(
+            right_cell.border = border(
                 left=current.left,
                 right=thick_border,
                 top=current.top,
@@ -2224,7 +542,7 @@ class GradeClassProcessor:
             # 上边（第3行）
             top_cell = ws.cell(row=3, column=col_idx)
             current = top_cell.border
-            top_cell.border = Border(
+            top_cell.border = border(
                 left=current.left,
                 right=current.right,
                 top=thick_border,
@@ -2234,7 +552,7 @@ class GradeClassProcessor:
             # 下边（最后一行）
             bottom_cell = ws.cell(row=max_row, column=col_idx)
             current = bottom_cell.border
-            bottom_cell.border = Border(
+            bottom_cell.border = border(
                 left=current.left,
                 right=current.right,
                 top=current.top,
@@ -2246,23 +564,21 @@ class GradeClassProcessor:
             min_row=2, max_row=ws.max_row, min_col=1, max_col=ws.max_column
         ):
             for cell in row:
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+                apply_style(cell, "center")
 
         # 给表头行（如第2-15行）启用换行和居中
         for row in [2, 15]:
             for cell in ws[row]:
                 if cell.value:
-                    cell.alignment = Alignment(
-                        wrap_text=True, horizontal="center", vertical="center"
-                    )
+                    cell.alignment = CENTER_WRAP
             ws.row_dimensions[row].height = 48.6  # 设置行高
 
         # 第1-13行内容都居中加粗
         for row_idx in range(1, 14):  # 第1-13行
             for cell in ws[row_idx]:
                 if cell.value:
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                    cell.font = Font(bold=True, size=cell.font.size or 11)
+                    cell.alignment = CENTER
+                    cell.font = font(bold=True, size=cell.font.size or 11)
 
         # 设置行高row2-13
         for row in [2, 13]:
@@ -2509,19 +825,19 @@ class GradeClassProcessor:
         cell.value = "各单项实查评价人数统计"
 
         # 可选：设置格式（居中 + 加粗）
-        cell.alignment = Alignment(
+        cell.alignment = alignment(
             horizontal="center",  # 水平居中
             vertical="center",  # 垂直居中
             wrap_text=True,  # 自动换行（如果文字太长）
         )
-        cell.font = Font(bold=True)
+        cell.font = BOLD
 
         # --- 合并 E13:H13 并写入“单项实查人数合计” ---
         ws.merge_cells("E13:H13")
         cell = ws["E13"]
         cell.value = "单项实查人数合计"
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.font = BOLD
+        cell.alignment = CENTER
 
         # --- 计算项目列的第9~12行（四个等级）的人数总和，并写入第13行 ---
         # 基础项目列：I=9, J=10, K=11, L=12, M=13
@@ -2548,15 +864,15 @@ class GradeClassProcessor:
         # --- 可选：给第13行加粗 ---
         for col_idx in project_cols:
             cell = ws.cell(row=13, column=col_idx)
-            cell.font = Font(bold=True)
+            cell.font = BOLD
 
         # row14插入各单项指标成绩得分等级汇总
         max_col = 18
         ws.merge_cells(start_row=14, start_column=1, end_row=14, end_column=max_col)
         title_cell = ws.cell(row=14, column=1)
         title_cell.value = "各单项指标成绩得分等级汇总"
-        title_cell.font = Font(size=20, bold=True)
-        title_cell.alignment = Alignment(horizontal="center")
+        title_cell.font = font(size=20, bold=True)
+        title_cell.alignment = HORIZONTAL_CENTER
         ws.row_dimensions[row].height = 33
 
     def add_class_student_data(self, ws, class_data):
@@ -2595,9 +911,9 @@ class GradeClassProcessor:
 
         for cell in ws[15]:
             if cell.font:  # 保留原有字体大小，只加粗
-                cell.font = Font(size=cell.font.size or 14, bold=True)
+                cell.font = font(size=cell.font.size or 14, bold=True)
             else:
-                cell.font = Font(size=14, bold=True)
+                cell.font = font(size=14, bold=True)
 
         # 设置A到O列的表头
         for col, header in enumerate(headers, 1):
@@ -2610,7 +926,7 @@ class GradeClassProcessor:
         # 设置Q、R列表头的字体
         for col in [17, 18]:
             cell = ws.cell(row=15, column=col)
-            cell.font = Font(size=14, bold=True)
+            cell.font = font(size=14, bold=True)
 
         # 按综合得分从高到低排序学生数据
         class_data_sorted = class_data.sort_values(
@@ -2685,23 +1001,19 @@ class GradeClassProcessor:
             )
             comprehensive_score = student.get("综合得分", "")
             ws.cell(row=start_row, column=17, value=comprehensive_score)
-            ws.cell(row=start_row, column=17).alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
+            ws.cell(row=start_row, column=17).alignment = CENTER
 
             # 合并R列（第18列）的三行
             ws.merge_cells(
                 start_row=start_row, start_column=18, end_row=end_row, end_column=18
             )
             ws.cell(row=start_row, column=18, value=student.get("综合等级", ""))
-            ws.cell(row=start_row, column=18).alignment = Alignment(
-                horizontal="center", vertical="center"
-            )
+            ws.cell(row=start_row, column=18).alignment = CENTER
 
             student_seq += 1  # 序号递增，为下一个学生做准备
 
-    def create_grade_summary(self, grade_data, grade):
-        """创建年级汇总表"""
+    def create_grade_summary(self, grade_data, grade, grade_stats=None):
+        """创建年级汇总表，grade_stats 为已汇总好的年级统计（默认由 grade_data 计算）"""
         wb = Workbook()
         ws = wb.active
         ws.title = "初中，高中，大学级"
@@ -2717,8 +1029,8 @@ class GradeClassProcessor:
         # 设置标题
         ws["A1"] = "年级综合评级人数汇总统计"
         ws.merge_cells(f"A1:{get_column_letter(title_max_col)}1")
-        ws["A1"].font = Font(bold=True, size=14)
-        ws["A1"].alignment = Alignment(horizontal="center")
+        ws["A1"].font = font(bold=True, size=14)
+        ws["A1"].alignment = HORIZONTAL_CENTER
 
         # 年级信息行
         ws["A2"] = "年级名称："
@@ -2727,13 +1039,14 @@ class GradeClassProcessor:
         ws["L2"] = self.today
         # ws['P2'] = "九江伍玖陆壹软件：19070256136"
 
-        # 统计数据
-        total_students = len(grade_data)
-        male_count = len(grade_data[grade_data["性别"] == "男"])
-        female_count = len(grade_data[grade_data["性别"] == "女"])
-
         # 计算年级统计
-        grade_stats = self.calculate_statistics(grade_data)
+        if grade_stats is None:
+            grade_stats = self.calculate_statistics(grade_data)
+
+        # 统计数据
+        total_students = grade_stats["total_count"]
+        male_count = grade_stats["male_count"]
+        female_count = grade_stats["female_count"]
 
         # 添加年级统计
         self.add_grade_statistics(
@@ -2753,24 +1066,21 @@ class GradeClassProcessor:
         max_col += 1  # 最后的综合等级列
 
         # 定义边框样式
-        thin_side = Side(style="thin")
-        medium_side = Side(style="medium")
+        medium_side = MEDIUM
 
         # 先给所有单元格加细边框
         for row in ws.iter_rows(
             min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col
         ):
             for cell in row:
-                cell.border = Border(
-                    left=thin_side, right=thin_side, top=thin_side, bottom=thin_side
-                )
+                apply_style(cell, "thin_border")
 
         # 再加强外框：只加粗最外一圈的边
         # 左边框（A列）
         for row_idx in range(min_row, max_row + 1):
             cell = ws.cell(row=row_idx, column=min_col)
             old_border = cell.border
-            cell.border = Border(
+            cell.border = border(
                 left=medium_side,
                 right=old_border.right,
                 top=old_border.top,
@@ -2781,7 +1091,7 @@ class GradeClassProcessor:
         for row_idx in range(min_row, max_row + 1):
             cell = ws.cell(row=row_idx, column=max_col)
             old_border = cell.border
-            cell.border = Border(
+            cell.border = border(
                 left=old_border.left,
                 right=medium_side,
                 top=old_border.top,
@@ -2792,7 +1102,7 @@ class GradeClassProcessor:
         for col_idx in range(min_col, max_col + 1):
             cell = ws.cell(row=min_row, column=col_idx)
             old_border = cell.border
-            cell.border = Border(
+            cell.border = border(
                 left=old_border.left,
                 right=old_border.right,
                 top=medium_side,
@@ -2803,7 +1113,7 @@ class GradeClassProcessor:
         for col_idx in range(min_col, max_col + 1):
             cell = ws.cell(row=max_row, column=col_idx)
             old_border = cell.border
-            cell.border = Border(
+            cell.border = border(
                 left=old_border.left,
                 right=old_border.right,
                 top=old_border.top,
@@ -2817,8 +1127,8 @@ class GradeClassProcessor:
         # 使用之前动态计算的max_col值
 
         # 定义居中加粗的样式
-        center_bold_font = Font(bold=True, name="Calibri")
-        center_alignment = Alignment(horizontal="center", vertical="center")
+        center_bold_font = BOLD_CALIBRI
+        center_alignment = CENTER
 
         # 遍历所有数据区域（第3行开始）
         for row_idx in range(min_row, max_row + 1):
@@ -2829,7 +1139,7 @@ class GradeClassProcessor:
                 cell = ws.cell(row=row_idx, column=col_idx)
                 # 设置字体加粗和Calibri字体
                 if cell.font:
-                    cell.font = Font(bold=True, sz=cell.font.sz, name="Calibri")
+                    cell.font = font(bold=True, sz=cell.font.sz, name="Calibri")
                 else:
                     cell.font = center_bold_font
                 # 设置居中
@@ -2868,7 +1178,7 @@ class GradeClassProcessor:
         # 合并J2:K2来显示"本次体测日期："
         ws.merge_cells("J2:K2")
         ws["J2"] = "本次体测日期："
-        ws["J2"].font = Font(size=11, name="Calibri")
+        ws["J2"].font = font(size=11, name="Calibri")
         # 根据年级设置测试日期
         ws["L2"] = "2025/09/23-2025/09/24"
 
@@ -2958,19 +1268,16 @@ class GradeClassProcessor:
         col_idx = 12  # L列
         if grade in ["三年级", "四年级", "五年级", "六年级"]:
             cell = ws.cell(row=8, column=col_idx, value="一分钟仰卧起坐")
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         if grade in ["五年级", "六年级"]:
             cell = ws.cell(row=8, column=col_idx, value="50米×8往返跑")
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
 
         # 最后一列为综合等级
         cell = ws.cell(row=8, column=col_idx, value="综合等级")
-        cell.font = Font(bold=True, name="Calibri")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        apply_style(cell, "bold_calibri_center")
 
         # 第9行不再合并A-D（因为A8:D13已经是一个大方块了）
         ws["E9"] = "一级（优秀）"
@@ -2987,20 +1294,17 @@ class GradeClassProcessor:
             cell = ws.cell(
                 row=9, column=col_idx, value=stats.get("仰卧起坐_excellent", 0)
             )
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         if grade in ["五年级", "六年级"]:
             cell = ws.cell(
                 row=9, column=col_idx, value=stats.get("往返跑_excellent", 0)
             )
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         # 最后一列为综合等级
         cell = ws.cell(row=9, column=col_idx, value=excellent_count)
-        cell.font = Font(bold=True, name="Calibri")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        apply_style(cell, "bold_calibri_center")
 
         # 第10行
         ws["E10"] = "二级（良好）"
@@ -3014,17 +1318,14 @@ class GradeClassProcessor:
         col_idx = 12  # L列
         if grade in ["三年级", "四年级", "五年级", "六年级"]:
             cell = ws.cell(row=10, column=col_idx, value=stats.get("仰卧起坐_good", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         if grade in ["五年级", "六年级"]:
             cell = ws.cell(row=10, column=col_idx, value=stats.get("往返跑_good", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         cell = ws.cell(row=10, column=col_idx, value=good_count)
-        cell.font = Font(bold=True, name="Calibri")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        apply_style(cell, "bold_calibri_center")
 
         # 第11行
         ws["E11"] = "三级（及格）"
@@ -3038,17 +1339,14 @@ class GradeClassProcessor:
         col_idx = 12  # L列
         if grade in ["三年级", "四年级", "五年级", "六年级"]:
             cell = ws.cell(row=11, column=col_idx, value=stats.get("仰卧起坐_pass", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         if grade in ["五年级", "六年级"]:
             cell = ws.cell(row=11, column=col_idx, value=stats.get("往返跑_pass", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         cell = ws.cell(row=11, column=col_idx, value=pass_count)
-        cell.font = Font(bold=True, name="Calibri")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        apply_style(cell, "bold_calibri_center")
 
         # 第12行
         ws["E12"] = "四级（不及格）"
@@ -3062,17 +1360,14 @@ class GradeClassProcessor:
         col_idx = 12  # L列
         if grade in ["三年级", "四年级", "五年级", "六年级"]:
             cell = ws.cell(row=12, column=col_idx, value=stats.get("仰卧起坐_fail", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         if grade in ["五年级", "六年级"]:
             cell = ws.cell(row=12, column=col_idx, value=stats.get("往返跑_fail", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         cell = ws.cell(row=12, column=col_idx, value=fail_count)
-        cell.font = Font(bold=True, name="Calibri")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        apply_style(cell, "bold_calibri_center")
 
         # 第13行，合并E13和F13
         ws.merge_cells("E13:F13")
@@ -3087,71 +1382,117 @@ class GradeClassProcessor:
         col_idx = 12  # L列
         if grade in ["三年级", "四年级", "五年级", "六年级"]:
             cell = ws.cell(row=13, column=col_idx, value=stats.get("tested_total", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         if grade in ["五年级", "六年级"]:
             cell = ws.cell(row=13, column=col_idx, value=stats.get("tested_total", 0))
-            cell.font = Font(bold=True, name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            apply_style(cell, "bold_calibri_center")
             col_idx += 1
         # 最后一列为总人数
         cell = ws.cell(row=13, column=col_idx, value=total_count)
-        cell.font = Font(bold=True, name="Calibri")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    def process_grade_classes(self, grade_data, grade):
-        """处理年级下的各个班级数据"""
-        # 按班级分组
-        class_groups = grade_data.groupby("班级名称")
-
-        print(f"{grade}共有 {len(class_groups)} 个班级")
+        apply_style(cell, "bold_calibri_center")
 
-        for class_name, class_data in class_groups:
-            try:
-                # 提取班级号（例如：从"六年级10班"提取"10"）
-                import re
-
-                match = re.search(r"([一二三四五六]年级)?(\d+)班", class_name)
-                if match:
-                    class_num = match.group(2)
-                    # 创建简化的班级名称（例如：六10班）
-                    grade_map = {
-                        "一年级": "一",
-                        "二年级": "二",
-                        "三年级": "三",
-                        "四年级": "四",
-                        "五年级": "五",
-                        "六年级": "六",
-                    }
-                    grade_short = grade_map.get(grade, grade)
-                    simple_class_name = f"{grade_short}{class_num}班"
-                else:
-                    # 如果无法匹配，使用完整班级名称
-                    class_num = class_name.replace("班", "")
-                    simple_class_name = class_name
-
-                print(f"处理{class_name}，共{len(class_data)}名学生")
+    def save_class_summary(self, class_name, class_data, grade):
+        """创建并保存一个班级的汇总表，出错时返回错误信息"""
+        try:
+            # 提取班级号（例如：从"六年级10班"提取 10）
+            class_num = class_number(class_name)
+            if class_num is not None:
+                # 创建简化的班级名称（例如：六10班）
+                simple_class_name = short_class_name(grade, class_num)
+            else:
+                # 如果无法匹配，使用完整班级名称
+                class_num = class_name.replace("班", "")
+                simple_class_name = class_name
+
+            print(f"处理{class_name}，共{len(class_data)}名学生")
+
+            # 创建班级汇总表
+            stats = self.calculate_statistics(class_data)
+            wb = self.create_class_summary(class_data, grade, class_num, stats)
+
+            # 保存班级汇总表（使用简化的班级名称）
+            class_filename = f"{simple_class_name}_班级统计汇总表.xlsx"
+            class_filepath = os.path.join(self.output_dir, grade, class_filename)
+
+            save_workbook(wb, class_filepath)
+            save_stats(
+                class_filepath,
+                stats,
+                grade=grade,
+                class_name=simple_class_name,
+            )
+            # print(f"✅ 保存班级汇总表: {class_filepath}")
 
-                # 创建班级汇总表
-                wb = self.create_class_summary(class_data, grade, class_num)
+        except Exception as e:
+            return f"处理{class_name}时出错: {e}"
 
-                # 保存班级汇总表（使用简化的班级名称）
-                class_filename = f"{simple_class_name}_班级统计汇总表.xlsx"
-                class_filepath = os.path.join(self.output_dir, grade, class_filename)
+    def save_grade_summary(self, grade_data, grade, grade_stats=None):
+        """创建并保存年级汇总表"""
+        # 创建年级汇总表，必须用 wb 接收返回的 workbook
+        print(f"创建{grade}年级汇总表...")
+        if grade_stats is None:
+            grade_stats = self.calculate_statistics(grade_data)
+        wb = self.create_grade_summary(grade_data, grade, grade_stats)
 
-                wb.save(class_filepath)
-                # print(f"✅ 保存班级汇总表: {class_filepath}")
+        # 保存到 对应年级 子文件夹中
+        grade_filename = f"{grade}统计汇总表.xlsx"
+        grade_filepath = os.path.join(self.output_dir, grade, grade_filename)
 
-            except Exception as e:
-                print(f"❌ 处理{class_name}时出错: {e}")
-                continue
+        try:
+            save_workbook(wb, grade_filepath)
+            save_stats(grade_filepath, grade_stats, grade=grade)
+            print(f"✅ 保存年级汇总表: {grade_filepath}")
+        except PermissionError:
+            alt_filename = (
+                f"{grade}_年级统计汇总表_{datetime.now().strftime('%Y%m%d')}_new.xlsx"
+            )
+            alt_filepath = os.path.join(self.output_dir, grade, alt_filename)
+            save_workbook(wb, alt_filepath)
+            save_stats(alt_filepath, grade_stats, grade=grade)
+            print(f"✅ 保存年级汇总表 (备用名): {alt_filepath}")
+
+    def save_summary(self, grade, class_name, data):
+        """保存年级汇总表（class_name 为 None 时）或班级汇总表，出错时返回错误信息"""
+        if class_name is not None:
+            return self.save_class_summary(class_name, data, grade)
+        try:
+            self.save_grade_summary(data, grade)
+        except Exception as e:
+            return f"处理{grade}年级汇总表时出错: {e}"
+        return None
 
-    def process_all_grades(self):
+    def save_summaries(self, summaries):
+        """依次返回各汇总表的 save_summary 结果
+
+        summaries 为 [(年级, 班级名称或 None, 学生数据), ...]；
+        workers 大于 1 时在进程池中同时生成，结果仍按原顺序返回
+        """
+        workers = min(self.workers, len(summaries))
+        if workers <= 1:
+            return [self.save_summary(*summary) for summary in summaries]
+
+        print(f"使用 {workers} 个进程生成汇总表")
+        # 子进程使用与当前进程相同的写入引擎
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self, resolve_write_engine()),
+        ) as executor:
+            return list(executor.map(_save_summary, summaries))
+
+    def process_all_grades(self, scored_data=None):
+        """生成各年级和班级汇总表
+
+        scored_data 为 whole_school.py 已评分的学生数据时直接使用，不再读取和评分输入文件
+        """
         print("=== 开始处理年级和班级数据 ===")
 
         # 加载学生数据
-        student_data = self.load_student_data()
+        if scored_data is not None:
+            student_data = self.prepare_student_data(scored_data, scored=True)
+        else:
+            student_data = self.load_student_data()
         if student_data.empty:
             print("没有找到学生数据，退出处理")
             return
@@ -3159,6 +1500,9 @@ class GradeClassProcessor:
         # 创建年级文件夹
         grades = self.create_directories(student_data)
 
+        # 各汇总表 [(年级, 班级名称或 None, 学生数据), ...]，年级汇总表在前
+        summaries = []
+
         # 按年级分组处理
         for grade in grades:
             print(f"\n=== 处理{grade}数据 ===")
@@ -3170,36 +1514,73 @@ class GradeClassProcessor:
 
             print(f"{grade}共有 {len(grade_data)} 名学生")
 
-            # 创建年级汇总表，并接收返回的 workbook
-            print(f"创建{grade}年级汇总表...")
-            wb = self.create_grade_summary(grade_data, grade)  # 必须用 wb 接收！
+            # 年级汇总表
+            summaries.append((grade, None, grade_data))
 
-            # 保存到 对应年级 子文件夹中
-            grade_filename = f"{grade}统计汇总表.xlsx"
-            grade_filepath = os.path.join(self.output_dir, grade, grade_filename)
+            # ✅ 各班级汇总表
+            class_groups = grade_data.groupby("班级名称")
+            print(f"{grade}共有 {len(class_groups)} 个班级")
+            for class_name, class_data in class_groups:
+                summaries.append((grade, class_name, class_data))
 
-            try:
-                wb.save(grade_filepath)
-                print(f"✅ 保存年级汇总表: {grade_filepath}")
-            except PermissionError:
-                alt_filename = f"{grade}_年级统计汇总表_{datetime.now().strftime('%Y%m%d')}_new.xlsx"
-                alt_filepath = os.path.join(self.output_dir, grade, alt_filename)
-                wb.save(alt_filepath)
-                print(f"✅ 保存年级汇总表 (备用名): {alt_filepath}")
-
-            # ✅ 创建各班级汇总表
-            print(f"创建{grade}各班级汇总表...")
-            self.process_grade_classes(grade_data, grade)
+        # 创建并保存各年级和班级汇总表
+        errors = [error for error in self.save_summaries(summaries) if error]
+        if errors:
+            print(f"\n以下 {len(errors)} 个汇总表生成时出错:")
+            for error in errors:
+                print(f"❌ {error}")
 
         print("\n=== 所有年级和班级汇总表已生成完毕 ===")
 
 
+# 子进程中的汇总表处理器（由 _init_worker 创建）
+_worker = None
+
+
+def _init_worker(processor, write_engine):
+    global _worker
+    set_write_engine(write_engine)
+    _worker = processor
+
+
+def _save_summary(summary):
+    return _worker.save_summary(*summary)
+
+
 def parse_arguments():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(description="处理体测成绩数据")
     parser.add_argument("--filter", "-f", type=str, help="年级班级过滤参数 (JSON格式)")
     parser.add_argument("--input-file", "-i", type=str, help="输入文件路径")
     parser.add_argument("--output-dir", "-o", type=str, help="输出目录路径")
+    parser.add_argument(
+        "--grades",
+        "-g",
+        type=str,
+        help="参与评分的年级，逗号分隔（默认：四年级,六年级）",
+    )
+    parser.add_argument(
+        "--read-engine",
+        choices=READ_ENGINES,
+        help="Excel读取引擎（默认 auto：安装 python-calamine 时使用 calamine）",
+    )
+    parser.add_argument(
+        "--write-engine",
+        choices=WRITE_ENGINES,
+        help="Excel写入引擎（默认 auto：安装 xlsxwriter 时使用 xlsxwriter）",
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="同时生成汇总表的进程数（默认 1）",
+    )
+    parser.add_argument(
+        "--verify-cache",
+        action="store_true",
+        help="校验评分缓存与重新评分输入文件的结果是否一致，不生成汇总表",
+    )
     return parser.parse_args()
 
 
@@ -3235,11 +1616,19 @@ def main():
 
     # 5. 指定输入文件和输出目录
     python form_and_class.py --input-file "data.xlsx" --output-dir "output" --filter '{"四年级": ["1班", "2班"]}'
+
+    # 6. 使用 4 个进程同时生成各汇总表
+    python form_and_class.py --workers 4
+
+    # 7. 校验 whole_school.py 保存的评分缓存与重新评分的结果一致
+    python form_and_class.py --verify-cache
     """
 
     try:
         # 解析命令行参数
         args = parse_arguments()
+        set_read_engine(args.read_engine)
+        set_write_engine(args.write_engine)
 
         # 解析过滤参数
         year_class_filter = None
@@ -3251,7 +1640,10 @@ def main():
                 sys.exit(1)
 
         # 创建处理器
-        processor = GradeClassProcessor(year_class_filter=year_class_filter)
+        target_grades = args.grades.split(",") if args.grades else None
+        processor = GradeClassProcessor(
+            year_class_filter=year_class_filter, target_grades=target_grades
+        )
 
         # 如果指定了输入文件，更新处理器
         if args.input_file:
@@ -3261,6 +1653,21 @@ def main():
         if args.output_dir:
             processor.output_dir = args.output_dir
 
+        processor.workers = args.workers
+
+        if args.verify_cache:
+            differing = processor.verify_scored_cache()
+            if differing is None:
+                output_response("error", "没有可用的评分缓存")
+                sys.exit(1)
+            if differing:
+                output_response(
+                    "error", "评分缓存与重新评分的结果不一致", {"columns": differing}
+                )
+                sys.exit(1)
+            output_response("success", "评分缓存与重新评分的结果一致")
+            return
+
         # 输出开始处理信息
         output_response(
             "success",
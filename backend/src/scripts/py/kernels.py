@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分计算内核
+提供查表评分、BMI分类、综合得分加权求和、跳绳加分四个批量计算内核，
+安装 numba 时自动使用 JIT 编译版本，否则使用 NumPy 实现。
+可通过环境变量 SCORING_BACKEND=numpy 或 SCORING_BACKEND=numba 强制指定
+"""
+
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba 为可选依赖
+    numba = None
+
+# 指定计算内核的环境变量：auto（默认）、numpy、numba
+BACKEND_ENV = "SCORING_BACKEND"
+
+# 已加载的计算内核
+_loaded = {}
+
+
+class Kernels:
+    """一组计算内核函数"""
+
+    def __init__(self, name, lookup_scores, classify_bmi, weighted_sum, rope_bonus):
+        self.name = name
+        self.lookup_scores = lookup_scores
+        self.classify_bmi = classify_bmi
+        self.weighted_sum = weighted_sum
+        self.rope_bonus = rope_bonus
+
+
+# ---------------------------------------------------------------- NumPy 实现
+
+
+def lookup_scores_numpy(values, thresholds, scores, reverse=False):
+    """在有序阈值表上批量查分，结果与逐条线性扫描评分表一致"""
+    values = np.asarray(values, dtype=float)
+    n = len(thresholds)
+    if reverse:
+        # 时间类项目：阈值递增，取第一个 value <= 阈值 的档位
+        pos = np.searchsorted(thresholds, values, side="left")
+        pos = np.minimum(pos, n - 1)
+    else:
+        # 其他项目：阈值递减，取第一个 value >= 阈值 的档位
+        ascending = thresholds[::-1]
+        pos = np.searchsorted(ascending, values, side="right") - 1
+        pos = n - 1 - np.maximum(pos, 0)
+    result = scores[pos]
+    result[np.isnan(values)] = np.nan
+    return result
+
+
+def classify_bmi_numpy(bmi, lower, upper, scores, default_score):
+    """按顺序取第一个包含BMI的闭区间，返回 (分数, 区间序号)；落在空隙中序号为 -1"""
+    inside = (bmi[:, None] >= lower) & (bmi[:, None] <= upper)
+    matched = inside.any(axis=1)
+    codes = np.where(matched, inside.argmax(axis=1), -1)
+    bmi_scores = np.where(matched, scores[codes], default_score)
+    bmi_scores[np.isnan(bmi)] = np.nan
+    return bmi_scores, codes
+
+
+def weighted_sum_numpy(scores, weights):
+    """逐行加权求和，空值按0分计"""
+    return (np.where(np.isnan(scores), 0.0, scores) * weights).sum(axis=1)
+
+
+def rope_bonus_numpy(extra, item_scores, needed, points):
+    """满分且超出数量达到加分表最低要求时按加分表计算加分，其余为0"""
+    bonus = np.zeros(len(extra))
+    bonus_mask = (item_scores == 100) & (extra >= needed[-1])
+    if bonus_mask.any():
+        bonus[bonus_mask] = lookup_scores_numpy(extra[bonus_mask], needed, points)
+    return bonus
+
+
+# ---------------------------------------------------------------- numba 实现
+# 未安装 numba 时以下函数不会被使用
+
+
+def _jit(func):
+    """安装 numba 时编译为机器码并缓存到 __pycache__"""
+    return numba.njit(cache=True)(func) if numba is not None else func
+
+
+@_jit
+def _lookup_one(value, thresholds, scores, reverse):
+    n = len(thresholds)
+    for i in range(n):
+        if reverse:
+            if value <= thresholds[i]:
+                return scores[i]
+        elif value >= thresholds[i]:
+            return scores[i]
+    return scores[n - 1]
+
+
+@_jit
+def _lookup_scores_loop(values, thresholds, scores, reverse):
+    result = np.empty(len(values))
+    for i in range(len(values)):
+        if np.isnan(values[i]):
+            result[i] = np.nan
+        else:
+            result[i] = _lookup_one(values[i], thresholds, scores, reverse)
+    return result
+
+
+@_jit
+def _classify_bmi_loop(bmi, lower, upper, scores, default_score):
+    bmi_scores = np.empty(len(bmi))
+    codes = np.full(len(bmi), -1, dtype=np.int64)
+    for i in range(len(bmi)):
+        if np.isnan(bmi[i]):
+            bmi_scores[i] = np.nan
+            continue
+        bmi_scores[i] = default_score
+        for j in range(len(lower)):
+            if lower[j] <= bmi[i] <= upper[j]:
+                bmi_scores[i] = scores[j]
+                codes[i] = j
+                break
+    return bmi_scores, codes
+
+
+@_jit
+def _weighted_sum_loop(scores, weights):
+    result = np.zeros(scores.shape[0])
+    for i in range(scores.shape[0]):
+        total = 0.0
+        for j in range(scores.shape[1]):
+            score = scores[i, j]
+            total += (0.0 if np.isnan(score) else score) * weights[i, j]
+        result[i] = total
+    return result
+
+
+@_jit
+def _rope_bonus_loop(extra, item_scores, needed, points):
+    bonus = np.zeros(len(extra))
+    for i in range(len(extra)):
+        if item_scores[i] == 100 and extra[i] >= needed[len(needed) - 1]:
+            bonus[i] = _lookup_one(extra[i], needed, points, False)
+    return bonus
+
+
+def lookup_scores_numba(values, thresholds, scores, reverse=False):
+    """numba 版本的批量查分"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return _lookup_scores_loop(values, thresholds, scores, bool(reverse))
+
+
+def classify_bmi_numba(bmi, lower, upper, scores, default_score):
+    """numba 版本的BMI分类"""
+    bmi = np.ascontiguousarray(bmi, dtype=np.float64)
+    return _classify_bmi_loop(bmi, lower, upper, scores, float(default_score))
+
+
+def weighted_sum_numba(scores, weights):
+    """numba 版本的逐行加权求和"""
+    return _weighted_sum_loop(
+        np.ascontiguousarray(scores, dtype=np.float64),
+        np.ascontiguousarray(weights, dtype=np.float64),
+    )
+
+
+def rope_bonus_numba(extra, item_scores, needed, points):
+    """numba 版本的跳绳加分"""
+    return _rope_bonus_loop(
+        np.ascontiguousarray(extra, dtype=np.float64),
+        np.ascontiguousarray(item_scores, dtype=np.float64),
+        needed,
+        points,
+    )
+
+
+NUMPY_KERNELS = Kernels(
+    "numpy",
+    lookup_scores_numpy,
+    classify_bmi_numpy,
+    weighted_sum_numpy,
+    rope_bonus_numpy,
+)
+
+NUMBA_KERNELS = Kernels(
+    "numba",
+    lookup_scores_numba,
+    classify_bmi_numba,
+    weighted_sum_numba,
+    rope_bonus_numba,
+)
+
+
+def load_kernels(backend=None):
+    """加载计算内核：backend 为 auto、numpy 或 numba，默认读取环境变量 SCORING_BACKEND"""
+    backend = (backend or os.environ.get(BACKEND_ENV) or "auto").lower()
+    if backend not in ("auto", "numpy", "numba"):
+        raise ValueError(f"未知的计算内核: {backend}（可选 auto、numpy、numba）")
+    if backend == "numpy":
+        return NUMPY_KERNELS
+
+    if numba is None:
+        if backend == "numba":
+            print("⚠️ 未安装 numba，使用 NumPy 计算内核")
+        return NUMPY_KERNELS
+
+    if "numba" not in _loaded:
+        try:
+            # 预先编译一次，编译失败时在加载阶段即可回退
+            sample = np.array([1.0, np.nan])
+            lookup_scores_numba(sample, sample[:1], sample[:1])
+            classify_bmi_numba(sample, sample[:1], sample[:1], sample[:1], 0.0)
+            weighted_sum_numba(sample[None, :], sample[None, :])
+            rope_bonus_numba(sample, sample, sample[:1], sample[:1])
+            _loaded["numba"] = NUMBA_KERNELS
+        except Exception as e:
+            print(f"⚠️ numba 计算内核不可用，使用 NumPy 计算内核: {e}")
+            _loaded["numba"] = NUMPY_KERNELS
+    return _loaded["numba"]
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+补测成绩增量处理
+读取补测文件，只对补测学生重新评分，按学生贡献的增量更新已保存的班级/年级统计，
+并只重新生成受影响的班级汇总表、年级汇总表、班级排名表和个人成绩单。
+首次运行（或原始成绩文件发生变化）时会先根据原始成绩文件建立状态
+
+状态同时保存全校总表的评分结果（whole_school.py 的规则，BMI 按身高体重重新计算）
+和由其得到的年级班级评分结果（form_and_class.py 的规则，BMI 以成绩文件原有的值为准），
+补测学生先按全校总表的规则评分，再按年级班级汇总的规则恢复BMI，与完整重新运行一致
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import pandas as pd
+
+from aggregates import apply_delta, group_counts, stats_from_counts
+from class_names import class_number, normalize_class_names, short_class_name
+from class_ranking import ClassRankingGenerator
+from excel_reader import READ_ENGINES, read_excel_rows, set_read_engine
+from excel_writer import WRITE_ENGINES, set_write_engine
+from form_and_class import GradeClassProcessor
+from scored_cache import differing_columns, load_scored_cache
+from scoring import ScoringEngine
+from transcript import PersonalTranscriptGenerator
+from whole_school import NationalStandardConverter
+
+# 状态格式版本，修改保存结构时递增
+STATE_VERSION = 3
+
+
+class MakeupProcessor:
+    """补测成绩增量处理器"""
+
+    # 补测文件中可更新的原始成绩列
+    MEASURE_COLUMNS = ["身高(cm)", "体重(kg)", "BMI"] + [
+        column for _, column, _ in ScoringEngine.TABLE_ITEMS
+    ]
+
+    # 学生身份信息列，补测时不覆盖
+    IDENTITY_COLUMNS = ["学号", "姓名", "性别", "班级名称", "年级"]
+
+    def __init__(
+        self, makeup_file, input_file=None, output_dir=None, target_grades=None
+    ):
+        self.makeup_file = makeup_file
+        self.processor = GradeClassProcessor(target_grades=target_grades)
+        self.converter = NationalStandardConverter(
+            target_grades=self.processor.target_grades
+        )
+        if input_file:
+            self.processor.input_file = input_file
+        if output_dir:
+            self.processor.output_dir = output_dir
+        self.custom_output_dir = bool(output_dir)
+        self.standards = self.processor.standards
+
+        # 状态文件：全校总表和年级班级汇总的评分结果、班级/年级统计
+        self.state_dir = os.path.join(self.processor.output_dir, ".state")
+        self.school_data_file = os.path.join(self.state_dir, "school_students.pkl")
+        self.data_file = os.path.join(self.state_dir, "scored_students.pkl")
+        self.stats_file = os.path.join(self.state_dir, "statistics.json")
+        self.school_file = os.path.join(
+            self.processor.output_dir, "全校学生体质健康测试成绩总表.xlsx"
+        )
+
+    def source_hash(self):
+        """计算原始成绩文件的内容哈希"""
+        digest = hashlib.sha256()
+        with open(self.processor.input_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load_state(self):
+        """读取已保存的状态，版本、原始文件、评分表或年级不一致时返回 None"""
+        files = [self.school_data_file, self.data_file, self.stats_file]
+        if not all(os.path.exists(path) for path in files):
+            return None
+        with open(self.stats_file, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != STATE_VERSION:
+            return None
+        if meta.get("source_hash") != self.source_hash():
+            print("原始成绩文件已变化，重新建立状态")
+            return None
+        if meta.get("standards_hash") != self.standards.source_hash:
+            print("评分表已变化，重新建立状态")
+            return None
+        if meta.get("target_grades") != self.processor.target_grades:
+            return None
+        return (
+            pd.read_pickle(self.school_data_file),
+            pd.read_pickle(self.data_file),
+            meta,
+        )
+
+    def load_school_data(self):
+        """全校总表的评分结果：优先使用 whole_school.py 保存的评分缓存，否则读取原始成绩文件评分"""
+        cached = load_scored_cache(
+            self.school_file,
+            self.processor.target_grades,
+            source_file=self.processor.input_file,
+            standards_hash=self.standards.source_hash,
+        )
+        if cached is not None:
+            return cached["scored"]
+        print(f"读取文件: {self.processor.input_file}")
+        df = self.converter.read_student_data(self.processor.input_file)
+        return self.converter.prepare_student_data(df)
+
+    def build_state(self):
+        """根据原始成绩文件评分并汇总班级/年级统计"""
+        print("=== 建立补测状态 ===")
+        school_data = self.load_school_data()
+        data = self.processor.prepare_student_data(school_data, scored=True)
+        if data.empty:
+            raise ValueError(f"没有可用的学生数据: {self.processor.input_file}")
+        meta = {
+            "version": STATE_VERSION,
+            "source_hash": self.source_hash(),
+            "standards_hash": self.standards.source_hash,
+            "target_grades": self.processor.target_grades,
+            "classes": group_counts(data, self.standards, "班级名称"),
+            "grades": group_counts(data, self.standards, "年级"),
+        }
+        self.save_state(school_data, data, meta)
+        return school_data, data, meta
+
+    def save_state(self, school_data, data, meta):
+        """保存状态（先写临时文件再替换，避免中断时损坏）"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        # 先删除统计文件，替换过程中断时状态整体失效
+        if os.path.exists(self.stats_file):
+            os.remove(self.stats_file)
+        for df, path in ((school_data, self.school_data_file), (data, self.data_file)):
+            df.to_pickle(f"{path}.tmp")
+            os.replace(f"{path}.tmp", path)
+        tmp_stats = f"{self.stats_file}.tmp"
+        with open(tmp_stats, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_stats, self.stats_file)
+
+    def load_makeup_data(self):
+        """读取补测文件"""
+        print(f"读取补测文件: {self.makeup_file}")
+        df = read_excel_rows(self.makeup_file)
+        df = df.rename(columns={"学籍号": "学号"})
+        df = df.dropna(subset=["姓名"])
+        if "班级名称" in df.columns:
+            class_info = normalize_class_names(df["班级名称"].astype(str))
+            df["年级"] = class_info["年级"].astype(object)
+            df["班号"] = class_info["班号"]
+        print(f"补测学生 {len(df)} 名")
+        return df
+
+    def merge_makeup(self, data, makeup):
+        """把补测成绩合并到全校总表的学生数据中，返回 {学生索引: 合并后的行}"""
+        # 优先按学号匹配，没有学号时按(班级名称, 姓名)匹配
+        by_id = {}
+        if "学号" in data.columns:
+            ids = data["学号"].astype(str).str.strip()
+            by_id = {v: i for i, v in zip(data.index, ids) if v != "nan"}
+        by_name = dict(zip(zip(data["班级名称"], data["姓名"]), data.index))
+        measures = [column for column in self.MEASURE_COLUMNS if column in makeup]
+        # 全校总表的评分结果中，成绩文件原有的BMI另存在 原始BMI 列
+        targets = {column: column for column in measures}
+        if "BMI" in targets and ScoringEngine.SOURCE_BMI_COLUMN in data.columns:
+            targets["BMI"] = ScoringEngine.SOURCE_BMI_COLUMN
+        next_index = data.index.max() + 1 if len(data) else 0
+
+        merged = {}
+        for _, row in makeup.iterrows():
+            student_id = str(row.get("学号", "")).strip()
+            index = by_id.get(student_id)
+            if index is None:
+                index = by_name.get((row.get("班级名称"), row["姓名"]))
+
+            if index is not None:
+                # 已有学生：只用补测中有成绩的项目覆盖原成绩
+                student = merged.get(index, data.loc[index]).copy()
+                for column in measures:
+                    if pd.notna(row[column]):
+                        student[targets[column]] = row[column]
+            elif row.get("年级") in self.processor.target_grades:
+                # 新增学生
+                student = row.rename(targets).reindex(data.columns)
+                index = next_index
+                next_index += 1
+            else:
+                print(f"⚠️ 未找到学生 {row['姓名']}（{row.get('班级名称')}），跳过")
+                continue
+            merged[index] = student
+
+        return merged
+
+    def source_rows(self, school_data):
+        """由全校总表的评分结果还原评分用到的原始成绩，BMI 为成绩文件原有的值"""
+        columns = [
+            column
+            for column in ScoringEngine.INPUT_COLUMNS
+            if column in school_data.columns and column != "BMI"
+        ]
+        rows = school_data[columns].copy()
+        if ScoringEngine.SOURCE_BMI_COLUMN in school_data.columns:
+            rows["BMI"] = school_data[ScoringEngine.SOURCE_BMI_COLUMN]
+        return rows
+
+    def rescore(self, merged, school_data):
+        """只对补测学生重新评分，返回 (全校总表的评分结果, 年级班级汇总的评分结果)"""
+        rows = pd.DataFrame(list(merged.values()), index=list(merged.keys()))
+        for column in self.MEASURE_COLUMNS + self.IDENTITY_COLUMNS:
+            if column in rows.columns:
+                rows[column] = rows[column].infer_objects()
+        school_rows = self.converter.prepare_student_data(self.source_rows(rows))
+        school_rows = school_rows[
+            [column for column in school_data.columns if column in school_rows.columns]
+        ]
+        # 与 form_and_class.py 沿用评分缓存时相同，按其规则恢复BMI
+        rows = self.processor.prepare_student_data(school_rows, scored=True)
+        return school_rows, rows
+
+    def verify_state(self, school_data, data):
+        """校验增量更新后的学生数据：由合并后的原始成绩完整重新评分，逐列比较
+
+        返回不一致的列名列表
+        """
+        print("=== 校验补测结果 ===")
+        raw = self.source_rows(school_data)
+        expected_school = self.converter.prepare_student_data(raw.copy())
+        expected = self.processor.prepare_student_data(raw)
+        return differing_columns(expected_school, school_data) + differing_columns(
+            expected, data
+        )
+
+    def update_statistics(self, meta, old_rows, new_rows):
+        """按补测学生的旧贡献和新贡献增量更新班级/年级统计"""
+        for key, by in (("classes", "班级名称"), ("grades", "年级")):
+            old_counts = group_counts(old_rows, self.standards, by)
+            new_counts = group_counts(new_rows, self.standards, by)
+            for group in set(old_counts) | set(new_counts):
+                apply_delta(
+                    meta[key].setdefault(group, {}),
+                    old_counts.get(group, {}),
+                    new_counts.get(group, {}),
+                )
+
+    def ranking_class_info(self, data, meta, grades):
+        """由已保存的统计生成排名表需要的班级总人数"""
+        info = {}
+        for grade in grades:
+            classes = data.loc[data["年级"] == grade, "班级名称"].unique()
+            for class_name in classes:
+                class_num = class_number(class_name)
+                formatted = short_class_name(
+                    grade, 999 if class_num is None else class_num
+                )
+                info.setdefault(grade, {})[formatted] = {
+                    "total_students": meta["classes"][class_name]["total_count"]
+                }
+        return info
+
+    def regenerate_outputs(self, school_data, data, meta, rows, old_rows):
+        """只重新生成受补测影响的输出文件"""
+        touched = pd.concat([old_rows, rows])
+        classes = sorted(set(touched["班级名称"].dropna()))
+        grades = [g for g in self.processor.target_grades if g in set(touched["年级"])]
+        self.processor.create_directories(rows)
+
+        # 班级汇总表
+        for class_name in classes:
+            class_data = data[data["班级名称"] == class_name]
+            grade = class_data["年级"].iloc[0]
+            error = self.processor.save_class_summary(class_name, class_data, grade)
+            if error:
+                print(f"❌ {error}")
+
+        # 年级汇总表：直接使用增量更新后的年级统计
+        for grade in grades:
+            grade_stats = stats_from_counts(meta["grades"][grade])
+            grade_data = data[data["年级"] == grade]
+            self.processor.save_grade_summary(grade_data, grade, grade_stats)
+
+        # 全校总表（个人成绩单的数据来源）
+        school_table = self.converter.generate_school_format_excel(
+            school_data, self.school_file
+        )
+        print(f"✅ 更新全校总表: {self.school_file}")
+
+        # 班级排名表：只替换受影响年级的工作表
+        ranking = ClassRankingGenerator()
+        ranking.input_file = self.processor.input_file
+        ranking.output_dir = self.processor.output_dir
+        ranking.class_summary_dir = self.processor.output_dir
+        ranking.output_file = os.path.join(
+            self.processor.output_dir, "班级排名统计表.xlsx"
+        )
+        ranking.update_ranking_sheets(
+            grades, self.ranking_class_info(data, meta, grades)
+        )
+
+        # 个人成绩单：只为补测学生重新生成
+        student_ids = set(rows["学号"].astype(str).str.strip()) - {"nan"}
+        if len(student_ids) < len(rows):
+            print("⚠️ 部分补测学生没有学号，未重新生成其个人成绩单")
+        transcript = PersonalTranscriptGenerator()
+        transcript.source_file = self.school_file
+        if self.custom_output_dir:
+            transcript.output_dir = os.path.join(self.processor.output_dir, "成绩表")
+        transcript.generate_all_transcripts(
+            student_ids=student_ids, school_table=school_table
+        )
+
+    def process(self, rebuild=False, verify=False):
+        """执行补测增量处理，verify 为 True 时返回校验得到的不一致列名列表"""
+        state = None if rebuild else self.load_state()
+        school_data, data, meta = state if state is not None else self.build_state()
+
+        makeup = self.load_makeup_data()
+        merged = self.merge_makeup(school_data, makeup)
+        if not merged:
+            print("没有需要更新的学生")
+            return self.verify_state(school_data, data) if verify else None
+
+        old_rows = data.loc[data.index.intersection(list(merged))]
+        school_rows, rows = self.rescore(merged, school_data)
+        print(f"重新评分 {len(rows)} 名学生（其中新增 {len(rows) - len(old_rows)} 名）")
+
+        # 写回学生数据，保持原有顺序
+        school_data = replace_rows(school_data, school_rows)
+        data = replace_rows(data, rows)
+
+        self.update_statistics(meta, old_rows, rows)
+        self.regenerate_outputs(school_data, data, meta, rows, old_rows)
+        self.save_state(school_data, data, meta)
+        print("=== 补测增量处理完成 ===")
+        return self.verify_state(school_data, data) if verify else None
+
+
+def replace_rows(data, rows):
+    """用重新评分的行替换原有的行，新增的行追加在最后，保持原有顺序"""
+    order = list(data.index) + [i for i in rows.index if i not in data.index]
+    kept = data.drop(index=data.index.intersection(rows.index))
+    return pd.concat([kept, rows]).loc[order]
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(
+        description="补测成绩增量处理 - 只更新补测学生涉及的汇总表、排名表和成绩单"
+    )
+    parser.add_argument(
+        "--makeup-file", "-m", type=str, required=True, help="补测成绩Excel文件路径"
+    )
+    parser.add_argument("--input-file", "-i", type=str, help="原始成绩文件路径")
+    parser.add_argument("--output-dir", "-o", type=str, help="输出目录路径")
+    parser.add_argument(
+        "--grades",
+        "-g",
+        type=str,
+        help="参与评分的年级，逗号分隔（默认：四年级,六年级）",
+    )
+    parser.add_argument(
+        "--rebuild-state", action="store_true", help="忽略已保存的状态，重新建立"
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="处理完成后由合并后的原始成绩完整重新评分，校验增量结果是否一致",
+    )
+    parser.add_argument(
+        "--read-engine",
+        choices=READ_ENGINES,
+        help="Excel读取引擎（默认 auto：安装 python-calamine 时使用 calamine）",
+    )
+    parser.add_argument(
+        "--write-engine",
+        choices=WRITE_ENGINES,
+        help="Excel写入引擎（默认 auto：安装 xlsxwriter 时使用 xlsxwriter）",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    主函数
+
+    命令行使用示例:
+    python makeup.py --makeup-file "补测成绩.xlsx"
+    python makeup.py -m "补测成绩.xlsx" -i "成绩_含学号.xlsx" -o "output"
+    python makeup.py -m "补测成绩.xlsx" --verify
+    """
+    try:
+        args = parse_arguments()
+        set_read_engine(args.read_engine)
+        set_write_engine(args.write_engine)
+
+        if not os.path.exists(args.makeup_file):
+            print(f"✗ 错误: 补测文件不存在: {args.makeup_file}")
+            sys.exit(1)
+
+        processor = MakeupProcessor(
+            args.makeup_file,
+            input_file=args.input_file,
+            output_dir=args.output_dir,
+            target_grades=args.grades.split(",") if args.grades else None,
+        )
+        differing = processor.process(rebuild=args.rebuild_state, verify=args.verify)
+        if differing:
+            print(f"✗ 增量结果与完整重新评分不一致: {'、'.join(differing)}")
+            sys.exit(1)
+        if args.verify:
+            print("✓ 增量结果与完整重新评分一致")
+
+    except FileNotFoundError as e:
+        print(f"✗ 文件未找到: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"✗ 补测处理失败, 错误: {str(e)}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
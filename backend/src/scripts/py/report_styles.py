@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+报表样式
+全校总表、班级/年级汇总表、排名表和个人成绩单共用的字体、对齐、边框和填充。
+
+font、alignment、side、border、fill 按参数返回同一个样式对象，每种样式在进程内只创建一次，
+各工作簿共享。常用的样式组合以名称登记（如 "grid" 为细边框加居中），
+apply_style 把命名样式中的各项依次赋给单元格，效果与逐项给 cell.font、cell.border 等赋值相同；
+openpyxl 每次赋值都要在工作簿的样式表中查找该样式，apply_style 按
+（单元格原有样式, 样式名）记住赋值结果，同一工作簿中相同的组合只查找一次
+
+命令行对比逐单元格新建样式与使用命名样式生成工作簿的耗时:
+python report_styles.py 17x7 135x18
+"""
+
+import argparse
+import time
+import tracemalloc
+import weakref
+from copy import copy
+from functools import lru_cache
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+
+@lru_cache(maxsize=None)
+def font(**kwargs):
+    """字体（相同参数返回同一对象）"""
+    return Font(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def alignment(**kwargs):
+    """对齐方式（相同参数返回同一对象）"""
+    return Alignment(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def side(**kwargs):
+    """边线（相同参数返回同一对象）"""
+    return Side(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def border(**kwargs):
+    """边框（相同参数返回同一对象）"""
+    return Border(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def fill(**kwargs):
+    """填充（相同参数返回同一对象）"""
+    return PatternFill(**kwargs)
+
+
+# 常用的样式部件
+THIN = side(style="thin")
+MEDIUM = side(style="medium")
+THIN_BLACK = side(border_style="thin", color="000000")
+MEDIUM_BLACK = side(border_style="medium", color="000000")
+
+THIN_BORDER = border(left=THIN, right=THIN, top=THIN, bottom=THIN)
+THIN_BLACK_BORDER = border(
+    left=THIN_BLACK, right=THIN_BLACK, top=THIN_BLACK, bottom=THIN_BLACK
+)
+
+CENTER = alignment(horizontal="center", vertical="center")
+CENTER_WRAP = alignment(horizontal="center", vertical="center", wrap_text=True)
+HORIZONTAL_CENTER = alignment(horizontal="center")
+
+BOLD = font(bold=True)
+BOLD_CALIBRI = font(bold=True, name="Calibri")
+
+# 雾蓝色背景（排名表）
+LIGHT_BLUE_FILL = fill(start_color="D9E8F5", end_color="D9E8F5", fill_type="solid")
+
+# 命名样式 {样式名: {单元格属性: 样式对象}}
+STYLES = {}
+
+
+def register_style(name, **attributes):
+    """登记命名样式，attributes 为 font、fill、border、alignment、number_format 中的若干项"""
+    STYLES[name] = attributes
+    return attributes
+
+
+register_style("center", alignment=CENTER)
+register_style("bold_center", font=BOLD, alignment=CENTER)
+register_style("bold_calibri_center", font=BOLD_CALIBRI, alignment=CENTER)
+register_style("thin_border", border=THIN_BORDER)
+register_style("light_blue", fill=LIGHT_BLUE_FILL)
+# 细边框 + 居中（个人成绩单、班级汇总表）
+register_style("grid", border=THIN_BORDER, alignment=CENTER)
+register_style("black_grid", border=THIN_BLACK_BORDER, alignment=CENTER)
+# 排名表
+register_style(
+    "ranking_header", border=THIN_BORDER, font=BOLD, alignment=HORIZONTAL_CENTER
+)
+register_style("ranking_cell", border=THIN_BORDER, alignment=HORIZONTAL_CENTER)
+
+# 各工作簿的赋值结果 {工作簿: {(原有样式, 样式名): 赋值后的样式}}
+_applied = weakref.WeakKeyDictionary()
+
+
+def apply_style(cell, name):
+    """给单元格应用命名样式（只修改样式中包含的各项，其余保持不变）"""
+    workbook = cell.parent.parent
+    applied = _applied.get(workbook)
+    if applied is None:
+        applied = _applied[workbook] = {}
+
+    # 未设置过样式的单元格 _style 为 None
+    key = (tuple(cell._style or ()), name)
+    style_array = applied.get(key)
+    if style_array is None:
+        for attribute, value in STYLES[name].items():
+            setattr(cell, attribute, value)
+        applied[key] = copy(cell._style)
+    else:
+        cell._style = copy(style_array)
+
+
+def _build_per_cell(rows, cols):
+    """原来的写法：每个单元格新建样式对象"""
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, rows + 1):
+        for col in range(1, cols + 1):
+            cell = ws.cell(row=row, column=col, value=row * col)
+            cell.border = Border(
+                left=Side(style="thin"),
+                right=Side(style="thin"),
+                top=Side(style="thin"),
+                bottom=Side(style="thin"),
+            )
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            if row == 1:
+                cell.font = Font(bold=True)
+    return wb
+
+
+def _build_registry(rows, cols):
+    """使用命名样式"""
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, rows + 1):
+        for col in range(1, cols + 1):
+            cell = ws.cell(row=row, column=col, value=row * col)
+            apply_style(cell, "grid")
+            if row == 1:
+                cell.font = BOLD
+    return wb
+
+
+def benchmark(layouts, repeat=20):
+    """对比每个单元格新建样式和使用命名样式生成工作簿的耗时和内存峰值"""
+    builders = [("逐单元格新建", _build_per_cell), ("命名样式", _build_registry)]
+    for rows, cols in layouts:
+        print(f"\n=== {rows}行 × {cols}列 ===")
+        for label, build in builders:
+            build(rows, cols)  # 预热（命名样式首次使用时创建）
+            best = None
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                build(rows, cols)
+                elapsed = time.perf_counter() - start_time
+                best = elapsed if best is None else min(best, elapsed)
+
+            tracemalloc.start()
+            wb = build(rows, cols)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del wb
+            print(
+                f"{label}: 最短用时 {best * 1000:.2f}毫秒，内存峰值 {peak / 1024:.0f}KB"
+            )
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="对比样式写法的工作簿生成耗时")
+    parser.add_argument(
+        "layouts",
+        nargs="*",
+        default=["17x7", "135x18"],
+        help="表格大小，如 17x7（个人成绩单）、135x18（45人班级汇总表）",
+    )
+    parser.add_argument("--repeat", "-r", type=int, default=20, help="每种写法生成次数")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    layouts = [tuple(int(n) for n in layout.split("x")) for layout in args.layouts]
+    benchmark(layouts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+学生信息花名册缓存
+学生信息文件（25.8.19学生信息.xls）每学期只更新一两次，而匹配脚本每周运行多次。
+首次读取后把匹配用到的列（姓名、年级、班级、教育ID）和按姓名建立的行号索引保存为二进制文件，
+之后直接打开缓存，不再经过 xlrd 解析。
+
+缓存保存在学生信息文件所在目录的 .cache 中，以文件大小、修改时间和内容哈希为键：
+大小和修改时间都未变化时直接使用；有变化时比较内容哈希，内容也变化时重新转换
+"""
+
+import os
+import pickle
+
+import pandas as pd
+
+from scored_cache import CACHE_DIR_NAME, file_hash
+
+# 缓存格式版本，修改保存结构时递增
+ROSTER_CACHE_VERSION = 1
+
+
+def cache_file(roster_file):
+    """学生信息文件对应的缓存文件"""
+    directory = os.path.join(os.path.dirname(roster_file) or ".", CACHE_DIR_NAME)
+    return os.path.join(directory, f"{os.path.basename(roster_file)}.roster.pkl")
+
+
+def build_name_index(names):
+    """按姓名建立行号索引 {姓名: 行号数组}，行号按原顺序排列，空姓名不建索引"""
+    names = pd.Series(names).reset_index(drop=True)
+    return names.groupby(names, sort=False).indices
+
+
+def _file_stat(roster_file):
+    stat = os.stat(roster_file)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def save_roster_cache(roster_file, table, name_index, source_hash=None):
+    """保存花名册缓存（先写临时文件再替换），写入失败时只给出警告"""
+    path = cache_file(roster_file)
+    cache = {
+        "version": ROSTER_CACHE_VERSION,
+        **_file_stat(roster_file),
+        "hash": source_hash or file_hash(roster_file),
+        "table": table,
+        "name_index": name_index,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, path)
+        print(f"✓ 保存学生信息缓存: {path}")
+    except OSError as e:
+        print(f"⚠️ 学生信息缓存写入失败: {e}")
+
+
+def load_roster_cache(roster_file):
+    """读取花名册缓存，返回 (数据表, 姓名索引)，缓存不存在或学生信息文件已更新时返回 None"""
+    path = cache_file(roster_file)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            cache = pickle.load(f)
+    except Exception as e:
+        print(f"⚠️ 学生信息缓存读取失败，重新读取学生信息文件: {e}")
+        return None
+    if cache.get("version") != ROSTER_CACHE_VERSION:
+        return None
+
+    stat = _file_stat(roster_file)
+    if stat["size"] != cache["size"] or stat["mtime_ns"] != cache["mtime_ns"]:
+        # 大小或修改时间变化：内容未变（如重新复制）时更新记录的文件信息后继续使用
+        source_hash = file_hash(roster_file)
+        if source_hash != cache["hash"]:
+            print("学生信息文件已更新，重新转换")
+            return None
+        save_roster_cache(roster_file, cache["table"], cache["name_index"], source_hash)
+
+    return cache["table"], cache["name_index"]
@@ -3,14 +3,21 @@
 """
 体测成绩处理主程序
 按顺序运行所有脚本：whole_school.py -> form_and_class.py -> class_ranking.py -> transcript.py
+
+使用 --pipeline 时在同一进程中依次调用各步骤，成绩文件只读取和评分一次，
+评分后的数据直接在内存中传给后续步骤，Excel 只作为最终输出写出
 """
 
 import os
 import sys
 import time
+import argparse
 import importlib.util
 from datetime import datetime
 
+from excel_reader import READ_ENGINE_ENV, READ_ENGINES, print_timing_summary
+from excel_writer import WRITE_ENGINE_ENV, WRITE_ENGINES
+
 
 def load_module_from_file(file_path, module_name):
     """从文件路径加载模块"""
@@ -60,8 +67,128 @@ def run_script(script_name, script_path, description):
         return False
 
 
+def run_pipeline(scripts, target_grades=None):
+    """流水线模式：各步骤之间直接传递内存中的数据，返回成功运行的步骤数"""
+    modules = {}
+    for script in scripts:
+        module = load_module_from_file(
+            script["name"], script["name"].replace(".py", "")
+        )
+        if module is None:
+            return 0
+        modules[script["name"]] = module
+
+    # 各步骤的输出，作为后续步骤的输入
+    data = {}
+
+    def match_student_ids():
+        matcher = modules["add_student_id.py"].StudentIDMatcher()
+        data["scores"] = matcher.process()
+        data["scores_file"] = matcher.output_file
+        if data["scores"] is None:
+            raise RuntimeError("学生信息匹配失败，没有可处理的成绩数据")
+
+    def convert_whole_school():
+        module = modules["whole_school.py"]
+        converter = module.NationalStandardConverter(target_grades=target_grades)
+        output_file = "25年9月体测成绩得分等级汇总/全校学生体质健康测试成绩总表.xlsx"
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+        print("=== 开始转换成绩数据（基于国家标准）===")
+        print(f"只处理{'、'.join(converter.target_grades)}的数据")
+        data["scored"], data["school_table"] = (
+            converter.convert_dataframe_to_school_format(
+                data["scores"], output_file, source_file=data["scores_file"]
+            )
+        )
+        print(f"转换完成，输出文件: {output_file}")
+
+    def process_grades_and_classes():
+        module = modules["form_and_class.py"]
+        processor = module.GradeClassProcessor(target_grades=target_grades)
+        processor.process_all_grades(scored_data=data["scored"])
+
+    def generate_ranking():
+        generator = modules["class_ranking.py"].ClassRankingGenerator()
+        generator.generate_ranking_report(student_data=data["scored"])
+
+    def generate_transcripts():
+        generator = modules["transcript.py"].PersonalTranscriptGenerator()
+        generator.generate_all_transcripts(school_table=data["school_table"])
+
+    steps = [
+        match_student_ids,
+        convert_whole_school,
+        process_grades_and_classes,
+        generate_ranking,
+        generate_transcripts,
+    ]
+
+    success_count = 0
+    for i, (script, step) in enumerate(zip(scripts, steps), 1):
+        print(f"\n进度: {i}/{len(scripts)}")
+        print(f"\n{'='*60}")
+        print(f"开始运行 {script['name']}（流水线模式）")
+        print(f"功能：{script['description']}")
+        print(f"{'='*60}")
+
+        start_time = time.time()
+        try:
+            step()
+        except Exception as e:
+            elapsed_time = time.time() - start_time
+            print(f"\n❌ {script['name']} 运行失败 (耗时: {elapsed_time:.2f}秒)")
+            print(f"错误信息: {e}")
+            import traceback
+
+            traceback.print_exc()
+            # 后续步骤依赖本步骤的数据，无法继续
+            print("\n⚠️  流水线模式下后续步骤依赖本步骤的数据，停止执行")
+            break
+
+        elapsed_time = time.time() - start_time
+        print(f"\n✅ {script['name']} 运行完成 (耗时: {elapsed_time:.2f}秒)")
+        success_count += 1
+
+    return success_count
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="体测成绩处理主程序")
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="流水线模式：成绩文件只读取和评分一次，各步骤之间直接传递内存中的数据",
+    )
+    parser.add_argument(
+        "--grades",
+        "-g",
+        type=str,
+        help="参与评分的年级，逗号分隔（默认：四年级,六年级，仅流水线模式）",
+    )
+    parser.add_argument(
+        "--read-engine",
+        choices=READ_ENGINES,
+        help="Excel读取引擎（默认 auto：安装 python-calamine 时使用 calamine）",
+    )
+    parser.add_argument(
+        "--write-engine",
+        choices=WRITE_ENGINES,
+        help="Excel写入引擎（默认 auto：安装 xlsxwriter 时使用 xlsxwriter）",
+    )
+    return parser.parse_args()
+
+
 def main():
     """主函数"""
+    args = parse_arguments()
+    if args.read_engine:
+        # 通过环境变量传给各脚本
+        os.environ[READ_ENGINE_ENV] = args.read_engine
+    if args.write_engine:
+        os.environ[WRITE_ENGINE_ENV] = args.write_engine
+
     print("体测成绩处理系统")
     print("=" * 60)
     print(f"开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -110,17 +237,21 @@ def main():
     success_count = 0
     total_start_time = time.time()
 
-    for i, script in enumerate(scripts, 1):
-        print(f"\n进度: {i}/{len(scripts)}")
+    if args.pipeline:
+        target_grades = args.grades.split(",") if args.grades else None
+        success_count = run_pipeline(scripts, target_grades)
+    else:
+        for i, script in enumerate(scripts, 1):
+            print(f"\n进度: {i}/{len(scripts)}")
 
-        success = run_script(script["name"], script["name"], script["description"])
+            success = run_script(script["name"], script["name"], script["description"])
 
-        if success:
-            success_count += 1
-        else:
-            print(f"\n⚠️  脚本 {script['name']} 运行失败，但继续执行后续脚本...")
-            # 可以选择在这里停止执行：
-            # break
+            if success:
+                success_count += 1
+            else:
+                print(f"\n⚠️  脚本 {script['name']} 运行失败，但继续执行后续脚本...")
+                # 可以选择在这里停止执行：
+                # break
 
     # 总结
     total_elapsed_time = time.time() - total_start_time
@@ -128,6 +259,7 @@ def main():
     print("运行总结")
     print(f"{'='*60}")
     print(f"总耗时: {total_elapsed_time:.2f}秒")
+    print_timing_summary()
     print(f"成功运行: {success_count}/{len(scripts)} 个脚本")
     print(f"结束时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
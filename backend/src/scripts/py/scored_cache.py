@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分结果缓存
+whole_school.py 生成全校总表时，把评分后的学生数据（原始成绩、各项得分和等级、标准分、附加分、
+综合得分）和总表学生数据以二进制格式保存在总表旁的 .cache 目录中。
+form_and_class.py、class_ranking.py、transcript.py 优先读取缓存，不再重新解析 Excel。
+
+缓存记录格式版本、原始成绩文件和总表文件的内容哈希以及评分表（standards.py）的源文件哈希，
+任一文件或评分表变化、版本不一致时视为失效。
+安装 pyarrow 时使用 Parquet 列式格式，否则（或数据含混合类型列时）使用 pickle
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:  # pyarrow 为可选依赖
+    pyarrow = None
+
+# 缓存格式版本，修改保存结构或评分结果列时递增
+SCHEMA_VERSION = 2
+
+# 缓存目录名（位于全校总表所在目录）
+CACHE_DIR_NAME = ".cache"
+
+# 缓存的数据表：评分后的学生数据、总表学生数据
+TABLES = ["scored", "school_table"]
+
+
+def file_hash(path):
+    """计算文件的内容哈希"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_dir(school_file):
+    """全校总表对应的缓存目录"""
+    return os.path.join(os.path.dirname(school_file) or ".", CACHE_DIR_NAME)
+
+
+def _write_table(df, path):
+    """写入单个数据表，返回使用的格式"""
+    if pyarrow is not None:
+        try:
+            df.to_parquet(f"{path}.parquet", engine="pyarrow")
+            return "parquet"
+        except (pyarrow.ArrowException, TypeError, ValueError):
+            # 混合类型的原始成绩列无法写成 Parquet
+            if os.path.exists(f"{path}.parquet"):
+                os.remove(f"{path}.parquet")
+    df.to_pickle(f"{path}.pkl")
+    return "pickle"
+
+
+def _read_table(path, fmt):
+    """读取单个数据表"""
+    if fmt == "parquet":
+        return pd.read_parquet(f"{path}.parquet", engine="pyarrow")
+    return pd.read_pickle(f"{path}.pkl")
+
+
+def save_scored_cache(
+    school_file, source_file, target_grades, scored, school_table, standards_hash=None
+):
+    """保存评分结果缓存，写入失败时只给出警告，不影响总表的生成
+
+    standards_hash 为评分所用评分表的源文件哈希（Standards.source_hash）
+    """
+    directory = cache_dir(school_file)
+    meta_file = os.path.join(directory, "meta.json")
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        # 先删除旧的元数据，写入过程中断时缓存整体失效
+        if os.path.exists(meta_file):
+            os.remove(meta_file)
+
+        formats = {}
+        for name, df in zip(TABLES, [scored, school_table]):
+            formats[name] = _write_table(df, os.path.join(directory, name))
+
+        meta = {
+            "version": SCHEMA_VERSION,
+            "source_hash": file_hash(source_file) if source_file else None,
+            "school_hash": file_hash(school_file),
+            "standards_hash": standards_hash,
+            "target_grades": list(target_grades),
+            "formats": formats,
+            "rows": len(scored),
+        }
+        tmp_file = f"{meta_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_file, meta_file)
+        print(f"✓ 保存评分缓存: {directory}")
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 评分缓存写入失败: {e}")
+
+
+def load_scored_cache(
+    school_file, target_grades, source_file=None, standards_hash=None
+):
+    """读取评分结果缓存，返回 {表名: DataFrame}，缓存不存在或已失效时返回 None
+
+    source_file 为调用方原本要读取的原始成绩文件，提供时校验其内容哈希；
+    未提供时校验全校总表的内容哈希（用于直接读取总表的个人成绩单）。
+    standards_hash 为调用方当前评分表的源文件哈希，提供时评分表变化的缓存视为失效
+    """
+    meta_file = os.path.join(cache_dir(school_file), "meta.json")
+    if not os.path.exists(meta_file):
+        return None
+
+    try:
+        with open(meta_file, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta.get("version") != SCHEMA_VERSION:
+            print("评分缓存版本不一致，重新读取Excel")
+            return None
+        if not set(target_grades) <= set(meta.get("target_grades", [])):
+            print("评分缓存不包含全部所需年级，重新读取Excel")
+            return None
+        if standards_hash is not None and meta.get("standards_hash") != standards_hash:
+            print("评分表已变化，评分缓存失效")
+            return None
+        if source_file is not None:
+            if not os.path.exists(source_file):
+                return None
+            if file_hash(source_file) != meta.get("source_hash"):
+                print(f"原始成绩文件已变化，评分缓存失效: {source_file}")
+                return None
+        elif not os.path.exists(school_file) or file_hash(school_file) != meta.get(
+            "school_hash"
+        ):
+            print(f"全校总表已变化，评分缓存失效: {school_file}")
+            return None
+
+        directory = cache_dir(school_file)
+        tables = {
+            name: _read_table(os.path.join(directory, name), meta["formats"][name])
+            for name in TABLES
+        }
+    except Exception as e:
+        print(f"⚠️ 评分缓存读取失败，重新读取Excel: {e}")
+        return None
+
+    print(f"✓ 使用评分缓存: {len(tables['scored'])} 名学生")
+    return tables
+
+
+def differing_columns(expected, actual):
+    """按行顺序逐列比较两份评分后的学生数据，返回不一致的列名（以 expected 的列为准）"""
+    if len(expected) != len(actual):
+        print(f"学生人数不一致: {len(expected)} / {len(actual)}")
+        return list(expected.columns)
+
+    differing = []
+    for column in expected.columns:
+        if column not in actual.columns:
+            differing.append(column)
+            continue
+        left = expected[column].reset_index(drop=True).astype(object)
+        right = actual[column].reset_index(drop=True).astype(object)
+        same = (left == right) | (left.isna() & right.isna())
+        if not same.all():
+            print(f"{column} 列有 {(~same).sum()} 名学生不一致")
+            differing.append(column)
+    return differing
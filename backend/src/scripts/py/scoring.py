@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量评分引擎
+按(年级, 性别)切片，对每个单项一次性完成查表评分，
+供 whole_school.py 的 NationalStandardConverter 和
+form_and_class.py 的 GradeClassProcessor 共用
+"""
+
+import numpy as np
+import pandas as pd
+
+from kernels import load_kernels
+from standards import BMI_LEVELS
+
+
+class ScoringEngine:
+    """基于有序阈值表的批量评分引擎"""
+
+    # (项目名, 原始数据列, 评分表中的项目名)
+    TABLE_ITEMS = [
+        ("肺活量", "肺活量(ml)", "肺活量"),
+        ("50米跑", "50米跑(s)", "50米跑"),
+        ("坐位体前屈", "坐位体前屈(cm)", "坐位体前屈"),
+        ("跳绳", "一分钟跳绳(个）", "一分钟跳绳"),
+        ("仰卧起坐", "一分钟仰卧起坐(个)", "一分钟仰卧起坐"),
+        ("往返跑", "50米×8往返跑(s)", "50米×8往返跑"),
+    ]
+
+    # 评分表学段
+    LEVEL = "小学"
+
+    # 成绩为整数计数、取值范围有限的项目，可使用稠密查分表
+    DENSE_ITEMS = {"肺活量", "一分钟跳绳", "一分钟仰卧起坐"}
+
+    # 参与综合得分计算的项目（顺序与逐项累加顺序一致）
+    WEIGHTED_ITEMS = [
+        "BMI",
+        "肺活量",
+        "50米跑",
+        "坐位体前屈",
+        "跳绳",
+        "仰卧起坐",
+        "往返跑",
+    ]
+
+    # 各年级都必须检查的主要测试项目
+    BASE_MAIN_ITEMS = ["BMI", "肺活量", "50米跑", "坐位体前屈", "跳绳"]
+
+    # 往返跑成绩的合理上限（秒）
+    RUN8_MAX_SECONDS = 300
+
+    # 评分用到的原始成绩列，读取成绩文件时只需读取这些列
+    INPUT_COLUMNS = [
+        "学籍号",
+        "学号",
+        "姓名",
+        "性别",
+        "班级名称",
+        "身高(cm)",
+        "体重(kg)",
+        "BMI",
+    ] + [column for _, column, _ in TABLE_ITEMS]
+
+    # 成绩文件原有的BMI列：whole_school.py 评分时按身高体重重新计算BMI，
+    # 原有的值另存于此列，供沿用其评分结果的 form_and_class.py 恢复
+    SOURCE_BMI_COLUMN = "原始BMI"
+
+    def __init__(self, converter, use_dense_tables=True, backend=None):
+        """converter 需提供 standards（编译后的评分表）和 weights（各年级权重）
+
+        backend 指定计算内核（auto、numpy、numba），默认读取环境变量 SCORING_BACKEND
+        """
+        self.converter = converter
+        self.standards = converter.standards
+        self.use_dense_tables = use_dense_tables
+        self.kernels = load_kernels(backend)
+        self._dense = {}
+
+    def lookup_scores(self, values, thresholds, scores, reverse=False):
+        """在有序阈值表上批量查分，结果与逐条线性扫描评分表一致"""
+        return self.kernels.lookup_scores(values, thresholds, scores, reverse)
+
+    @staticmethod
+    def parse_times(values, max_seconds=None):
+        """批量将时间成绩转换为秒数，支持 m:ss、m.ss、纯数字和空值
+
+        返回 (秒数数组, 有效掩码)：空值和无法解析的成绩为 NaN；
+        有效掩码要求成绩能解析、大于0且不超过 max_seconds
+        """
+        text = pd.Series(np.asarray(values, dtype=object)).astype(str).str.strip()
+        seconds = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float)
+
+        # m:ss 格式：分钟 × 60 + 秒
+        colon = text.str.contains(":", regex=False).to_numpy()
+        if colon.any():
+            parts = text[colon].str.split(":", expand=True)
+            minutes = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float)
+            secs = pd.to_numeric(parts[1], errors="coerce").to_numpy(dtype=float)
+            seconds[colon] = minutes * 60 + secs
+
+        # m.ss 格式：不足10的小数按 分.秒 处理，如 1.35 表示1分35秒
+        dotted = (
+            ~colon & (seconds > 0) & (seconds < 10) & (seconds != np.floor(seconds))
+        )
+        if dotted.any():
+            parts = text[dotted].str.split(".", n=1, expand=True)
+            minutes = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float)
+            secs = pd.to_numeric(parts[1].str.ljust(2, "0"), errors="coerce")
+            secs = secs.to_numpy(dtype=float)
+            secs[secs >= 60] = np.nan
+            seconds[dotted] = minutes * 60 + secs
+
+        valid = ~np.isnan(seconds) & (seconds > 0)
+        if max_seconds is not None:
+            valid &= seconds <= max_seconds
+        return seconds, valid
+
+    def dense_table(self, table_item, gender, grade):
+        """获取稠密查分表 (起始值, 分数数组)，阈值含小数时返回 None"""
+        key = (table_item, gender, grade)
+        if key not in self._dense:
+            thresholds, scores = self.standards.table(
+                table_item, gender, grade, self.LEVEL
+            )
+            dense = None
+            if np.all(thresholds == np.floor(thresholds)):
+                reverse = not self.standards.higher_is_better(
+                    table_item, gender, grade, self.LEVEL
+                )
+                low, high = int(thresholds.min()), int(thresholds.max())
+                every_value = np.arange(low, high + 1, dtype=float)
+                dense = (
+                    low,
+                    self.lookup_scores(every_value, thresholds, scores, reverse),
+                )
+            self._dense[key] = dense
+        return self._dense[key]
+
+    def score_values(self, values, table_item, gender, grade):
+        """单项批量查分：整数成绩按稠密表直接取分（两端截断），其余按区间查找"""
+        thresholds, scores = self.standards.table(table_item, gender, grade, self.LEVEL)
+        reverse = not self.standards.higher_is_better(
+            table_item, gender, grade, self.LEVEL
+        )
+        dense = None
+        if self.use_dense_tables and table_item in self.DENSE_ITEMS:
+            dense = self.dense_table(table_item, gender, grade)
+        if dense is None:
+            return self.lookup_scores(values, thresholds, scores, reverse)
+
+        low, lut = dense
+        result = np.full(len(values), np.nan)
+        integral = values == np.floor(values)
+        positions = np.clip(values[integral], low, low + len(lut) - 1)
+        result[integral] = lut[positions.astype(np.int64) - low]
+
+        # 非整数成绩退回区间查找
+        fractional = ~integral & ~np.isnan(values)
+        if fractional.any():
+            result[fractional] = self.lookup_scores(
+                values[fractional], thresholds, scores, reverse
+            )
+        return result
+
+    def levels_from_scores(self, scores):
+        """根据分数批量获取等级（分类数组）"""
+        return self.standards.levels(scores)
+
+    def untested_levels(self, df):
+        """生成全部为未测的等级列"""
+        return pd.Series(
+            self.standards.levels(np.full(len(df), np.nan)), index=df.index
+        )
+
+    @staticmethod
+    def round_scores(values, ndigits=1):
+        """批量四舍五入，结果与逐个调用内置 round 一致"""
+        values = np.asarray(values, dtype=float)
+        result = np.round(values, ndigits)
+        # np.round 先放大再取整，在 .5 附近可能与内置 round 不同，逐个修正
+        scaled = values * 10**ndigits
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        for i in np.flatnonzero(near_half):
+            result[i] = round(float(values[i]), ndigits)
+        return result
+
+    def weight_matrix(self, grades):
+        """根据 weights 构建每名学生的权重矩阵和主要项目掩码"""
+        weights = self.converter.weights
+        grade_names = list(weights.keys())
+        n_items = len(self.WEIGHTED_ITEMS)
+
+        # 最后一行对应未知年级：权重为0，只检查基础项目
+        grade_weights = np.zeros((len(grade_names) + 1, n_items))
+        for i, grade in enumerate(grade_names):
+            for j, item in enumerate(self.WEIGHTED_ITEMS):
+                grade_weights[i, j] = weights[grade].get(item, 0)
+        main_items = grade_weights > 0
+        main_items[-1] = [item in self.BASE_MAIN_ITEMS for item in self.WEIGHTED_ITEMS]
+
+        codes = pd.Categorical(grades, categories=grade_names).codes
+        codes = np.where(codes < 0, len(grade_names), codes)
+        return grade_weights[codes], main_items[codes], codes < len(grade_names)
+
+    def score_comprehensive(self, df):
+        """以 得分矩阵 × 年级权重矩阵 批量计算标准分、综合得分和综合等级"""
+        scores = np.column_stack(
+            [
+                pd.to_numeric(df[f"{item}得分"], errors="coerce").to_numpy(dtype=float)
+                for item in self.WEIGHTED_ITEMS
+            ]
+        )
+        row_weights, main_items, known_grade = self.weight_matrix(df["年级"])
+
+        tested = ~np.isnan(scores)
+        standard = self.round_scores(self.kernels.weighted_sum(scores, row_weights))
+        standard[~known_grade] = 0
+
+        df["标准分"] = standard
+        df["综合得分"] = df["标准分"] + df["附加分"]
+
+        # 如果所有主要项目都是空值，则为'未测'
+        any_tested = (tested & main_items).any(axis=1)
+        scores = df["综合得分"].to_numpy(dtype=float)
+        df["综合等级"] = self.levels_from_scores(np.where(any_tested, scores, np.nan))
+
+    def bmi_values(self, height_cm, weight_kg, require_positive=True):
+        """按列批量计算BMI，身高或体重缺失、身高为0时为空值
+
+        require_positive 为 True 时身高或体重不大于0的数据同样视为空值
+        """
+        height = pd.to_numeric(height_cm, errors="coerce").to_numpy(dtype=float)
+        weight = pd.to_numeric(weight_kg, errors="coerce").to_numpy(dtype=float)
+        invalid = height == 0
+        if require_positive:
+            invalid |= (height <= 0) | (weight <= 0)
+        height_m = np.where(invalid, np.nan, height / 100)
+        return self.round_scores(weight / (height_m * height_m))
+
+    def bmi_intervals(self, gender, grade):
+        """由BMI评分表构建按判定顺序排列的闭区间 (下界, 上界, 分数)，空界限为 ±inf"""
+        compiled = self.standards.bmi(gender, grade, self.LEVEL)
+        if compiled is None:
+            return None
+        bounds, scores = compiled
+        lower = np.where(np.isnan(bounds[:, 0]), -np.inf, bounds[:, 0])
+        upper = np.where(np.isnan(bounds[:, 1]), np.inf, bounds[:, 1])
+        return lower, upper, scores
+
+    def score_bmi(self, df, index, gender, grade):
+        """对一个(年级, 性别)切片批量计算BMI得分和等级"""
+        intervals = self.bmi_intervals(gender, grade)
+        if intervals is None or "BMI" not in df.columns:
+            return
+        lower, upper, scores = intervals
+        bmi = pd.to_numeric(df.loc[index, "BMI"], errors="coerce").to_numpy(dtype=float)
+
+        # 按 正常、低体重、超重、肥胖 的顺序取第一个包含该值的区间，
+        # 落在区间空隙中的值默认按正常、80分处理
+        bmi_scores, codes = self.kernels.classify_bmi(bmi, lower, upper, scores, 80.0)
+        labels = np.array(BMI_LEVELS + ["正常"], dtype=object)
+        bmi_levels = labels[codes]
+        bmi_levels[np.isnan(bmi)] = "未测"
+
+        df.loc[index, "BMI得分"] = bmi_scores
+        df.loc[index, "BMI等级"] = bmi_levels
+
+    def column_values(self, df, column, index):
+        """取出切片内某一原始数据列，缺列或非数值时视为空值"""
+        if column not in df.columns:
+            return np.full(len(index), np.nan)
+        return pd.to_numeric(df.loc[index, column], errors="coerce").to_numpy(
+            dtype=float
+        )
+
+    def slices(self, df, grades, genders=("男", "女")):
+        """按(年级, 性别)一次分组，依次返回各组的 (年级, 性别, 行索引)"""
+        groups = df.groupby(["年级", "性别"], sort=False).indices
+        for grade in grades:
+            for gender in genders:
+                positions = groups.get((grade, gender))
+                if positions is not None:
+                    yield grade, gender, df.index[positions]
+
+    def score_all(self, df, grades, genders=("男", "女")):
+        """按(年级, 性别)一次分组，依次对各组批量评分；grades 为参与评分的年级"""
+        for grade, gender, index in self.slices(df, grades, genders):
+            print(f"计算{grade}{gender}学生得分...")
+            self.score_bmi(df, index, gender, grade)
+            self.score_group(df, index, grade, gender)
+
+    def rescore_bmi(self, df, grades, genders=("男", "女")):
+        """BMI列变化后重新计算BMI得分和等级，其他单项得分不变"""
+        df["BMI得分"] = np.nan
+        df["BMI等级"] = "未测"
+        for grade, gender, index in self.slices(df, grades, genders):
+            self.score_bmi(df, index, gender, grade)
+
+    def score_group(self, df, index, grade, gender):
+        """对一个(年级, 性别)切片批量计算各单项得分、等级和跳绳加分"""
+        for item, column, table_item in self.TABLE_ITEMS:
+            if self.standards.table(table_item, gender, grade, self.LEVEL) is None:
+                continue
+
+            if item == "往返跑":
+                self.score_run8(df, index, column, table_item, gender, grade)
+                continue
+
+            values = self.column_values(df, column, index)
+            item_scores = self.score_values(values, table_item, gender, grade)
+
+            if item == "50米跑":
+                # 数据有效性检查：空值留空，超出合理范围的无效数据给0分
+                invalid = (values <= 0) | (values > 60)
+                item_scores[invalid] = 0
+
+            df.loc[index, f"{item}得分"] = item_scores
+            df.loc[index, f"{item}等级"] = self.levels_from_scores(item_scores)
+
+            if item == "跳绳":
+                # 跳绳加分：满分后按加分表计算超出部分的加分
+                self.score_bonus(
+                    df, index, table_item, gender, grade, values, item_scores
+                )
+
+    def score_bonus(self, df, index, table_item, gender, grade, values, item_scores):
+        """按加分表计算满分后超出部分的附加分"""
+        bonus_table = self.standards.bonus(table_item, gender, grade, self.LEVEL)
+        if bonus_table is None:
+            return
+        needed, points = bonus_table
+        thresholds, _ = self.standards.table(table_item, gender, grade, self.LEVEL)
+
+        extra = values - thresholds[0]
+        bonus = self.kernels.rope_bonus(extra, item_scores, needed, points)
+        bonus_mask = bonus != 0
+        if bonus_mask.any():
+            df.loc[index[bonus_mask], "附加分"] = bonus[bonus_mask]
+
+    def score_run8(self, df, index, column, table_item, gender, grade):
+        """50米×8往返跑评分：只处理有成绩的学生，时间格式先转换为秒数"""
+        if column not in df.columns:
+            return
+        raw = df.loc[index, column]
+        tested = raw.notna().to_numpy()
+        if not tested.any():
+            return
+
+        seconds, valid = self.parse_times(raw[tested], self.RUN8_MAX_SECONDS)
+        item_scores = self.score_values(seconds, table_item, gender, grade)
+        # 数据有效性检查：无法解析或超出合理范围的时间给0分
+        item_scores[~valid] = 0
+
+        tested_index = index[tested]
+        df.loc[tested_index, "往返跑得分"] = item_scores
+        df.loc[tested_index, "往返跑等级"] = self.levels_from_scores(item_scores)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+国家学生体质健康标准评分表加载器
+将 backend/src/data/persistent 下的 grading.json、BMI_grading.json、
+additional_score.json、grading_ranking.json 编译为连续的阈值/分数数组，按 (项目, 性别, 学段, 年级) 索引，
+并缓存为二进制文件，源文件内容变化时自动重新编译
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.normpath(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "persistent"
+    )
+)
+CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "__pycache__", "standards_cache.npz"
+)
+SOURCE_FILES = [
+    "grading.json",
+    "BMI_grading.json",
+    "additional_score.json",
+    "grading_ranking.json",
+]
+
+# 缓存格式版本，修改编译结构时递增
+CACHE_VERSION = 2
+
+# 没有成绩时的等级
+UNTESTED_LEVEL = "未测"
+
+# BMI等级的判定顺序
+BMI_LEVELS = ["正常", "低体重", "超重", "肥胖"]
+
+# 进程内已加载的评分表，避免每次实例化都重新读取
+_loaded = {}
+
+
+class CompiledStandards:
+    """编译后的评分表：所有阈值和分数存放在连续数组中，按偏移量切片"""
+
+    def __init__(self, arrays, meta):
+        self.thresholds = arrays["thresholds"]
+        self.scores = arrays["scores"]
+        self.offsets = arrays["offsets"]
+        self.bmi_bounds = arrays["bmi_bounds"]
+        self.bmi_scores = arrays["bmi_scores"]
+        self.bonus_thresholds = arrays["bonus_thresholds"]
+        self.bonus_points = arrays["bonus_points"]
+        self.bonus_offsets = arrays["bonus_offsets"]
+        self.source_hash = meta["source_hash"]
+
+        self.table_index = {tuple(key): i for i, key in enumerate(meta["tables"])}
+        self.bmi_index = {tuple(key): i for i, key in enumerate(meta["bmi"])}
+        self.bonus_index = {tuple(key): i for i, key in enumerate(meta["bonus"])}
+        self.bonus_types = meta["bonus_types"]
+
+        # 等级分数线，按分数从高到低排列
+        self.level_names = [name for name, _ in meta["ranking"]]
+        self.level_bounds = np.array([bound for _, bound in meta["ranking"]], float)
+        self.level_categories = self.level_names + [UNTESTED_LEVEL]
+
+    def table(self, item, gender, grade, level="小学"):
+        """获取评分表 (阈值数组, 分数数组)，按分数从高到低排列；不存在时返回 None"""
+        i = self.table_index.get((item, gender, level, grade))
+        if i is None:
+            return None
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        return self.thresholds[start:stop], self.scores[start:stop]
+
+    def higher_is_better(self, item, gender, grade, level="小学"):
+        """判断项目是否数值越大分数越高（时间类项目为 False）"""
+        thresholds, _ = self.table(item, gender, grade, level)
+        return len(thresholds) < 2 or thresholds[0] >= thresholds[-1]
+
+    def bmi(self, gender, grade, level="小学"):
+        """获取BMI区间 (上下界数组[4, 2], 分数数组[4])，顺序同 BMI_LEVELS，空界限为 NaN"""
+        i = self.bmi_index.get((gender, level, grade))
+        if i is None:
+            return None
+        return self.bmi_bounds[i], self.bmi_scores[i]
+
+    def bonus(self, item, gender, grade, level="小学"):
+        """获取加分表 (超出数量数组, 加分数组)，按加分从高到低排列；不存在时返回 None"""
+        i = self.bonus_index.get((item, gender, level, grade))
+        if i is None:
+            return None
+        start, stop = self.bonus_offsets[i], self.bonus_offsets[i + 1]
+        return self.bonus_thresholds[start:stop], self.bonus_points[start:stop]
+
+    def levels(self, scores):
+        """按等级分数线批量将分数映射为等级，返回分类数组；空值为未测，低于最低分数线按最低等级"""
+        scores = np.asarray(scores, dtype=float)
+        ascending = self.level_bounds[::-1]
+        pos = np.searchsorted(ascending, scores, side="right") - 1
+        codes = len(self.level_names) - 1 - np.maximum(pos, 0)
+        codes[np.isnan(scores)] = len(self.level_names)
+        return pd.Categorical.from_codes(codes, categories=self.level_categories)
+
+
+def hash_source_files(data_dir=DATA_DIR):
+    """计算评分表源文件的内容哈希"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode("utf-8"))
+    for name in SOURCE_FILES:
+        with open(os.path.join(data_dir, name), "rb") as f:
+            digest.update(name.encode("utf-8"))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def compile_standards(data_dir=DATA_DIR, source_hash=None):
+    """读取 JSON 源文件并编译为连续数组"""
+
+    def load(name):
+        with open(os.path.join(data_dir, name), encoding="utf-8") as f:
+            return json.load(f)
+
+    grading = load("grading.json")
+    bmi_grading = load("BMI_grading.json")
+    additional = load("additional_score.json")
+    ranking = load("grading_ranking.json")
+
+    # 单项评分表：JSON 中每档为 [分数, 阈值]
+    tables, thresholds, scores, offsets = [], [], [], [0]
+    for item, by_gender in grading.items():
+        for gender, by_level in by_gender.items():
+            for level, by_grade in by_level.items():
+                for grade, rows in by_grade.items():
+                    tables.append([item, gender, level, grade])
+                    scores.extend(row[0] for row in rows)
+                    thresholds.extend(row[1] for row in rows)
+                    offsets.append(len(thresholds))
+
+    # BMI区间：JSON 中每个等级为 [分数, [下界, 上界]]，null 表示不设界限
+    bmi_keys, bmi_bounds, bmi_scores = [], [], []
+    for gender, by_level in bmi_grading.items():
+        for level, by_grade in by_level.items():
+            for grade, levels in by_grade.items():
+                bmi_keys.append([gender, level, grade])
+                bmi_bounds.append(
+                    [
+                        [np.nan if b is None else b for b in levels[name][1]]
+                        for name in BMI_LEVELS
+                    ]
+                )
+                bmi_scores.append([levels[name][0] for name in BMI_LEVELS])
+
+    # 加分表：JSON 中每档为 [加分, 超出数量]
+    bonus_keys, bonus_thresholds, bonus_points, bonus_offsets = [], [], [], [0]
+    bonus_types = {}
+    for item, spec in additional.items():
+        bonus_types[item] = spec["type"]
+        for gender, by_level in spec["data"].items():
+            for level, by_grade in by_level.items():
+                for grade, rows in by_grade.items():
+                    bonus_keys.append([item, gender, level, grade])
+                    bonus_points.extend(row[0] for row in rows)
+                    bonus_thresholds.extend(row[1] for row in rows)
+                    bonus_offsets.append(len(bonus_thresholds))
+
+    arrays = {
+        "thresholds": np.array(thresholds, dtype=float),
+        "scores": np.array(scores, dtype=float),
+        "offsets": np.array(offsets, dtype=np.int64),
+        "bmi_bounds": np.array(bmi_bounds, dtype=float).reshape(-1, len(BMI_LEVELS), 2),
+        "bmi_scores": np.array(bmi_scores, dtype=float).reshape(-1, len(BMI_LEVELS)),
+        "bonus_thresholds": np.array(bonus_thresholds, dtype=float),
+        "bonus_points": np.array(bonus_points, dtype=float),
+        "bonus_offsets": np.array(bonus_offsets, dtype=np.int64),
+    }
+    meta = {
+        "version": CACHE_VERSION,
+        "source_hash": source_hash or hash_source_files(data_dir),
+        "tables": tables,
+        "bmi": bmi_keys,
+        "bonus": bonus_keys,
+        "bonus_types": bonus_types,
+        "ranking": ranking,
+    }
+    return arrays, meta
+
+
+def _read_cache(cache_file, source_hash):
+    """读取二进制缓存，版本或源文件哈希不一致时返回 None"""
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with np.load(cache_file, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CACHE_VERSION:
+                return None
+            if meta.get("source_hash") != source_hash:
+                return None
+            arrays = {name: data[name] for name in data.files if name != "meta"}
+        return arrays, meta
+    except Exception:
+        return None
+
+
+def _write_cache(cache_file, arrays, meta):
+    """写入二进制缓存，失败时不影响评分"""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_file, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays
+        )
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"⚠️ 评分表缓存写入失败: {e}")
+
+
+def load_standards(data_dir=DATA_DIR, cache_file=CACHE_FILE):
+    """加载编译后的评分表：优先使用进程内结果和磁盘缓存，源文件变化时重新编译"""
+    source_hash = hash_source_files(data_dir)
+    key = (os.path.abspath(data_dir), source_hash)
+    if key in _loaded:
+        return _loaded[key]
+
+    cached = _read_cache(cache_file, source_hash) if cache_file else None
+    if cached is None:
+        arrays, meta = compile_standards(data_dir, source_hash)
+        if cache_file:
+            _write_cache(cache_file, arrays, meta)
+    else:
+        arrays, meta = cached
+
+    standards = CompiledStandards(arrays, meta)
+    _loaded[key] = standards
+    return standards
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统计数据附属文件
+form_and_class.py 保存班级/年级汇总表时，把 calculate_statistics 的结果另存为 JSON，
+位于汇总表所在目录的 .cache 中（如 四年级/.cache/四1班_班级统计汇总表.xlsx.stats.json）。
+class_ranking.py 直接读取这些统计数据，不再重新打开汇总表按单元格位置查找人数。
+
+附属文件记录汇总表保存后的大小和修改时间，汇总表被替换（如用旧版本脚本重新生成）后视为失效，
+此时读取方应回退为解析汇总表
+"""
+
+import json
+import os
+
+from scored_cache import CACHE_DIR_NAME
+
+# 附属文件格式版本，修改保存结构时递增
+STATS_VERSION = 1
+
+
+def sidecar_file(workbook_file):
+    """汇总表对应的统计数据文件"""
+    directory = os.path.join(os.path.dirname(workbook_file) or ".", CACHE_DIR_NAME)
+    return os.path.join(directory, f"{os.path.basename(workbook_file)}.stats.json")
+
+
+def _file_stat(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def save_stats(workbook_file, stats, **info):
+    """在汇总表保存后写入统计数据（先写临时文件再替换），写入失败时只给出警告
+
+    info 为附加的描述信息（如班级名称、年级），与统计数据一起保存
+    """
+    path = sidecar_file(workbook_file)
+    sidecar = {
+        "version": STATS_VERSION,
+        "workbook": _file_stat(workbook_file),
+        **info,
+        "stats": stats,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(sidecar, f, ensure_ascii=False)
+        os.replace(tmp_file, path)
+    except OSError as e:
+        print(f"⚠️ 统计数据文件写入失败: {e}")
+
+
+def load_stats(workbook_file):
+    """读取汇总表的统计数据，文件不存在、版本不一致或汇总表已变化时返回 None"""
+    path = sidecar_file(workbook_file)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 统计数据文件读取失败: {e}")
+        return None
+    if sidecar.get("version") != STATS_VERSION:
+        return None
+    if sidecar.get("workbook") != _file_stat(workbook_file):
+        return None
+    return sidecar
@@ -1,11 +1,21 @@
 import pandas as pd
 import numpy as np
 import os
+import io
+import re
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from datetime import datetime
 
+from excel_reader import read_excel_rows
+from excel_writer import UnsupportedFormat, WorkbookTemplate, save_workbook
+from report_styles import apply_style, font
+from scored_cache import load_scored_cache
+from standards import load_standards
+
 
 class PersonalTranscriptGenerator:
     def __init__(self):
@@ -15,6 +25,19 @@ class PersonalTranscriptGenerator:
         self.output_dir = r"25年9月体测成绩得分等级汇总\成绩表"
         self.today = "2025/09/23-2025/09/24"
 
+        # 生成成绩表的年级
+        self.target_grades = ["四年级", "六年级"]
+
+        # 使用版式模板生成成绩表（版式只创建一次，每个学生只填入值）
+        self.use_template = True
+
+        # 输出方式: files 每个学生一个文件；workbook 每个班级一个多工作表工作簿；
+        # zip 每个班级一个压缩包（内含各学生的成绩表文件）
+        self.output_mode = "files"
+
+        # 同时生成成绩表的进程数（1 为在当前进程中依次生成）
+        self.workers = 1
+
         # 跳绳满分标准 (年级: {性别: 满分次数})
         self.jump_rope_standards = {
             "一年级": {"男": 109, "女": 117},
@@ -25,21 +48,39 @@ class PersonalTranscriptGenerator:
             "六年级": {"男": 157, "女": 166},
         }
 
+        # 国家标准评分表（等级分数线）
+        self.standards = load_standards()
+
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
 
-    def load_student_data(self):
-        """加载学生数据"""
+    def load_student_data(self, school_table=None):
+        """加载学生数据
+
+        school_table 为 whole_school.py 生成总表时的学生数据（列名与总表表头一致），
+        提供时直接使用，不再读取总表文件
+        """
         print("=== 加载全校学生数据 ===")
 
-        try:
-            # 先读取整个文件看看结构
-            df_all = pd.read_excel(self.source_file, header=None)
-            print(f"Excel文件总行数: {len(df_all)}")
+        # 优先使用 whole_school.py 保存的评分缓存（总表未变化时有效）
+        if school_table is None:
+            cached = load_scored_cache(self.source_file, self.target_grades)
+            if cached is not None:
+                school_table = cached["school_table"]
 
-            # 读取Excel文件，跳过前7行（统计信息），第8行是表头
-            df = pd.read_excel(self.source_file, skiprows=7)
-            print(f"跳过前7行后的数据行数: {len(df)}")
+        try:
+            if school_table is None:
+                # 读取Excel文件，跳过前7行（统计信息），第8行是表头，只保留生成成绩表的年级
+                df = read_excel_rows(
+                    self.source_file,
+                    skiprows=7,
+                    filters={"年级编号": lambda grade: grade in self.target_grades},
+                )
+                print(f"跳过前7行后的数据行数: {df.attrs['rows_read']}")
+                print(f"{'、'.join(self.target_grades)}学生数据行数: {len(df)}")
+            else:
+                df = school_table
+                print(f"总表学生数据行数: {len(df)}")
 
             # 直接使用Excel的列名，不重新命名
             print(f"实际列名: {df.columns.tolist()}")
@@ -114,14 +155,7 @@ class PersonalTranscriptGenerator:
             standard_jumps = grade_standards.get(gender, 0)
 
             # 根据分数确定等级
-            if jump_score >= 90:
-                grade_level = "优秀"
-            elif jump_score >= 80:
-                grade_level = "良好"
-            elif jump_score >= 60:
-                grade_level = "及格"
-            else:
-                grade_level = "不及格"
+            grade_level = self.standards.levels([jump_score])[0]
 
             if jump_score == 100:
                 # 得分是100分：计算加分
@@ -146,8 +180,29 @@ class PersonalTranscriptGenerator:
         except:
             return actual_jumps, jump_score, "", 0, 0
 
-    def create_personal_transcript(self, student_data):
-        """为单个学生创建个人成绩表"""
+    # 个人成绩表的合并单元格
+    TRANSCRIPT_MERGES = [
+        "A1:G1",
+        "B2:C2",
+        "E2:G2",
+        "F3:G3",
+        "B4:C4",
+        "E4:G4",
+        "E5:G5",
+        "F8:G8",
+        "F9:G9",
+        "F10:G10",
+        "F11:G11",
+        "F12:G12",
+        "F13:G13",
+        "F14:G14",
+        "F15:G15",
+        "F16:G16",
+        "B17:C17",
+    ]
+
+    def create_transcript_layout(self):
+        """创建个人成绩表的版式（列宽、合并单元格、样式、行高），不含任何值"""
         wb = Workbook()
         ws = wb.active
         ws.title = "成绩单"
@@ -165,109 +220,75 @@ class PersonalTranscriptGenerator:
         for i, width in enumerate(col_widths):
             ws.column_dimensions[get_column_letter(i + 1)].width = width
 
-        # 创建边框样式
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
+        for cell_range in self.TRANSCRIPT_MERGES:
+            ws.merge_cells(cell_range)
+
+        # 标题和表头字体
+        ws["A1"].font = font(bold=True, size=14)
+        for col in ["A", "B", "C", "D", "E", "F", "G"]:
+            ws[f"{col}6"].font = font(bold=True, size=11)
+
+        # 所有单元格统一设置边框和居中对齐
+        for row in range(1, 18):
+            for col in ["A", "B", "C", "D", "E", "F", "G"]:
+                apply_style(ws[f"{col}{row}"], "grid")
+
+        # 设置行高
+        for row_num in range(1, 18):
+            ws.row_dimensions[row_num].height = 30
+
+        return wb
+
+    def transcript_values(self, student_data):
+        """个人成绩表各单元格的值 {坐标: 值}（含标签文字）"""
+        values = {}
 
         # 标题
-        ws.merge_cells("A1:G1")
-        ws["A1"] = "《国家学生体质健康标准》登记卡"
-        ws["A1"].font = Font(bold=True, size=14)
+        values["A1"] = "《国家学生体质健康标准》登记卡"
 
         # 第2行：学校和测评日期
-        ws["A2"] = "学    校"
-        ws["A2"].border = thin_border
-        ws.merge_cells("B2:C2")
-        ws["B2"] = "平谷区第十一小学"
-        ws["B2"].border = thin_border
-        ws["D2"] = "测评日期"
-        ws["D2"].border = thin_border
-        ws.merge_cells("E2:G2")
+        values["A2"] = "学    校"
+        values["B2"] = "平谷区第十一小学"
+        values["D2"] = "测评日期"
         # 统一设置测评日期为9.23-9.24
-        ws["E2"] = "2025/09/23-2025/09/24"
-        ws["E2"].border = thin_border
+        values["E2"] = "2025/09/23-2025/09/24"
 
         # 第3行：学生基本信息
-        ws["A3"] = "姓    名"
-        ws["A3"].border = thin_border
-        ws["B3"] = student_data.get("姓名", "")
-        ws["B3"].border = thin_border
-        ws["C3"] = "性  别"
-        ws["C3"].border = thin_border
-        ws["D3"] = student_data.get("性别", "")
-        ws["D3"].border = thin_border
-        ws["E3"] = "学    号"
-        ws["E3"].border = thin_border
-        ws.merge_cells("F3:G3")
-        ws["F3"] = student_data.get("学号", "")
-        ws["F3"].border = thin_border
+        values["A3"] = "姓    名"
+        values["B3"] = student_data.get("姓名", "")
+        values["C3"] = "性  别"
+        values["D3"] = student_data.get("性别", "")
+        values["E3"] = "学    号"
+        values["F3"] = student_data.get("学号", "")
 
         # 第4行：班级、民族
-        ws["A4"] = "班    级"
-        ws["A4"].border = thin_border
-        ws.merge_cells("B4:C4")
-        ws["B4"] = f"{student_data.get('年级', '')}{student_data.get('班级', '')}"
-        ws["B4"].border = thin_border
-        ws["D4"] = "民  族"
-        ws["D4"].border = thin_border
-        ws.merge_cells("E4:G4")
-        ws["E4"] = "汉族"
-        ws["E4"].border = thin_border
+        values["A4"] = "班    级"
+        values["B4"] = f"{student_data.get('年级', '')}{student_data.get('班级', '')}"
+        values["D4"] = "民  族"
+        values["E4"] = "汉族"
 
         # 第5行：身高、体重
-        ws["A5"] = "身高（cm）"
-        ws["A5"].border = thin_border
-        ws["B5"] = student_data.get("身高", "")
-        ws["B5"].border = thin_border
-        ws["C5"] = "体重（kg）"
-        ws["C5"].border = thin_border
-        ws["D5"] = student_data.get("体重", "")
-        ws["D5"].border = thin_border
+        values["A5"] = "身高（cm）"
+        values["B5"] = student_data.get("身高", "")
+        values["C5"] = "体重（kg）"
+        values["D5"] = student_data.get("体重", "")
         # 空白区域
-        ws.merge_cells("E5:G5")
-        ws["E5"] = ""
-        ws["E5"].border = thin_border
+        values["E5"] = ""
 
         # 第6行：表头
-        ws["A6"] = "单项指标"
-        ws["A6"].border = thin_border
-        ws["B6"] = "成绩"
-        ws["B6"].border = thin_border
-        ws["C6"] = "得分"
-        ws["C6"].border = thin_border
-        ws["D6"] = "等级"
-        ws["D6"].border = thin_border
-        ws["E6"] = "加分指标"
-        ws["E6"].border = thin_border
-        ws["F6"] = "成绩"
-        ws["F6"].border = thin_border
-        ws["G6"] = "附加分"
-        ws["G6"].border = thin_border
-
-        # 设置表头居中和字体
-        for col in ["A", "B", "C", "D", "E", "F", "G"]:
-            ws[f"{col}6"].alignment = Alignment(horizontal="center", vertical="center")
-            ws[f"{col}6"].font = Font(bold=True, size=11)
+        values["A6"] = "单项指标"
+        values["B6"] = "成绩"
+        values["C6"] = "得分"
+        values["D6"] = "等级"
+        values["E6"] = "加分指标"
+        values["F6"] = "成绩"
+        values["G6"] = "附加分"
 
         # 第7行：BMI
-        ws["A7"] = "体重指数（BMI）\n（千克/米²）"
-        ws["A7"].border = thin_border
-        ws["A7"].alignment = Alignment(
-            horizontal="center", vertical="center", wrap_text=True
-        )
-        ws["B7"] = student_data.get("BMI值", "")
-        ws["B7"].border = thin_border
-        ws["B7"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["C7"] = student_data.get("BMI得分", "")
-        ws["C7"].border = thin_border
-        ws["C7"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["D7"] = student_data.get("BMI等级", "")
-        ws["D7"].border = thin_border
-        ws["D7"].alignment = Alignment(horizontal="center", vertical="center")
+        values["A7"] = "体重指数（BMI）\n（千克/米²）"
+        values["B7"] = student_data.get("BMI值", "")
+        values["C7"] = student_data.get("BMI得分", "")
+        values["D7"] = student_data.get("BMI等级", "")
 
         # 获取跳绳数据和加分
         grade = student_data.get("年级", "")
@@ -282,320 +303,459 @@ class PersonalTranscriptGenerator:
         if jump_bonus and pd.notna(jump_bonus) and jump_bonus > 0:
             extra_jumps = int(jump_bonus * 2)  # 反推超出次数
 
-        ws["E7"] = "1 分钟跳绳\n（单位：次）"
-        ws["E7"].border = thin_border
-        ws["E7"].alignment = Alignment(
-            horizontal="center", vertical="center", wrap_text=True
-        )
+        values["E7"] = "1 分钟跳绳\n（单位：次）"
         # F7显示超出满分的个数，G7显示加分
         if extra_jumps > 0:
-            ws["F7"] = extra_jumps
-            ws["G7"] = jump_bonus
+            values["F7"] = extra_jumps
+            values["G7"] = jump_bonus
         else:
-            ws["F7"] = ""
-            ws["G7"] = ""
-        ws["F7"].border = thin_border
-        ws["F7"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["G7"].border = thin_border
-        ws["G7"].alignment = Alignment(horizontal="center", vertical="center")
+            values["F7"] = ""
+            values["G7"] = ""
 
         # 第8行：肺活量
-        ws["A8"] = "肺活量（毫升）"
-        ws["A8"].border = thin_border
-        ws["A8"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["B8"] = student_data.get("肺活量值", "")
-        ws["B8"].border = thin_border
-        ws["B8"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["C8"] = student_data.get("肺活量得分", "")
-        ws["C8"].border = thin_border
-        ws["C8"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["D8"] = student_data.get("肺活量等级", "")
-        ws["D8"].border = thin_border
-        ws["D8"].alignment = Alignment(horizontal="center", vertical="center")
+        values["A8"] = "肺活量（毫升）"
+        values["B8"] = student_data.get("肺活量值", "")
+        values["C8"] = student_data.get("肺活量得分", "")
+        values["D8"] = student_data.get("肺活量等级", "")
 
         # 学年总分
-        ws["E8"] = "学年总分"
-        ws["E8"].border = thin_border
-        ws["E8"].alignment = Alignment(horizontal="center", vertical="center")
+        values["E8"] = "学年总分"
         standard_score = student_data.get("标准分", 0)
         additional_score = student_data.get("附加分", 0)
         total_score = (standard_score if pd.notna(standard_score) else 0) + (
             additional_score if pd.notna(additional_score) else 0
         )
-        ws.merge_cells("F8:G8")
-        ws["F8"] = f"{total_score:.1f}" if total_score > 0 else ""
-        ws["F8"].border = thin_border
-        ws["F8"].alignment = Alignment(horizontal="center")
+        values["F8"] = f"{total_score:.1f}" if total_score > 0 else ""
 
         # 第9行：50米跑
-        ws["A9"] = "50 米跑（秒）"
-        ws["A9"].border = thin_border
-        ws["A9"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["B9"] = student_data.get("50米跑值", "")
-        ws["B9"].border = thin_border
-        ws["C9"] = student_data.get("50米跑得分", "")
-        ws["C9"].border = thin_border
-        ws["D9"] = student_data.get("50米跑等级", "")
-        ws["D9"].border = thin_border
-        ws["E9"] = ""
-        ws["E9"].border = thin_border
-        ws.merge_cells("F9:G9")
-        ws["F9"] = ""
-        ws["F9"].border = thin_border
+        values["A9"] = "50 米跑（秒）"
+        values["B9"] = student_data.get("50米跑值", "")
+        values["C9"] = student_data.get("50米跑得分", "")
+        values["D9"] = student_data.get("50米跑等级", "")
+        values["E9"] = ""
+        values["F9"] = ""
 
         # 第10行：坐位体前屈
-        ws["A10"] = "坐位体前屈\n（厘米）"
-        ws["A10"].border = thin_border
-        ws["A10"].alignment = Alignment(
-            horizontal="center", vertical="center", wrap_text=True
-        )
-        ws["B10"] = student_data.get("坐位体前屈值", "")
-        ws["B10"].border = thin_border
-        ws["C10"] = student_data.get("坐位体前屈得分", "")
-        ws["C10"].border = thin_border
-        ws["D10"] = student_data.get("坐位体前屈等级", "")
-        ws["D10"].border = thin_border
+        values["A10"] = "坐位体前屈\n（厘米）"
+        values["B10"] = student_data.get("坐位体前屈值", "")
+        values["C10"] = student_data.get("坐位体前屈得分", "")
+        values["D10"] = student_data.get("坐位体前屈等级", "")
 
         # 等级评定
-        ws["E10"] = "等级评定"
-        ws["E10"].border = thin_border
-        ws["E10"].alignment = Alignment(horizontal="center", vertical="center")
-        ws.merge_cells("F10:G10")
-        ws["F10"] = student_data.get("综合等级", "")
-        ws["F10"].border = thin_border
-        ws["F10"].alignment = Alignment(horizontal="center")
+        values["E10"] = "等级评定"
+        values["F10"] = student_data.get("综合等级", "")
 
         # 第11行：跳绳（计算后的显示结果）
-        ws["A11"] = "1 分钟跳绳\n（单位：次）"
-        ws["A11"].border = thin_border
-        ws["A11"].alignment = Alignment(
-            horizontal="center", vertical="center", wrap_text=True
-        )
-        ws["B11"] = actual_jumps if actual_jumps and pd.notna(actual_jumps) else ""
-        ws["B11"].border = thin_border
-        ws["C11"] = jump_score if jump_score and pd.notna(jump_score) else ""
-        ws["C11"].border = thin_border
-        ws["D11"] = jump_grade if jump_grade and pd.notna(jump_grade) else ""
-        ws["D11"].border = thin_border
-        ws["E11"] = ""
-        ws["E11"].border = thin_border
-        ws.merge_cells("F11:G11")
-        ws["F11"] = ""
-        ws["F11"].border = thin_border
+        values["A11"] = "1 分钟跳绳\n（单位：次）"
+        values["B11"] = actual_jumps if actual_jumps and pd.notna(actual_jumps) else ""
+        values["C11"] = jump_score if jump_score and pd.notna(jump_score) else ""
+        values["D11"] = jump_grade if jump_grade and pd.notna(jump_grade) else ""
+        values["E11"] = ""
+        values["F11"] = ""
 
         # 第12行：仰卧起坐
-        ws["A12"] = "1 分钟仰卧起坐\n（单位：次）"
-        ws["A12"].border = thin_border
-        ws["A12"].alignment = Alignment(
-            horizontal="center", vertical="center", wrap_text=True
-        )
-        ws["B12"] = (
+        values["A12"] = "1 分钟仰卧起坐\n（单位：次）"
+        values["B12"] = (
             student_data.get("仰卧起坐值", "")
             if pd.notna(student_data.get("仰卧起坐值", ""))
             else ""
         )
-        ws["B12"].border = thin_border
-        ws["C12"] = (
+        values["C12"] = (
             student_data.get("仰卧起坐得分", "")
             if pd.notna(student_data.get("仰卧起坐得分", ""))
             else ""
         )
-        ws["C12"].border = thin_border
-        ws["D12"] = (
+        values["D12"] = (
             student_data.get("仰卧起坐等级", "")
             if pd.notna(student_data.get("仰卧起坐等级", ""))
             else ""
         )
-        ws["D12"].border = thin_border
 
         # 体育教师签字
-        ws["E12"] = "体育教师签字"
-        ws["E12"].border = thin_border
-        ws["E12"].alignment = Alignment(horizontal="center", vertical="center")
-        ws.merge_cells("F12:G12")
-        ws["F12"] = ""
-        ws["F12"].border = thin_border
+        values["E12"] = "体育教师签字"
+        values["F12"] = ""
 
         # 第13行：50米×8往返跑（仅六年级需要）
         if student_data.get("年级", "") == "六年级":
-            ws["A13"] = "50米×8往返跑\n（单位：s）"
-            ws["A13"].border = thin_border
-            ws["A13"].alignment = Alignment(
-                horizontal="center", vertical="center", wrap_text=True
-            )
-            ws["B13"] = (
+            values["A13"] = "50米×8往返跑\n（单位：s）"
+            values["B13"] = (
                 student_data.get("50米×8往返跑值", "")
                 if pd.notna(student_data.get("50米×8往返跑值", ""))
                 else ""
             )
-            ws["B13"].border = thin_border
-            ws["C13"] = (
+            values["C13"] = (
                 student_data.get("50米×8往返跑得分", "")
                 if pd.notna(student_data.get("50米×8往返跑得分", ""))
                 else ""
             )
-            ws["C13"].border = thin_border
-            ws["D13"] = (
+            values["D13"] = (
                 student_data.get("50米×8往返跑等级", "")
                 if pd.notna(student_data.get("50米×8往返跑等级", ""))
                 else ""
             )
-            ws["D13"].border = thin_border
-            ws["E13"] = ""
-            ws["E13"].border = thin_border
-            ws.merge_cells("F13:G13")
-            ws["F13"] = ""
-            ws["F13"].border = thin_border
+            values["E13"] = ""
+            values["F13"] = ""
         else:
-            # 四年级：空行，仅保持边框
+            # 四年级：空行
             for col in ["A", "B", "C", "D", "E"]:
-                ws[f"{col}13"] = ""
-                ws[f"{col}13"].border = thin_border
-            ws.merge_cells("F13:G13")
-            ws["F13"] = ""
-            ws["F13"].border = thin_border
+                values[f"{col}13"] = ""
+            values["F13"] = ""
 
         # 第14行：班主任签字
-        ws["E14"] = "班主任签字"
-        ws["E14"].border = thin_border
-        ws["E14"].alignment = Alignment(horizontal="center", vertical="center")
-        ws.merge_cells("F14:G14")
-        ws["F14"] = ""
-        ws["F14"].border = thin_border
-        for col in ["A", "B", "C", "D"]:
-            ws[f"{col}14"].border = thin_border
+        values["E14"] = "班主任签字"
+        values["F14"] = ""
 
         # 第15行：家长签字
-        ws["E15"] = "家长签字"
-        ws["E15"].border = thin_border
-        ws["E15"].alignment = Alignment(horizontal="center", vertical="center")
-        ws.merge_cells("F15:G15")
-        ws["F15"] = ""
-        ws["F15"].border = thin_border
-        for col in ["A", "B", "C", "D"]:
-            ws[f"{col}15"].border = thin_border
-
-        # 第16行：空行
-        for col in ["A", "B", "C", "D", "E"]:
-            ws[f"{col}16"].border = thin_border
-        ws.merge_cells("F16:G16")
-        ws["F16"].border = thin_border
+        values["E15"] = "家长签字"
+        values["F15"] = ""
 
         # 第17行：标准分和附加分
-        ws["A17"] = "标准分"
-        ws["A17"].border = thin_border
-        ws["A17"].alignment = Alignment(horizontal="center", vertical="center")
-        ws.merge_cells("B17:C17")
-        ws["B17"] = (
+        values["A17"] = "标准分"
+        values["B17"] = (
             f"{student_data.get('标准分', ''):.1f}"
             if pd.notna(student_data.get("标准分", ""))
             else ""
         )
-        ws["B17"].border = thin_border
-        ws["B17"].alignment = Alignment(horizontal="center")
 
-        ws["D17"] = "附加分"
-        ws["D17"].border = thin_border
-        ws["D17"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["E17"] = (
+        values["D17"] = "附加分"
+        values["E17"] = (
             additional_score
             if additional_score and pd.notna(additional_score) and additional_score > 0
             else ""
         )
-        ws["E17"].border = thin_border
-        ws["E17"].alignment = Alignment(horizontal="center")
 
-        ws["F17"] = "备注"
-        ws["F17"].border = thin_border
-        ws["F17"].alignment = Alignment(horizontal="center", vertical="center")
-        ws["G17"] = ""
-        ws["G17"].border = thin_border
+        values["F17"] = "备注"
+        values["G17"] = ""
 
-        # 确保所有单元格都有边框和居中对齐
-        for row in range(1, 18):
-            for col in ["A", "B", "C", "D", "E", "F", "G"]:
-                cell = ws[f"{col}{row}"]
-                cell.border = thin_border
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # 设置行高
-        for row_num in range(1, 18):
-            ws.row_dimensions[row_num].height = 30
+        return values
 
+    def create_personal_transcript(self, student_data):
+        """为单个学生创建个人成绩表"""
+        wb = self.create_transcript_layout()
+        ws = wb.active
+        for coordinate, value in self.transcript_values(student_data).items():
+            ws[coordinate] = value
         return wb
 
-    def generate_all_transcripts(self):
-        """为所有学生生成个人成绩表，按年级和班级分文件夹保存"""
+    def save_personal_transcript(self, student_data, filepath, template=None):
+        """保存单个学生的个人成绩表，提供版式模板时直接填入值"""
+        if template is not None:
+            try:
+                template.save(self.transcript_values(student_data), filepath)
+                return
+            except UnsupportedFormat:
+                # 模板无法写出的值（如日期）改为逐个单元格创建
+                pass
+        save_workbook(self.create_personal_transcript(student_data), filepath)
+
+    def save_class_workbook(self, students, filepath, errors, template=None):
+        """把一个班级的成绩表保存为一个工作簿，每个学生一个工作表
+
+        students 为 [(工作表名称, 学生数据), ...]，返回成功写入的学生数；
+        出错学生的错误信息加入 errors
+        """
+        sheets = []
+        for title, student in students:
+            try:
+                sheets.append((title, self.transcript_values(student)))
+            except Exception as e:
+                errors.append(student_error(student, e))
+        if not sheets:
+            return 0
+
+        if template is not None:
+            try:
+                template.save_sheets(sheets, filepath)
+                return len(sheets)
+            except UnsupportedFormat:
+                # 模板无法写出的值（如日期）改为逐个单元格创建
+                pass
+
+        # 复制版式工作表后填入各学生的值
+        wb = self.create_transcript_layout()
+        layout = wb.active
+        for title, values in sheets:
+            ws = wb.copy_worksheet(layout)
+            ws.title = title
+            for coordinate, value in values.items():
+                ws[coordinate] = value
+        wb.remove(layout)
+        save_workbook(wb, filepath)
+        return len(sheets)
+
+    def save_class_archive(self, students, filepath, errors, template=None):
+        """把一个班级的成绩表依次写入一个压缩包，每个学生一个成绩表文件
+
+        students 为 [(文件名, 学生数据), ...]，返回成功写入的学生数；
+        出错学生的错误信息加入 errors。成绩表文件本身已经压缩，压缩包内直接存储
+        """
+        count = 0
+        with zipfile.ZipFile(filepath, "w", zipfile.ZIP_STORED) as archive:
+            for filename, student in students:
+                try:
+                    buffer = io.BytesIO()
+                    self.save_personal_transcript(student, buffer, template)
+                    archive.writestr(filename, buffer.getvalue())
+                    count += 1
+                except Exception as e:
+                    errors.append(student_error(student, e))
+        return count
+
+    def write_output(self, filepath, students, template=None):
+        """写出一个输出文件（一个学生的成绩表，或按 output_mode 写出一个班级）
+
+        students 为 [(文件名或工作表名称, 学生数据), ...]，
+        返回 (成功写入的学生数, 错误信息列表)
+        """
+        errors = []
+        try:
+            if self.output_mode == "zip":
+                count = self.save_class_archive(students, filepath, errors, template)
+            elif self.output_mode == "workbook":
+                count = self.save_class_workbook(students, filepath, errors, template)
+            else:
+                self.save_personal_transcript(students[0][1], filepath, template)
+                count = 1
+        except Exception as e:
+            if self.output_mode == "files":
+                errors.append(student_error(students[0][1], e))
+            else:
+                errors.append(f"{os.path.basename(filepath)}: {e}")
+            count = 0
+        return count, errors
+
+    def generate_all_transcripts(self, student_ids=None, school_table=None):
+        """为所有学生生成个人成绩表，按年级和班级分文件夹保存
+
+        student_ids 为学号集合时只生成这些学生的成绩表（补测增量处理）；
+        school_table 为 whole_school.py 生成总表时的学生数据，提供时不再读取总表文件。
+        output_mode 为 workbook 或 zip 时每个班级只写一个文件；
+        workers 大于 1 时由多个进程同时生成（见 __init__）
+        """
         print("=== 开始生成个人成绩表 ===")
         print("只处理四年级和六年级的数据")
 
         # 加载学生数据
-        students_df = self.load_student_data()
+        students_df = self.load_student_data(school_table)
 
         if students_df.empty:
             print("没有找到学生数据，退出生成")
             return
 
         # 过滤只保留四年级和六年级的学生
-        target_grades = ["四年级", "六年级"]
-        students_df = students_df[students_df["年级"].isin(target_grades)]
+        students_df = students_df[students_df["年级"].isin(self.target_grades)]
         print(f"过滤后剩余 {len(students_df)} 条四年级和六年级学生数据")
 
+        bundled = self.output_mode != "files"
+
+        # 只生成指定学生的成绩表
+        if student_ids is not None:
+            ids = students_df["学号"].astype(str).str.strip()
+            selected = ids.isin(student_ids)
+            if bundled:
+                # 班级文件包含全班学生，重新生成涉及的整个班级
+                classes = (
+                    students_df["年级"].astype(str).str.strip()
+                    + students_df["班级"].astype(str).str.strip()
+                )
+                selected = classes.isin(set(classes[selected]))
+            students_df = students_df[selected]
+            print(f"只生成指定的 {len(students_df)} 名学生的成绩表")
+
         success_count = 0
         total_count = len(students_df)
+        # 各输出文件 [(文件路径, [(文件名, 学生数据), ...]), ...]
+        outputs = []
+        # 按班级汇集的学生 {(年级, 班级): [(文件名, 学生数据), ...]}
+        class_students = {}
+        created_dirs = set()
 
         for idx, student in students_df.iterrows():
-            try:
-                student_id = str(student.get("学号", "")).strip()
-                student_name = str(student.get("姓名", "")).strip()
-                grade = str(student.get("年级", "")).strip()
-                class_name = str(student.get("班级", "")).strip()
-
-                if not student_name or student_name == "nan":
-                    print(f"跳过无效学生数据(行{idx+1}): 姓名={student_name}")
-                    continue
-
-                # 创建年级文件夹路径
-                grade_dir = (
-                    os.path.join(self.output_dir, grade) if grade else self.output_dir
-                )
+            student_id = str(student.get("学号", "")).strip()
+            student_name = str(student.get("姓名", "")).strip()
+            grade = str(student.get("年级", "")).strip()
+            class_name = str(student.get("班级", "")).strip()
+
+            if not student_name or student_name == "nan":
+                print(f"跳过无效学生数据(行{idx+1}): 姓名={student_name}")
+                continue
+
+            # 生成文件名（优先使用学号）
+            if student_id and student_id != "nan":
+                filename = f"{student_id}_{student_name}_成绩单.xlsx"
+            else:
+                filename = f"{student_name}_成绩单.xlsx"
 
-                # 创建班级文件夹路径
-                class_dir = (
-                    os.path.join(grade_dir, class_name) if class_name else grade_dir
+            if bundled:
+                class_students.setdefault((grade, class_name), []).append(
+                    (filename, student)
                 )
+                continue
 
-                # 确保文件夹存在
-                os.makedirs(class_dir, exist_ok=True)
+            # 创建年级文件夹路径
+            grade_dir = (
+                os.path.join(self.output_dir, grade) if grade else self.output_dir
+            )
 
-                # 创建个人成绩表
-                wb = self.create_personal_transcript(student)
+            # 创建班级文件夹路径
+            class_dir = os.path.join(grade_dir, class_name) if class_name else grade_dir
 
-                # 生成文件名（优先使用学号）
-                if student_id and student_id != "nan":
-                    filename = f"{student_id}_{student_name}_成绩单.xlsx"
-                else:
-                    filename = f"{student_name}_成绩单.xlsx"
-                filepath = os.path.join(class_dir, filename)
+            # 确保文件夹存在
+            if class_dir not in created_dirs:
+                os.makedirs(class_dir, exist_ok=True)
+                created_dirs.add(class_dir)
 
-                # 保存文件
-                wb.save(filepath)
-                success_count += 1
+            outputs.append((os.path.join(class_dir, filename), [(filename, student)]))
 
-                if success_count % 50 == 0:
-                    print(f"已生成 {success_count}/{total_count} 个成绩表")
+        # 每个班级写入一个文件
+        for (grade, class_name), students in class_students.items():
+            grade_dir = (
+                os.path.join(self.output_dir, grade) if grade else self.output_dir
+            )
+            os.makedirs(grade_dir, exist_ok=True)
+            extension = "zip" if self.output_mode == "zip" else "xlsx"
+            filepath = os.path.join(
+                grade_dir, f"{class_name or '未分班'}_成绩单.{extension}"
+            )
+            if self.output_mode == "workbook":
+                titles = sheet_titles(
+                    [filename[: -len("_成绩单.xlsx")] for filename, _ in students]
+                )
+                students = [
+                    (title, student) for title, (_, student) in zip(titles, students)
+                ]
+            outputs.append((filepath, students))
+
+        # 依次取得各输出文件的结果（多进程时也按原顺序）
+        errors = []
+        for (filepath, _), (count, output_errors) in zip(
+            outputs, self.write_outputs(outputs)
+        ):
+            success_count += count
+            errors.extend(output_errors)
+            if bundled:
+                print(
+                    f"已生成 {success_count}/{total_count} 个成绩表"
+                    f"（{os.path.basename(filepath)}）"
+                )
+            elif count and success_count % 50 == 0:
+                print(f"已生成 {success_count}/{total_count} 个成绩表")
 
-            except Exception as e:
-                print(f"生成学生 {student.get('姓名', 'Unknown')} 成绩表时出错: {e}")
+        if errors:
+            print(f"\n以下 {len(errors)} 个成绩表生成时出错:")
+            for message in errors:
+                print(f"  {message}")
 
         print(f"\n=== 生成完成 ===")
         print(f"成功生成 {success_count}/{total_count} 个个人成绩表")
         print(f"保存位置: {self.output_dir}")
-        print(f"文件已按年级和班级分文件夹保存")
+        if bundled:
+            print(f"每个班级保存为一个文件，按年级分文件夹保存")
+        else:
+            print(f"文件已按年级和班级分文件夹保存")
+
+    def write_outputs(self, outputs):
+        """按顺序逐个返回各输出文件的 write_output 结果
+
+        workers 大于 1 时在进程池中生成，每个进程创建一次版式模板
+        """
+        if not outputs:
+            return []
+
+        workers = min(self.workers, len(outputs))
+        if workers <= 1:
+            # 各学生的成绩表版式相同，只创建一次模板
+            template = None
+            if self.use_template:
+                template = WorkbookTemplate(self.create_transcript_layout())
+            return (
+                self.write_output(filepath, students, template)
+                for filepath, students in outputs
+            )
+
+        print(f"使用 {workers} 个进程生成成绩表")
+        return self._write_in_pool(outputs, workers)
+
+    def _write_in_pool(self, outputs, workers):
+        # 每个进程分到若干批，进度按顺序汇报
+        chunksize = max(1, len(outputs) // (workers * 8))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            yield from executor.map(_write_output, outputs, chunksize=chunksize)
+
+
+def student_error(student, error):
+    """学生成绩表出错时的错误信息"""
+    return f"{student.get('姓名', 'Unknown')}: {error}"
+
+
+# 子进程中的成绩表生成器和版式模板（由 _init_worker 创建）
+_worker = None
+
+
+def _init_worker(generator):
+    global _worker
+    template = None
+    if generator.use_template:
+        template = WorkbookTemplate(generator.create_transcript_layout())
+    _worker = (generator, template)
+
+
+def _write_output(output):
+    generator, template = _worker
+    filepath, students = output
+    return generator.write_output(filepath, students, template)
+
+
+def sheet_titles(names):
+    """把名称转换为互不重复的工作表名称（去掉 Excel 不允许的字符，最长 31 个字符）"""
+    titles = []
+    used = set()
+    for name in names:
+        base = re.sub(r"[\\/*?:\[\]]", "_", name)[:31] or "成绩单"
+        title = base
+        number = 1
+        while title.lower() in used:
+            number += 1
+            suffix = f"({number})"
+            title = base[: 31 - len(suffix)] + suffix
+        used.add(title.lower())
+        titles.append(title)
+    return titles
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="生成个人成绩表")
+    parser.add_argument(
+        "--no-template",
+        action="store_true",
+        help="不使用版式模板，为每个学生逐个单元格创建成绩表",
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=["files", "workbook", "zip"],
+        default="files",
+        help="输出方式: files 每个学生一个文件（默认）；workbook 每个班级一个工作簿，"
+        "每个学生一个工作表；zip 每个班级一个压缩包",
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="同时生成成绩表的进程数（默认 1）",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_arguments()
     generator = PersonalTranscriptGenerator()
+    generator.use_template = not args.no_template
+    generator.output_mode = args.output_mode
+    generator.workers = args.workers
     generator.generate_all_transcripts()
 
 
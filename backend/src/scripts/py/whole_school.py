@@ -13,12 +13,62 @@ import math
 import argparse
 import sys
 
+from class_names import GRADE_DTYPE, extract_grade, grade_column, normalize_class_names
+from excel_reader import READ_ENGINES, read_excel_rows, set_read_engine, unique_columns
+from excel_writer import WRITE_ENGINES, RowWriter, set_write_engine
+from report_styles import STYLES
+from scored_cache import save_scored_cache
+from scoring import ScoringEngine
+from standards import load_standards
+
 
 class NationalStandardConverter:
     """基于国家标准的体测数据转换器"""
 
-    def __init__(self):
+    # 默认参与评分的年级
+    DEFAULT_GRADES = ["四年级", "六年级"]
+
+    # 第8行学生数据表头
+    STUDENT_DATA_HEADERS = [
+        "年级编号",
+        "班名",
+        "学号",
+        "姓名",
+        "性别",
+        "身高（cm)",
+        "体重（kg)",
+        "体重指数BMI\n（千克/米2）",
+        "得分",
+        "等级",
+        "肺活量（毫升）",
+        "得分",
+        "等级",
+        "50米跑（秒）",
+        "得分",
+        "等级",
+        "坐位体前屈(cm)",
+        "得分",
+        "等级",
+        "一分钟跳绳（次）",
+        "得分",
+        "加分",
+        "等级",
+        "一分钟仰卧起坐（次）",
+        "得分",
+        "等级",
+        "50米*8往返跑（分.秒）",
+        "得分",
+        "等级",
+        "标准分",
+        "附加分",
+        "综合得分",
+        "综合评级",
+        "备注",
+    ]
+
+    def __init__(self, target_grades=None):
         """初始化转换器，设置国家标准评分表和权重"""
+        self.target_grades = list(target_grades or self.DEFAULT_GRADES)
         self.setup_national_standards()
 
     def setup_national_standards(self):
@@ -76,1539 +126,31 @@ class NationalStandardConverter:
             },
         }
 
-        # BMI评分标准（根据标准文档表1-1、1-2）
-        self.bmi_standards = {
-            "男": {
-                "一年级": {
-                    "正常": (13.5, 18.1),
-                    "低体重": (0, 13.4),
-                    "超重": (18.2, 20.3),
-                    "肥胖": (20.4, 50),
-                },
-                "二年级": {
-                    "正常": (13.7, 18.4),
-                    "低体重": (0, 13.6),
-                    "超重": (18.5, 20.4),
-                    "肥胖": (20.5, 50),
-                },
-                "三年级": {
-                    "正常": (13.9, 19.4),
-                    "低体重": (0, 13.8),
-                    "超重": (19.5, 22.1),
-                    "肥胖": (22.2, 50),
-                },
-                "四年级": {
-                    "正常": (14.2, 20.1),
-                    "低体重": (0, 14.1),
-                    "超重": (20.2, 22.6),
-                    "肥胖": (22.7, 50),
-                },
-                "五年级": {
-                    "正常": (14.4, 21.4),
-                    "低体重": (0, 14.3),
-                    "超重": (21.5, 24.1),
-                    "肥胖": (24.2, 50),
-                },
-                "六年级": {
-                    "正常": (14.7, 21.8),
-                    "低体重": (0, 14.6),
-                    "超重": (21.9, 24.5),
-                    "肥胖": (24.6, 50),
-                },
-            },
-            "女": {
-                "一年级": {
-                    "正常": (13.3, 17.3),
-                    "低体重": (0, 13.2),
-                    "超重": (17.4, 19.2),
-                    "肥胖": (19.3, 50),
-                },
-                "二年级": {
-                    "正常": (13.5, 17.8),
-                    "低体重": (0, 13.4),
-                    "超重": (17.9, 20.2),
-                    "肥胖": (20.3, 50),
-                },
-                "三年级": {
-                    "正常": (13.6, 18.6),
-                    "低体重": (0, 13.5),
-                    "超重": (18.7, 21.1),
-                    "肥胖": (21.2, 50),
-                },
-                "四年级": {
-                    "正常": (13.7, 19.4),
-                    "低体重": (0, 13.6),
-                    "超重": (19.5, 22.0),
-                    "肥胖": (22.1, 50),
-                },
-                "五年级": {
-                    "正常": (13.8, 20.5),
-                    "低体重": (0, 13.7),
-                    "超重": (20.6, 22.9),
-                    "肥胖": (23.0, 50),
-                },
-                "六年级": {
-                    "正常": (14.2, 20.8),
-                    "低体重": (0, 14.1),
-                    "超重": (20.9, 23.6),
-                    "肥胖": (23.7, 50),
-                },
-            },
-        }
-
-        # 肺活量评分标准（完全按照标准.md表1-3、1-4）
-        self.lung_standards = {
-            "男": {
-                "一年级": [
-                    (1700, 100),
-                    (1600, 95),
-                    (1500, 90),
-                    (1400, 85),
-                    (1300, 80),
-                    (1240, 78),
-                    (1180, 76),
-                    (1120, 74),
-                    (1060, 72),
-                    (1000, 70),
-                    (940, 68),
-                    (880, 66),
-                    (820, 64),
-                    (760, 62),
-                    (700, 60),
-                    (660, 50),
-                    (620, 40),
-                    (580, 30),
-                    (540, 20),
-                    (500, 10),
-                ],
-                "二年级": [
-                    (2000, 100),
-                    (1900, 95),
-                    (1800, 90),
-                    (1650, 85),
-                    (1500, 80),
-                    (1430, 78),
-                    (1360, 76),
-                    (1290, 74),
-                    (1220, 72),
-                    (1150, 70),
-                    (1080, 68),
-                    (1010, 66),
-                    (940, 64),
-                    (870, 62),
-                    (800, 60),
-                    (750, 50),
-                    (700, 40),
-                    (650, 30),
-                    (600, 20),
-                    (550, 10),
-                ],
-                "三年级": [
-                    (2300, 100),
-                    (2200, 95),
-                    (2100, 90),
-                    (1900, 85),
-                    (1700, 80),
-                    (1620, 78),
-                    (1540, 76),
-                    (1460, 74),
-                    (1380, 72),
-                    (1300, 70),
-                    (1220, 68),
-                    (1140, 66),
-                    (1060, 64),
-                    (980, 62),
-                    (900, 60),
-                    (840, 50),
-                    (780, 40),
-                    (720, 30),
-                    (660, 20),
-                    (600, 10),
-                ],
-                "四年级": [
-                    (2600, 100),
-                    (2500, 95),
-                    (2400, 90),
-                    (2150, 85),
-                    (1900, 80),
-                    (1820, 78),
-                    (1740, 76),
-                    (1660, 74),
-                    (1580, 72),
-                    (1500, 70),
-                    (1420, 68),
-                    (1340, 66),
-                    (1260, 64),
-                    (1180, 62),
-                    (1100, 60),
-                    (1030, 50),
-                    (960, 40),
-                    (890, 30),
-                    (820, 20),
-                    (750, 10),
-                ],
-                "五年级": [
-                    (2900, 100),
-                    (2800, 95),
-                    (2700, 90),
-                    (2450, 85),
-                    (2200, 80),
-                    (2110, 78),
-                    (2020, 76),
-                    (1930, 74),
-                    (1840, 72),
-                    (1750, 70),
-                    (1660, 68),
-                    (1570, 66),
-                    (1480, 64),
-                    (1390, 62),
-                    (1300, 60),
-                    (1220, 50),
-                    (1140, 40),
-                    (1060, 30),
-                    (980, 20),
-                    (900, 10),
-                ],
-                "六年级": [
-                    (3200, 100),
-                    (3100, 95),
-                    (3000, 90),
-                    (2750, 85),
-                    (2500, 80),
-                    (2400, 78),
-                    (2300, 76),
-                    (2200, 74),
-                    (2100, 72),
-                    (2000, 70),
-                    (1900, 68),
-                    (1800, 66),
-                    (1700, 64),
-                    (1600, 62),
-                    (1500, 60),
-                    (1410, 50),
-                    (1320, 40),
-                    (1230, 30),
-                    (1140, 20),
-                    (1050, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (1400, 100),
-                    (1300, 95),
-                    (1200, 90),
-                    (1100, 85),
-                    (1000, 80),
-                    (960, 78),
-                    (920, 76),
-                    (880, 74),
-                    (840, 72),
-                    (800, 70),
-                    (760, 68),
-                    (720, 66),
-                    (680, 64),
-                    (640, 62),
-                    (600, 60),
-                    (580, 50),
-                    (560, 40),
-                    (540, 30),
-                    (520, 20),
-                    (500, 10),
-                ],
-                "二年级": [
-                    (1600, 100),
-                    (1500, 95),
-                    (1400, 90),
-                    (1300, 85),
-                    (1200, 80),
-                    (1150, 78),
-                    (1100, 76),
-                    (1050, 74),
-                    (1000, 72),
-                    (950, 70),
-                    (900, 68),
-                    (850, 66),
-                    (800, 64),
-                    (750, 62),
-                    (700, 60),
-                    (680, 50),
-                    (660, 40),
-                    (640, 30),
-                    (620, 20),
-                    (600, 10),
-                ],
-                "三年级": [
-                    (1800, 100),
-                    (1700, 95),
-                    (1600, 90),
-                    (1500, 85),
-                    (1400, 80),
-                    (1340, 78),
-                    (1280, 76),
-                    (1220, 74),
-                    (1160, 72),
-                    (1100, 70),
-                    (1040, 68),
-                    (980, 66),
-                    (920, 64),
-                    (860, 62),
-                    (800, 60),
-                    (780, 50),
-                    (760, 40),
-                    (740, 30),
-                    (720, 20),
-                    (700, 10),
-                ],
-                "四年级": [
-                    (2000, 100),
-                    (1900, 95),
-                    (1800, 90),
-                    (1700, 85),
-                    (1600, 80),
-                    (1530, 78),
-                    (1460, 76),
-                    (1390, 74),
-                    (1320, 72),
-                    (1250, 70),
-                    (1180, 68),
-                    (1110, 66),
-                    (1040, 64),
-                    (970, 62),
-                    (900, 60),
-                    (880, 50),
-                    (860, 40),
-                    (840, 30),
-                    (820, 20),
-                    (800, 10),
-                ],
-                "五年级": [
-                    (2250, 100),
-                    (2150, 95),
-                    (2050, 90),
-                    (1950, 85),
-                    (1850, 80),
-                    (1770, 78),
-                    (1690, 76),
-                    (1610, 74),
-                    (1530, 72),
-                    (1450, 70),
-                    (1370, 68),
-                    (1290, 66),
-                    (1210, 64),
-                    (1130, 62),
-                    (1050, 60),
-                    (1020, 50),
-                    (990, 40),
-                    (960, 30),
-                    (930, 20),
-                    (900, 10),
-                ],
-                "六年级": [
-                    (2500, 100),
-                    (2400, 95),
-                    (2300, 90),
-                    (2200, 85),
-                    (2100, 80),
-                    (2010, 78),
-                    (1920, 76),
-                    (1830, 74),
-                    (1740, 72),
-                    (1650, 70),
-                    (1560, 68),
-                    (1470, 66),
-                    (1380, 64),
-                    (1290, 62),
-                    (1200, 60),
-                    (1170, 50),
-                    (1140, 40),
-                    (1110, 30),
-                    (1080, 20),
-                    (1050, 10),
-                ],
-            },
-        }
-
-        # 50米跑评分标准（表1-5、1-6）- 时间越少分数越高
-        self.run50_standards = {
-            "男": {
-                "一年级": [
-                    (10.2, 100),
-                    (10.3, 95),
-                    (10.4, 90),
-                    (10.5, 85),
-                    (10.6, 80),
-                    (10.8, 78),
-                    (11.0, 76),
-                    (11.2, 74),
-                    (11.4, 72),
-                    (11.6, 70),
-                    (11.8, 68),
-                    (12.0, 66),
-                    (12.2, 64),
-                    (12.4, 62),
-                    (12.6, 60),
-                    (12.8, 50),
-                    (13.0, 40),
-                    (13.2, 30),
-                    (13.4, 20),
-                    (13.6, 10),
-                ],
-                "二年级": [
-                    (9.6, 100),
-                    (9.7, 95),
-                    (9.8, 90),
-                    (9.9, 85),
-                    (10.0, 80),
-                    (10.2, 78),
-                    (10.4, 76),
-                    (10.6, 74),
-                    (10.8, 72),
-                    (11.0, 70),
-                    (11.2, 68),
-                    (11.4, 66),
-                    (11.6, 64),
-                    (11.8, 62),
-                    (12.0, 60),
-                    (12.2, 50),
-                    (12.4, 40),
-                    (12.6, 30),
-                    (12.8, 20),
-                    (13.0, 10),
-                ],
-                "三年级": [
-                    (9.1, 100),
-                    (9.2, 95),
-                    (9.3, 90),
-                    (9.4, 85),
-                    (9.5, 80),
-                    (9.7, 78),
-                    (9.9, 76),
-                    (10.1, 74),
-                    (10.3, 72),
-                    (10.5, 70),
-                    (10.7, 68),
-                    (10.9, 66),
-                    (11.1, 64),
-                    (11.3, 62),
-                    (11.5, 60),
-                    (11.7, 50),
-                    (11.9, 40),
-                    (12.1, 30),
-                    (12.3, 20),
-                    (12.5, 10),
-                ],
-                "四年级": [
-                    (8.7, 100),
-                    (8.8, 95),
-                    (8.9, 90),
-                    (9.0, 85),
-                    (9.1, 80),
-                    (9.3, 78),
-                    (9.5, 76),
-                    (9.7, 74),
-                    (9.9, 72),
-                    (10.1, 70),
-                    (10.3, 68),
-                    (10.5, 66),
-                    (10.7, 64),
-                    (10.9, 62),
-                    (11.1, 60),
-                    (11.3, 50),
-                    (11.5, 40),
-                    (11.7, 30),
-                    (11.9, 20),
-                    (12.1, 10),
-                ],
-                "五年级": [
-                    (8.4, 100),
-                    (8.5, 95),
-                    (8.6, 90),
-                    (8.7, 85),
-                    (8.8, 80),
-                    (9.0, 78),
-                    (9.2, 76),
-                    (9.4, 74),
-                    (9.6, 72),
-                    (9.8, 70),
-                    (10.0, 68),
-                    (10.2, 66),
-                    (10.4, 64),
-                    (10.6, 62),
-                    (10.8, 60),
-                    (11.0, 50),
-                    (11.2, 40),
-                    (11.4, 30),
-                    (11.6, 20),
-                    (11.8, 10),
-                ],
-                "六年级": [
-                    (8.2, 100),
-                    (8.3, 95),
-                    (8.4, 90),
-                    (8.5, 85),
-                    (8.6, 80),
-                    (8.8, 78),
-                    (9.0, 76),
-                    (9.2, 74),
-                    (9.4, 72),
-                    (9.6, 70),
-                    (9.8, 68),
-                    (10.0, 66),
-                    (10.2, 64),
-                    (10.4, 62),
-                    (10.6, 60),
-                    (10.8, 50),
-                    (11.0, 40),
-                    (11.2, 30),
-                    (11.4, 20),
-                    (11.6, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (11.0, 100),
-                    (11.1, 95),
-                    (11.2, 90),
-                    (11.5, 85),
-                    (11.8, 80),
-                    (12.0, 78),
-                    (12.2, 76),
-                    (12.4, 74),
-                    (12.6, 72),
-                    (12.8, 70),
-                    (13.0, 68),
-                    (13.2, 66),
-                    (13.4, 64),
-                    (13.6, 62),
-                    (13.8, 60),
-                    (14.0, 50),
-                    (14.2, 40),
-                    (14.4, 30),
-                    (14.6, 20),
-                    (14.8, 10),
-                ],
-                "二年级": [
-                    (10.0, 100),
-                    (10.1, 95),
-                    (10.2, 90),
-                    (10.5, 85),
-                    (10.8, 80),
-                    (11.0, 78),
-                    (11.2, 76),
-                    (11.4, 74),
-                    (11.6, 72),
-                    (11.8, 70),
-                    (12.0, 68),
-                    (12.2, 66),
-                    (12.4, 64),
-                    (12.6, 62),
-                    (12.8, 60),
-                    (13.0, 50),
-                    (13.2, 40),
-                    (13.4, 30),
-                    (13.6, 20),
-                    (13.8, 10),
-                ],
-                "三年级": [
-                    (9.2, 100),
-                    (9.3, 95),
-                    (9.4, 90),
-                    (9.7, 85),
-                    (10.0, 80),
-                    (10.2, 78),
-                    (10.4, 76),
-                    (10.6, 74),
-                    (10.8, 72),
-                    (11.0, 70),
-                    (11.2, 68),
-                    (11.4, 66),
-                    (11.6, 64),
-                    (11.8, 62),
-                    (12.0, 60),
-                    (12.2, 50),
-                    (12.4, 40),
-                    (12.6, 30),
-                    (12.8, 20),
-                    (13.0, 10),
-                ],
-                "四年级": [
-                    (8.7, 100),
-                    (8.8, 95),
-                    (8.9, 90),
-                    (9.2, 85),
-                    (9.5, 80),
-                    (9.7, 78),
-                    (9.9, 76),
-                    (10.1, 74),
-                    (10.3, 72),
-                    (10.5, 70),
-                    (10.7, 68),
-                    (10.9, 66),
-                    (11.1, 64),
-                    (11.3, 62),
-                    (11.5, 60),
-                    (11.7, 50),
-                    (11.9, 40),
-                    (12.1, 30),
-                    (12.3, 20),
-                    (12.5, 10),
-                ],
-                "五年级": [
-                    (8.3, 100),
-                    (8.4, 95),
-                    (8.5, 90),
-                    (8.8, 85),
-                    (9.1, 80),
-                    (9.3, 78),
-                    (9.5, 76),
-                    (9.7, 74),
-                    (9.9, 72),
-                    (10.1, 70),
-                    (10.3, 68),
-                    (10.5, 66),
-                    (10.7, 64),
-                    (10.9, 62),
-                    (11.1, 60),
-                    (11.3, 50),
-                    (11.5, 40),
-                    (11.7, 30),
-                    (11.9, 20),
-                    (12.1, 10),
-                ],
-                "六年级": [
-                    (8.2, 100),
-                    (8.3, 95),
-                    (8.4, 90),
-                    (8.7, 85),
-                    (9.0, 80),
-                    (9.2, 78),
-                    (9.4, 76),
-                    (9.6, 74),
-                    (9.8, 72),
-                    (10.0, 70),
-                    (10.2, 68),
-                    (10.4, 66),
-                    (10.6, 64),
-                    (10.8, 62),
-                    (11.0, 60),
-                    (11.2, 50),
-                    (11.4, 40),
-                    (11.6, 30),
-                    (11.8, 20),
-                    (12.0, 10),
-                ],
-            },
-        }
-
-        # 坐位体前屈评分标准（表1-7、1-8）
-        self.sitreach_standards = {
-            "男": {
-                "一年级": [
-                    (16.1, 100),
-                    (14.6, 95),
-                    (13.0, 90),
-                    (12.0, 85),
-                    (11.0, 80),
-                    (9.9, 78),
-                    (8.8, 76),
-                    (7.7, 74),
-                    (6.6, 72),
-                    (5.5, 70),
-                    (4.4, 68),
-                    (3.3, 66),
-                    (2.2, 64),
-                    (1.1, 62),
-                    (0.0, 60),
-                    (-0.8, 50),
-                    (-1.6, 40),
-                    (-2.4, 30),
-                    (-3.2, 20),
-                    (-4.0, 10),
-                ],
-                "二年级": [
-                    (16.2, 100),
-                    (14.7, 95),
-                    (13.2, 90),
-                    (11.9, 85),
-                    (10.6, 80),
-                    (9.5, 78),
-                    (8.4, 76),
-                    (7.3, 74),
-                    (6.2, 72),
-                    (5.1, 70),
-                    (4.0, 68),
-                    (2.9, 66),
-                    (1.8, 64),
-                    (0.7, 62),
-                    (-0.4, 60),
-                    (-1.2, 50),
-                    (-2.0, 40),
-                    (-2.8, 30),
-                    (-3.6, 20),
-                    (-4.4, 10),
-                ],
-                "三年级": [
-                    (16.3, 100),
-                    (14.9, 95),
-                    (13.4, 90),
-                    (11.8, 85),
-                    (10.2, 80),
-                    (9.1, 78),
-                    (8.0, 76),
-                    (6.9, 74),
-                    (5.8, 72),
-                    (4.7, 70),
-                    (3.6, 68),
-                    (2.5, 66),
-                    (1.4, 64),
-                    (0.3, 62),
-                    (-0.8, 60),
-                    (-1.6, 50),
-                    (-2.4, 40),
-                    (-3.2, 30),
-                    (-4.0, 20),
-                    (-4.8, 10),
-                ],
-                "四年级": [
-                    (16.4, 100),
-                    (15.0, 95),
-                    (13.6, 90),
-                    (11.7, 85),
-                    (9.8, 80),
-                    (8.6, 78),
-                    (7.4, 76),
-                    (6.2, 74),
-                    (5.0, 72),
-                    (3.8, 70),
-                    (2.6, 68),
-                    (1.4, 66),
-                    (0.2, 64),
-                    (-1.0, 62),
-                    (-2.2, 60),
-                    (-3.2, 50),
-                    (-4.2, 40),
-                    (-5.2, 30),
-                    (-6.2, 20),
-                    (-7.2, 10),
-                ],
-                "五年级": [
-                    (16.5, 100),
-                    (15.2, 95),
-                    (13.8, 90),
-                    (11.6, 85),
-                    (9.4, 80),
-                    (8.2, 78),
-                    (7.0, 76),
-                    (5.8, 74),
-                    (4.6, 72),
-                    (3.4, 70),
-                    (2.2, 68),
-                    (1.0, 66),
-                    (-0.2, 64),
-                    (-1.4, 62),
-                    (-2.6, 60),
-                    (-3.6, 50),
-                    (-4.6, 40),
-                    (-5.6, 30),
-                    (-6.6, 20),
-                    (-7.6, 10),
-                ],
-                "六年级": [
-                    (16.6, 100),
-                    (15.3, 95),
-                    (14.0, 90),
-                    (11.5, 85),
-                    (9.0, 80),
-                    (7.7, 78),
-                    (6.4, 76),
-                    (5.1, 74),
-                    (3.8, 72),
-                    (2.5, 70),
-                    (1.2, 68),
-                    (-0.1, 66),
-                    (-1.4, 64),
-                    (-2.7, 62),
-                    (-4.0, 60),
-                    (-5.0, 50),
-                    (-6.0, 40),
-                    (-7.0, 30),
-                    (-8.0, 20),
-                    (-9.0, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (18.6, 100),
-                    (17.3, 95),
-                    (16.0, 90),
-                    (14.7, 85),
-                    (13.4, 80),
-                    (12.3, 78),
-                    (11.2, 76),
-                    (10.1, 74),
-                    (9.0, 72),
-                    (7.9, 70),
-                    (6.8, 68),
-                    (5.7, 66),
-                    (4.6, 64),
-                    (3.5, 62),
-                    (2.4, 60),
-                    (1.6, 50),
-                    (0.8, 40),
-                    (0.0, 30),
-                    (-0.8, 20),
-                    (-1.6, 10),
-                ],
-                "二年级": [
-                    (18.9, 100),
-                    (17.6, 95),
-                    (16.3, 90),
-                    (14.8, 85),
-                    (13.3, 80),
-                    (12.2, 78),
-                    (11.1, 76),
-                    (10.0, 74),
-                    (8.9, 72),
-                    (7.8, 70),
-                    (6.7, 68),
-                    (5.6, 66),
-                    (4.5, 64),
-                    (3.4, 62),
-                    (2.3, 60),
-                    (1.5, 50),
-                    (0.7, 40),
-                    (-0.1, 30),
-                    (-0.9, 20),
-                    (-1.7, 10),
-                ],
-                "三年级": [
-                    (19.2, 100),
-                    (17.9, 95),
-                    (16.6, 90),
-                    (14.9, 85),
-                    (13.2, 80),
-                    (12.1, 78),
-                    (11.0, 76),
-                    (9.9, 74),
-                    (8.8, 72),
-                    (7.7, 70),
-                    (6.6, 68),
-                    (5.5, 66),
-                    (4.4, 64),
-                    (3.3, 62),
-                    (2.2, 60),
-                    (1.4, 50),
-                    (0.6, 40),
-                    (-0.2, 30),
-                    (-1.0, 20),
-                    (-1.8, 10),
-                ],
-                "四年级": [
-                    (19.5, 100),
-                    (18.1, 95),
-                    (16.9, 90),
-                    (15.0, 85),
-                    (13.1, 80),
-                    (12.0, 78),
-                    (10.9, 76),
-                    (9.8, 74),
-                    (8.7, 72),
-                    (7.6, 70),
-                    (6.5, 68),
-                    (5.4, 66),
-                    (4.3, 64),
-                    (3.2, 62),
-                    (2.1, 60),
-                    (1.3, 50),
-                    (0.5, 40),
-                    (-0.3, 30),
-                    (-1.1, 20),
-                    (-1.9, 10),
-                ],
-                "五年级": [
-                    (19.8, 100),
-                    (18.5, 95),
-                    (17.2, 90),
-                    (15.1, 85),
-                    (13.0, 80),
-                    (11.9, 78),
-                    (10.8, 76),
-                    (9.7, 74),
-                    (8.6, 72),
-                    (7.5, 70),
-                    (6.4, 68),
-                    (5.3, 66),
-                    (4.2, 64),
-                    (3.1, 62),
-                    (2.0, 60),
-                    (1.2, 50),
-                    (0.4, 40),
-                    (-0.4, 30),
-                    (-1.2, 20),
-                    (-2.0, 10),
-                ],
-                "六年级": [
-                    (19.9, 100),
-                    (18.7, 95),
-                    (17.5, 90),
-                    (15.2, 85),
-                    (12.9, 80),
-                    (11.8, 78),
-                    (10.7, 76),
-                    (9.6, 74),
-                    (8.5, 72),
-                    (7.4, 70),
-                    (6.3, 68),
-                    (5.2, 66),
-                    (4.1, 64),
-                    (3.0, 62),
-                    (1.9, 60),
-                    (1.1, 50),
-                    (0.3, 40),
-                    (-0.5, 30),
-                    (-1.3, 20),
-                    (-2.1, 10),
-                ],
-            },
-        }
-        # 跳绳评分标准（表1-9、1-10）
-        self.rope_standards = {
-            "男": {
-                "一年级": [
-                    (109, 100),
-                    (104, 95),
-                    (99, 90),
-                    (93, 85),
-                    (87, 80),
-                    (80, 78),
-                    (73, 76),
-                    (66, 74),
-                    (59, 72),
-                    (52, 70),
-                    (45, 68),
-                    (38, 66),
-                    (31, 64),
-                    (24, 62),
-                    (17, 60),
-                    (14, 50),
-                    (11, 40),
-                    (8, 30),
-                    (5, 20),
-                    (2, 10),
-                ],
-                "二年级": [
-                    (117, 100),
-                    (112, 95),
-                    (107, 90),
-                    (101, 85),
-                    (95, 80),
-                    (88, 78),
-                    (81, 76),
-                    (74, 74),
-                    (67, 72),
-                    (60, 70),
-                    (53, 68),
-                    (46, 66),
-                    (39, 64),
-                    (32, 62),
-                    (25, 60),
-                    (22, 50),
-                    (19, 40),
-                    (16, 30),
-                    (13, 20),
-                    (10, 10),
-                ],
-                "三年级": [
-                    (126, 100),
-                    (121, 95),
-                    (116, 90),
-                    (110, 85),
-                    (104, 80),
-                    (97, 78),
-                    (90, 76),
-                    (83, 74),
-                    (76, 72),
-                    (69, 70),
-                    (62, 68),
-                    (55, 66),
-                    (48, 64),
-                    (41, 62),
-                    (34, 60),
-                    (31, 50),
-                    (28, 40),
-                    (25, 30),
-                    (22, 20),
-                    (19, 10),
-                ],
-                "四年级": [
-                    (137, 100),
-                    (132, 95),
-                    (127, 90),
-                    (121, 85),
-                    (115, 80),
-                    (108, 78),
-                    (101, 76),
-                    (94, 74),
-                    (87, 72),
-                    (80, 70),
-                    (73, 68),
-                    (66, 66),
-                    (59, 64),
-                    (52, 62),
-                    (45, 60),
-                    (42, 50),
-                    (39, 40),
-                    (36, 30),
-                    (33, 20),
-                    (30, 10),
-                ],
-                "五年级": [
-                    (148, 100),
-                    (143, 95),
-                    (138, 90),
-                    (132, 85),
-                    (126, 80),
-                    (119, 78),
-                    (112, 76),
-                    (105, 74),
-                    (98, 72),
-                    (91, 70),
-                    (84, 68),
-                    (77, 66),
-                    (70, 64),
-                    (63, 62),
-                    (56, 60),
-                    (53, 50),
-                    (50, 40),
-                    (47, 30),
-                    (44, 20),
-                    (41, 10),
-                ],
-                "六年级": [
-                    (157, 100),
-                    (152, 95),
-                    (147, 90),
-                    (141, 85),
-                    (135, 80),
-                    (128, 78),
-                    (121, 76),
-                    (114, 74),
-                    (107, 72),
-                    (100, 70),
-                    (93, 68),
-                    (86, 66),
-                    (79, 64),
-                    (72, 62),
-                    (65, 60),
-                    (62, 50),
-                    (59, 40),
-                    (56, 30),
-                    (53, 20),
-                    (50, 10),
-                ],
-            },
-            "女": {
-                "一年级": [
-                    (117, 100),
-                    (110, 95),
-                    (103, 90),
-                    (95, 85),
-                    (87, 80),
-                    (80, 78),
-                    (73, 76),
-                    (66, 74),
-                    (59, 72),
-                    (52, 70),
-                    (45, 68),
-                    (38, 66),
-                    (31, 64),
-                    (24, 62),
-                    (17, 60),
-                    (14, 50),
-                    (11, 40),
-                    (8, 30),
-                    (5, 20),
-                    (2, 10),
-                ],
-                "二年级": [
-                    (127, 100),
-                    (120, 95),
-                    (113, 90),
-                    (105, 85),
-                    (97, 80),
-                    (90, 78),
-                    (83, 76),
-                    (76, 74),
-                    (69, 72),
-                    (62, 70),
-                    (55, 68),
-                    (48, 66),
-                    (41, 64),
-                    (34, 62),
-                    (27, 60),
-                    (24, 50),
-                    (21, 40),
-                    (18, 30),
-                    (15, 20),
-                    (12, 10),
-                ],
-                "三年级": [
-                    (139, 100),
-                    (132, 95),
-                    (125, 90),
-                    (117, 85),
-                    (109, 80),
-                    (102, 78),
-                    (95, 76),
-                    (88, 74),
-                    (81, 72),
-                    (74, 70),
-                    (67, 68),
-                    (60, 66),
-                    (53, 64),
-                    (46, 62),
-                    (39, 60),
-                    (36, 50),
-                    (33, 40),
-                    (30, 30),
-                    (27, 20),
-                    (24, 10),
-                ],
-                "四年级": [
-                    (149, 100),
-                    (142, 95),
-                    (135, 90),
-                    (127, 85),
-                    (119, 80),
-                    (112, 78),
-                    (105, 76),
-                    (98, 74),
-                    (91, 72),
-                    (84, 70),
-                    (77, 68),
-                    (70, 66),
-                    (63, 64),
-                    (56, 62),
-                    (49, 60),
-                    (46, 50),
-                    (43, 40),
-                    (40, 30),
-                    (37, 20),
-                    (34, 10),
-                ],
-                "五年级": [
-                    (158, 100),
-                    (151, 95),
-                    (144, 90),
-                    (136, 85),
-                    (128, 80),
-                    (121, 78),
-                    (114, 76),
-                    (107, 74),
-                    (100, 72),
-                    (93, 70),
-                    (86, 68),
-                    (79, 66),
-                    (72, 64),
-                    (65, 62),
-                    (58, 60),
-                    (55, 50),
-                    (52, 40),
-                    (49, 30),
-                    (46, 20),
-                    (43, 10),
-                ],
-                "六年级": [
-                    (166, 100),
-                    (159, 95),
-                    (152, 90),
-                    (144, 85),
-                    (136, 80),
-                    (129, 78),
-                    (122, 76),
-                    (115, 74),
-                    (108, 72),
-                    (101, 70),
-                    (94, 68),
-                    (87, 66),
-                    (80, 64),
-                    (73, 62),
-                    (66, 60),
-                    (63, 50),
-                    (60, 40),
-                    (57, 30),
-                    (54, 20),
-                    (51, 10),
-                ],
-            },
-        }
-        # 仰卧起坐评分标准（表1-13、1-14）
-        self.situp_standards = {
-            "男": {
-                "三年级": [
-                    (48, 100),
-                    (45, 95),
-                    (42, 90),
-                    (39, 85),
-                    (36, 80),
-                    (34, 78),
-                    (32, 76),
-                    (30, 74),
-                    (28, 72),
-                    (26, 70),
-                    (24, 68),
-                    (22, 66),
-                    (20, 64),
-                    (18, 62),
-                    (16, 60),
-                    (14, 50),
-                    (12, 40),
-                    (10, 30),
-                    (8, 20),
-                    (6, 10),
-                ],
-                "四年级": [
-                    (49, 100),
-                    (46, 95),
-                    (43, 90),
-                    (40, 85),
-                    (37, 80),
-                    (35, 78),
-                    (33, 76),
-                    (31, 74),
-                    (29, 72),
-                    (27, 70),
-                    (25, 68),
-                    (23, 66),
-                    (21, 64),
-                    (19, 62),
-                    (17, 60),
-                    (15, 50),
-                    (13, 40),
-                    (11, 30),
-                    (9, 20),
-                    (7, 10),
-                ],
-                "五年级": [
-                    (50, 100),
-                    (47, 95),
-                    (44, 90),
-                    (41, 85),
-                    (38, 80),
-                    (36, 78),
-                    (34, 76),
-                    (32, 74),
-                    (30, 72),
-                    (28, 70),
-                    (26, 68),
-                    (24, 66),
-                    (22, 64),
-                    (20, 62),
-                    (18, 60),
-                    (16, 50),
-                    (14, 40),
-                    (12, 30),
-                    (10, 20),
-                    (8, 10),
-                ],
-                "六年级": [
-                    (51, 100),
-                    (48, 95),
-                    (45, 90),
-                    (42, 85),
-                    (39, 80),
-                    (37, 78),
-                    (35, 76),
-                    (33, 74),
-                    (31, 72),
-                    (29, 70),
-                    (27, 68),
-                    (25, 66),
-                    (23, 64),
-                    (21, 62),
-                    (19, 60),
-                    (17, 50),
-                    (15, 40),
-                    (13, 30),
-                    (11, 20),
-                    (9, 10),
-                ],
-            },
-            "女": {
-                "三年级": [
-                    (46, 100),
-                    (44, 95),
-                    (42, 90),
-                    (39, 85),
-                    (36, 80),
-                    (34, 78),
-                    (32, 76),
-                    (30, 74),
-                    (28, 72),
-                    (26, 70),
-                    (24, 68),
-                    (22, 66),
-                    (20, 64),
-                    (18, 62),
-                    (16, 60),
-                    (14, 50),
-                    (12, 40),
-                    (10, 30),
-                    (8, 20),
-                    (6, 10),
-                ],
-                "四年级": [
-                    (47, 100),
-                    (45, 95),
-                    (43, 90),
-                    (40, 85),
-                    (37, 80),
-                    (35, 78),
-                    (33, 76),
-                    (31, 74),
-                    (29, 72),
-                    (27, 70),
-                    (25, 68),
-                    (23, 66),
-                    (21, 64),
-                    (19, 62),
-                    (17, 60),
-                    (15, 50),
-                    (13, 40),
-                    (11, 30),
-                    (9, 20),
-                    (7, 10),
-                ],
-                "五年级": [
-                    (48, 100),
-                    (46, 95),
-                    (44, 90),
-                    (41, 85),
-                    (38, 80),
-                    (36, 78),
-                    (34, 76),
-                    (32, 74),
-                    (30, 72),
-                    (28, 70),
-                    (26, 68),
-                    (24, 66),
-                    (22, 64),
-                    (20, 62),
-                    (18, 60),
-                    (16, 50),
-                    (14, 40),
-                    (12, 30),
-                    (10, 20),
-                    (8, 10),
-                ],
-                "六年级": [
-                    (49, 100),
-                    (47, 95),
-                    (45, 90),
-                    (42, 85),
-                    (39, 80),
-                    (37, 78),
-                    (35, 76),
-                    (33, 74),
-                    (31, 72),
-                    (29, 70),
-                    (27, 68),
-                    (25, 66),
-                    (23, 64),
-                    (21, 62),
-                    (19, 60),
-                    (17, 50),
-                    (15, 40),
-                    (13, 30),
-                    (11, 20),
-                    (9, 10),
-                ],
-            },
-        }
-        # 50米×8往返跑评分标准（表1-15、1-16）- 时间转换为秒数，越少分数越高
-        self.run8_standards = {
-            "男": {
-                "五年级": [
-                    (96, 100),
-                    (99, 95),
-                    (102, 90),
-                    (105, 85),
-                    (108, 80),
-                    (111, 78),
-                    (114, 76),
-                    (117, 74),
-                    (120, 72),
-                    (123, 70),
-                    (126, 68),
-                    (129, 66),
-                    (132, 64),
-                    (135, 62),
-                    (138, 60),
-                    (142, 50),
-                    (146, 40),
-                    (150, 30),
-                    (154, 20),
-                    (158, 10),
-                ],
-                "六年级": [
-                    (90, 100),
-                    (93, 95),
-                    (96, 90),
-                    (99, 85),
-                    (102, 80),
-                    (105, 78),
-                    (108, 76),
-                    (111, 74),
-                    (114, 72),
-                    (117, 70),
-                    (120, 68),
-                    (123, 66),
-                    (126, 64),
-                    (129, 62),
-                    (132, 60),
-                    (136, 50),
-                    (140, 40),
-                    (144, 30),
-                    (148, 20),
-                    (152, 10),
-                ],
-            },
-            "女": {
-                "五年级": [
-                    (101, 100),
-                    (104, 95),
-                    (107, 90),
-                    (110, 85),
-                    (113, 80),
-                    (116, 78),
-                    (119, 76),
-                    (122, 74),
-                    (125, 72),
-                    (128, 70),
-                    (131, 68),
-                    (134, 66),
-                    (137, 64),
-                    (140, 62),
-                    (143, 60),
-                    (147, 50),
-                    (151, 40),
-                    (155, 30),
-                    (159, 20),
-                    (163, 10),
-                ],
-                "六年级": [
-                    (97, 100),
-                    (100, 95),
-                    (103, 90),
-                    (106, 85),
-                    (109, 80),
-                    (112, 78),
-                    (115, 76),
-                    (118, 74),
-                    (121, 72),
-                    (124, 70),
-                    (127, 68),
-                    (130, 66),
-                    (133, 64),
-                    (136, 62),
-                    (139, 60),
-                    (143, 50),
-                    (147, 40),
-                    (151, 30),
-                    (155, 20),
-                    (159, 10),
-                ],
-            },
-        }
-
-    def get_score_from_table(self, value, standards_table, reverse=False):
-        """根据评分表获取分数"""
-        if pd.isna(value):
-            return np.nan
-
-        for threshold, score in standards_table:
-            if reverse:  # 对于时间类项目，数值越小分数越高
-                if value <= threshold:
-                    return score
-            else:  # 对于其他项目，数值越大分数越高
-                if value >= threshold:
-                    return score
-
-        # 如果都不满足，返回最低分
-        return standards_table[-1][1]
-
-    def get_bmi_score_and_grade(self, bmi, gender, grade):
-        """获取BMI分数和等级"""
-        if pd.isna(bmi) or grade not in self.bmi_standards.get(gender, {}):
-            return np.nan, "未测"
-
-        standards = self.bmi_standards[gender][grade]
-
-        if standards["正常"][0] <= bmi <= standards["正常"][1]:
-            return 100, "正常"
-        elif bmi <= standards["低体重"][1]:
-            return 80, "低体重"
-        elif standards["超重"][0] <= bmi <= standards["超重"][1]:
-            return 80, "超重"
-        elif bmi >= standards["肥胖"][0]:
-            return 60, "肥胖"
-        else:
-            return 80, "正常"  # 默认
+        # 各项评分表（BMI、肺活量、50米跑、坐位体前屈、跳绳、仰卧起坐、往返跑）
+        # 统一从 backend/src/data/persistent 下的评分表编译加载
+        self.standards = load_standards()
 
-    def calculate_bmi(self, height_cm, weight_kg):
-        """计算BMI"""
-        if pd.isna(height_cm) or pd.isna(weight_kg) or height_cm <= 0 or weight_kg <= 0:
-            return np.nan
-        height_m = height_cm / 100
-        return round(weight_kg / (height_m * height_m), 1)
+        # 批量评分引擎
+        self.scoring_engine = ScoringEngine(self)
 
     def extract_grade_from_class(self, class_name):
         """从班级名称中提取年级"""
-        if "六年级" in class_name:
-            return "六年级"
-        elif "五年级" in class_name:
-            return "五年级"
-        elif "四年级" in class_name:
-            return "四年级"
-        elif "三年级" in class_name:
-            return "三年级"
-        elif "二年级" in class_name:
-            return "二年级"
-        elif "一年级" in class_name:
-            return "一年级"
-        else:
-            return "未知年级"
-
-    def convert_time_to_seconds(self, time_str):
-        """将时间字符串转换为秒数"""
-        if pd.isna(time_str):
-            return np.nan
+        return extract_grade(class_name, missing="未知年级")
 
-        try:
-            # 处理可能的时间格式
-            time_str = str(time_str).strip()
-            if ":" in time_str:
-                parts = time_str.split(":")
-                minutes = float(parts[0])
-                seconds = float(parts[1])
-                return minutes * 60 + seconds
-            else:
-                return float(time_str)
-        except:
-            return np.nan
+    def is_target_class(self, class_name):
+        """班级是否属于参与评分的年级（读取成绩文件时的行过滤条件）"""
+        return self.extract_grade_from_class(class_name) in self.target_grades
 
-    def calculate_all_scores_by_standards(self, df):
-        """根据国家标准计算所有项目得分"""
+    def calculate_all_scores_by_standards(self, df, grades=None):
+        """根据国家标准计算所有项目得分，grades 为参与评分的年级（默认 target_grades）"""
         print("根据国家标准计算各项目得分...")
 
         # 计算BMI
-        df["BMI"] = df.apply(
-            lambda row: self.calculate_bmi(row["身高(cm)"], row["体重(kg)"]), axis=1
-        )
+        df["BMI"] = self.scoring_engine.bmi_values(df["身高(cm)"], df["体重(kg)"])
 
         # 如果已有年级列，直接使用；否则从班级名称提取
         if "年级" not in df.columns:
-            df["年级"] = df["班级名称"].apply(self.extract_grade_from_class)
+            df["年级"] = grade_column(df["班级名称"], missing="未知年级")
         else:
             # 年级列已存在，确保数据一致性
             pass
@@ -1617,235 +159,32 @@ class NationalStandardConverter:
         df["BMI得分"] = np.nan
         df["BMI等级"] = "未测"
         df["肺活量得分"] = np.nan
-        df["肺活量等级"] = "未测"
+        df["肺活量等级"] = self.scoring_engine.untested_levels(df)
         df["50米跑得分"] = np.nan
-        df["50米跑等级"] = "未测"
+        df["50米跑等级"] = self.scoring_engine.untested_levels(df)
         df["坐位体前屈得分"] = np.nan
-        df["坐位体前屈等级"] = "未测"
+        df["坐位体前屈等级"] = self.scoring_engine.untested_levels(df)
         df["跳绳得分"] = np.nan
-        df["跳绳等级"] = "未测"
+        df["跳绳等级"] = self.scoring_engine.untested_levels(df)
         df["仰卧起坐得分"] = np.nan
-        df["仰卧起坐等级"] = "未测"
+        df["仰卧起坐等级"] = self.scoring_engine.untested_levels(df)
         df["往返跑得分"] = np.nan
-        df["往返跑等级"] = "未测"
+        df["往返跑等级"] = self.scoring_engine.untested_levels(df)
         df["附加分"] = 0
 
-        # 按年级和性别分组计算 - 只处理四年级和六年级
-        for grade in ["四年级", "六年级"]:
-            for gender in ["男", "女"]:
-                mask = (df["年级"] == grade) & (df["性别"] == gender)
-                if not mask.any():
-                    continue
-
-                print(f"计算{grade}{gender}学生得分...")
-
-                # BMI评分
-                for idx in df[mask].index:
-                    bmi = df.loc[idx, "BMI"]
-                    score, grade_level = self.get_bmi_score_and_grade(
-                        bmi, gender, grade
-                    )
-                    df.loc[idx, "BMI得分"] = score
-                    df.loc[idx, "BMI等级"] = grade_level
-
-                # 肺活量评分
-                if (
-                    gender in self.lung_standards
-                    and grade in self.lung_standards[gender]
-                ):
-                    standards = self.lung_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = df.loc[idx, "肺活量(ml)"]
-                        score = self.get_score_from_table(
-                            value, standards, reverse=False
-                        )
-                        df.loc[idx, "肺活量得分"] = score
-                        df.loc[idx, "肺活量等级"] = self.get_grade_from_score(score)
-
-                # 50米跑评分
-                if (
-                    gender in self.run50_standards
-                    and grade in self.run50_standards[gender]
-                ):
-                    standards = self.run50_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = df.loc[idx, "50米跑(s)"]
-                        # 数据有效性检查：如果为空值，得分留空，等级为'未测'
-                        if pd.isna(value):
-                            score = np.nan
-                            grade_level = "未测"
-                        elif value <= 0 or value > 60:
-                            score = 0  # 无效数据给0分
-                            grade_level = self.get_grade_from_score(score)
-                        else:
-                            score = self.get_score_from_table(
-                                value, standards, reverse=True
-                            )
-                            grade_level = self.get_grade_from_score(score)
-                        df.loc[idx, "50米跑得分"] = score
-                        df.loc[idx, "50米跑等级"] = grade_level
-
-                # 坐位体前屈评分
-                if (
-                    gender in self.sitreach_standards
-                    and grade in self.sitreach_standards[gender]
-                ):
-                    standards = self.sitreach_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = df.loc[idx, "坐位体前屈(cm)"]
-                        score = self.get_score_from_table(
-                            value, standards, reverse=False
-                        )
-                        df.loc[idx, "坐位体前屈得分"] = score
-                        df.loc[idx, "坐位体前屈等级"] = self.get_grade_from_score(score)
-
-                # 跳绳评分
-                if (
-                    gender in self.rope_standards
-                    and grade in self.rope_standards[gender]
-                ):
-                    standards = self.rope_standards[gender][grade]
-                    for idx in df[mask].index:
-                        value = df.loc[idx, "一分钟跳绳(个）"]
-                        score = self.get_score_from_table(
-                            value, standards, reverse=False
-                        )
-                        df.loc[idx, "跳绳得分"] = score
-                        df.loc[idx, "跳绳等级"] = self.get_grade_from_score(score)
-
-                        # 计算跳绳加分（小学跳绳为加分项目）
-                        if pd.notna(score) and score == 100:
-                            # 如果达到100分，计算超出部分的加分
-                            max_standard = standards[0][0]  # 100分对应的次数
-                            if pd.notna(value) and value > max_standard:
-                                # 按照加分表计算，每超出一定次数给对应加分
-                                extra_count = value - max_standard
-                                # 跳绳加分标准（根据国家标准）
-                                # 跳绳加分：每超出2个给1分，最高20分
-                                bonus_score = min(20, extra_count // 2)
-                                df.loc[idx, "附加分"] = bonus_score
-
-                # 仰卧起坐评分（三年级及以上）
-                if grade in ["三年级", "四年级", "五年级", "六年级"]:
-                    if (
-                        gender in self.situp_standards
-                        and grade in self.situp_standards[gender]
-                    ):
-                        standards = self.situp_standards[gender][grade]
-                        for idx in df[mask].index:
-                            value = df.loc[idx, "一分钟仰卧起坐(个)"]
-                            score = self.get_score_from_table(
-                                value, standards, reverse=False
-                            )
-                            df.loc[idx, "仰卧起坐得分"] = score
-                            df.loc[idx, "仰卧起坐等级"] = self.get_grade_from_score(
-                                score
-                            )
-
-                # 50米×8往返跑评分（五六年级）
-                if grade in ["五年级", "六年级"]:
-                    if (
-                        gender in self.run8_standards
-                        and grade in self.run8_standards[gender]
-                    ):
-                        standards = self.run8_standards[gender][grade]
-                        for idx in df[mask].index:
-                            value = df.loc[idx, "50米×8往返跑(s)"]
-                            if pd.notna(value):
-                                # 如果是时间格式，转换为秒数
-                                seconds = self.convert_time_to_seconds(value)
-                                # 数据有效性检查：往返跑时间必须在合理范围内（30-300秒）
-                                if pd.isna(seconds) or seconds <= 0 or seconds > 300:
-                                    score = 0  # 无效数据给0分
-                                else:
-                                    score = self.get_score_from_table(
-                                        seconds, standards, reverse=True
-                                    )
-                                df.loc[idx, "往返跑得分"] = score
-                                df.loc[idx, "往返跑等级"] = self.get_grade_from_score(
-                                    score
-                                )
+        # 按(年级, 性别)一次分组，批量计算BMI和各单项得分
+        self.scoring_engine.score_all(df, grades or self.target_grades)
 
     def get_grade_from_score(self, score):
         """根据分数获取等级"""
-        if pd.isna(score):
-            return "未测"
-        elif score >= 90:
-            return "优秀"
-        elif score >= 80:
-            return "良好"
-        elif score >= 60:
-            return "及格"
-        else:
-            return "不及格"
+        return self.standards.levels([score])[0]
 
     def calculate_comprehensive_score(self, df):
         """根据国家标准权重计算综合得分"""
         print("计算综合得分...")
 
-        df["标准分"] = 0
-
-        for idx, row in df.iterrows():
-            grade = row["年级"]
-            if grade not in self.weights:
-                continue
-
-            weights = self.weights[grade]
-            total_score = 0
-
-            # 根据年级计算加权总分
-            if pd.notna(row["BMI得分"]):
-                total_score += row["BMI得分"] * weights.get("BMI", 0)
-
-            if pd.notna(row["肺活量得分"]):
-                total_score += row["肺活量得分"] * weights.get("肺活量", 0)
-
-            if pd.notna(row["50米跑得分"]):
-                total_score += row["50米跑得分"] * weights.get("50米跑", 0)
-
-            if pd.notna(row["坐位体前屈得分"]):
-                total_score += row["坐位体前屈得分"] * weights.get("坐位体前屈", 0)
-
-            if pd.notna(row["跳绳得分"]):
-                total_score += row["跳绳得分"] * weights.get("跳绳", 0)
-
-            if grade in ["三年级", "四年级", "五年级", "六年级"] and pd.notna(
-                row["仰卧起坐得分"]
-            ):
-                total_score += row["仰卧起坐得分"] * weights.get("仰卧起坐", 0)
-
-            if grade in ["五年级", "六年级"] and pd.notna(row["往返跑得分"]):
-                total_score += row["往返跑得分"] * weights.get("往返跑", 0)
-
-            df.loc[idx, "标准分"] = round(total_score, 1)
-
-        # 综合得分 = 标准分 + 附加分
-        df["综合得分"] = df["标准分"] + df["附加分"]
-
-        # 设置综合等级，如果所有测试项目都没有参与则为'未测'
-        def get_comprehensive_grade(row):
-            # 检查主要测试项目是否都为空（BMI、肺活量、50米跑、坐位体前屈、跳绳）
-            main_scores = [
-                row["BMI得分"],
-                row["肺活量得分"],
-                row["50米跑得分"],
-                row["坐位体前屈得分"],
-                row["跳绳得分"],
-            ]
-            # 对于三年级及以上还要检查仰卧起坐
-            if row["年级"] in ["三年级", "四年级", "五年级", "六年级"]:
-                main_scores.append(row["仰卧起坐得分"])
-            # 对于五六年级还要检查往返跑
-            if row["年级"] in ["五年级", "六年级"]:
-                main_scores.append(row["往返跑得分"])
-
-            # 如果所有主要项目都是空值，则为'未测'
-            if all(pd.isna(score) for score in main_scores):
-                return "未测"
-            else:
-                return self.get_grade_from_score(row["综合得分"])
-
-        df["综合等级"] = df.apply(get_comprehensive_grade, axis=1)
+        # 得分矩阵 × 年级权重矩阵，一次性计算标准分、综合得分和综合等级
+        self.scoring_engine.score_comprehensive(df)
 
     def calculate_statistics(self, df):
         """计算统计数据"""
@@ -1967,57 +306,104 @@ class NationalStandardConverter:
     def convert_single_file_to_school_format(self, input_file, output_file):
         """将单个Excel文件转换为学校格式"""
         print("=== 开始转换Excel文件（基于国家标准）===")
-        print("只处理四年级和六年级的数据")
+        print(f"只处理{'、'.join(self.target_grades)}的数据")
 
         print(f"正在读取: {input_file}")
 
         try:
-            df = pd.read_excel(input_file, sheet_name=0)
-            print(f"读取到 {len(df)} 条数据")
+            df = self.read_student_data(input_file)
+
+            df_clean, _ = self.convert_dataframe_to_school_format(
+                df, output_file, source_file=input_file
+            )
+
+            print(f"转换完成，输出文件: {output_file}")
+            return df_clean
+
+        except Exception as e:
+            print(f"读取文件出错: {str(e)}")
+            raise
 
-            # 列名映射以适应新的Excel格式
-            column_mapping = {"学籍号": "学号"}
+    def read_student_data(self, input_file):
+        """只读取评分用到的列和参与评分年级的行"""
+        df = read_excel_rows(
+            input_file,
+            columns=ScoringEngine.INPUT_COLUMNS,
+            filters={"班级名称": self.is_target_class},
+        )
+        print(
+            f"读取到 {len(df)} 条{'、'.join(self.target_grades)}数据"
+            f"（共 {df.attrs['rows_read']} 条）"
+        )
+        return df
 
-            # 应用列名映射
-            df = df.rename(columns=column_mapping)
+    def prepare_student_data(self, df):
+        """清理数据、过滤年级并按国家标准计算得分，返回评分后的学生数据"""
+        # 列名映射以适应新的Excel格式
+        column_mapping = {"学籍号": "学号"}
 
-            # 数据清理（只检查姓名）
-            df_clean = df.dropna(subset=["姓名"])
-            print(f"清理后剩余 {len(df_clean)} 条有效数据")
+        # 应用列名映射
+        df = df.rename(columns=column_mapping)
 
-            # 添加年级信息并过滤只保留四年级和六年级
-            df_clean["年级"] = df_clean["班级名称"].apply(self.extract_grade_from_class)
-            target_grades = ["四年级", "六年级"]
-            df_clean = df_clean[df_clean["年级"].isin(target_grades)]
-            print(f"过滤后剩余 {len(df_clean)} 条四年级和六年级数据")
+        # 数据清理（只检查姓名）
+        df_clean = df.dropna(subset=["姓名"])
+        print(f"清理后剩余 {len(df_clean)} 条有效数据")
 
-            # 根据国家标准计算得分
-            self.calculate_all_scores_by_standards(df_clean)
+        # 添加年级信息并过滤只保留参与评分的年级
+        df_clean["年级"] = grade_column(df_clean["班级名称"], missing="未知年级")
+        df_clean = df_clean[df_clean["年级"].isin(self.target_grades)]
+        print(f"过滤后剩余 {len(df_clean)} 条{'、'.join(self.target_grades)}数据")
 
-            # 计算综合得分
-            self.calculate_comprehensive_score(df_clean)
+        # 评分时按身高体重重新计算BMI，成绩文件原有的BMI另存一列，
+        # 供沿用评分结果的 form_and_class.py 按其规则使用
+        if "BMI" in df_clean.columns:
+            df_clean[ScoringEngine.SOURCE_BMI_COLUMN] = df_clean["BMI"]
 
-            # 生成学校格式的Excel
-            self.generate_school_format_excel(df_clean, output_file)
+        # 根据国家标准计算得分
+        self.calculate_all_scores_by_standards(df_clean)
 
-            print(f"转换完成，输出文件: {output_file}")
+        # 计算综合得分
+        self.calculate_comprehensive_score(df_clean)
 
-        except Exception as e:
-            print(f"读取文件出错: {str(e)}")
-            raise
+        return df_clean
+
+    def convert_dataframe_to_school_format(self, df, output_file, source_file=None):
+        """将已读取的成绩数据转换为学校格式
+
+        返回 (评分后的学生数据, 总表学生数据)，供 run_all.py 流水线模式直接传给后续步骤；
+        source_file 为成绩数据的来源文件，评分缓存以其内容哈希判断是否失效
+        """
+        df_clean = self.prepare_student_data(df)
+
+        # 生成学校格式的Excel
+        school_table = self.generate_school_format_excel(df_clean, output_file)
+
+        # 保存评分缓存，后续步骤无需重新读取Excel
+        save_scored_cache(
+            output_file,
+            source_file,
+            self.target_grades,
+            df_clean,
+            school_table,
+            standards_hash=self.standards.source_hash,
+        )
+
+        return df_clean, school_table
 
     def generate_school_format_excel(self, df, output_file):
-        """生成学校格式的Excel文件"""
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment
+        """生成学校格式的Excel文件
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "小学"
+        使用 RowWriter 按行顺序写入：列宽、合并单元格和表头样式在写入前声明，
+        写出的行不再保留在内存中
+        """
+        ws = RowWriter(output_file, "小学")
 
         # 计算统计数据
         stats = self.calculate_statistics(df)
 
+        # 应用格式化（须在写入数据之前设置）
+        self.apply_formatting(ws)
+
         # 添加表头信息（前7行）
         self.add_header_info(ws, stats)
 
@@ -2025,304 +411,269 @@ class NationalStandardConverter:
         self.add_student_data_header(ws)
 
         # 添加学生数据（从第9行开始）
-        self.add_student_data(ws, df)
-
-        # 应用格式化
-        self.apply_formatting(ws)
+        school_table = self.build_school_table(df)
+        self.add_student_data(ws, school_table)
 
         # 保存文件
-        wb.save(output_file)
+        ws.close()
+        return school_table
 
     def add_header_info(self, ws, stats):
-        """添加前7行的统计信息"""
+        """添加前7行的统计信息，第1到6行全部居中和粗体"""
+        from openpyxl.utils.cell import coordinate_to_tuple
+
+        header_style = STYLES["bold_center"]
+
+        # 前6行的34列（含空单元格）都设置样式
+        rows = [[None] * len(self.STUDENT_DATA_HEADERS) for _ in range(6)]
+        for coordinate, value in self.header_cells(stats).items():
+            row, col = coordinate_to_tuple(coordinate)
+            rows[row - 1][col - 1] = value
+
+        for values in rows:
+            ws.append(values, header_style)
+
+        # 第7行留空
+        ws.append([])
+
+    def header_cells(self, stats):
+        """前6行统计信息的单元格内容 {坐标: 值}"""
+        cells = {}
         # 第1行：基本信息
-        ws["A1"] = "单位名称："
-        ws["B1"] = "平谷区第十一小学学生体质健康测试成绩（校内）"
-        ws["F1"] = "体质测定日期："
-        ws["G1"] = "2025/09/23-2025/09/24"
-        ws["K1"] = "各单项实查评价人数统计"
-        ws["L1"] = "等级"
-        ws["N1"] = "评分a"
-        ws["P1"] = "体重指数（BMI）"
-        ws["Q1"] = "肺活量"
-        ws["R1"] = "50米跑"
-        ws["S1"] = "坐位体前屈"
-        ws["T1"] = "一分钟跳绳"
-        ws["U1"] = "一分钟仰卧起坐"
-        ws["V1"] = "50米×8往返跑"
-        ws["W1"] = "综合等级"
+        cells["A1"] = "单位名称："
+        cells["B1"] = "平谷区第十一小学学生体质健康测试成绩（校内）"
+        cells["F1"] = "体质测定日期："
+        cells["G1"] = "2025/09/23-2025/09/24"
+        cells["K1"] = "各单项实查评价人数统计"
+        cells["L1"] = "等级"
+        cells["N1"] = "评分a"
+        cells["P1"] = "体重指数（BMI）"
+        cells["Q1"] = "肺活量"
+        cells["R1"] = "50米跑"
+        cells["S1"] = "坐位体前屈"
+        cells["T1"] = "一分钟跳绳"
+        cells["U1"] = "一分钟仰卧起坐"
+        cells["V1"] = "50米×8往返跑"
+        cells["W1"] = "综合等级"
 
         # 第2行：性别分类和等级说明
-        ws["B2"] = "男"
-        ws["C2"] = "女"
-        ws["D2"] = "总人数"
-        ws["E2"] = "综合等级"
-        ws["F2"] = "评分a"
-        ws["G2"] = "男"
-        ws["H2"] = "女"
-        ws["I2"] = "合计"
-        ws["J2"] = "占比率%"
-        ws["L2"] = "一级（优秀）"
-        ws["N2"] = "a ≥ 90.0 分"
-        ws["P2"] = stats["BMI_excellent"]
-        ws["Q2"] = stats["肺活量_excellent"]
-        ws["R2"] = stats["50米跑_excellent"]
-        ws["S2"] = stats["坐位体前屈_excellent"]
-        ws["T2"] = stats["跳绳_excellent"]
-        ws["U2"] = stats["仰卧起坐_excellent"]
-        ws["V2"] = stats["往返跑_excellent"]
-        ws["W2"] = stats["excellent_total"]
+        cells["B2"] = "男"
+        cells["C2"] = "女"
+        cells["D2"] = "总人数"
+        cells["E2"] = "综合等级"
+        cells["F2"] = "评分a"
+        cells["G2"] = "男"
+        cells["H2"] = "女"
+        cells["I2"] = "合计"
+        cells["J2"] = "占比率%"
+        cells["L2"] = "一级（优秀）"
+        cells["N2"] = "a ≥ 90.0 分"
+        cells["P2"] = stats["BMI_excellent"]
+        cells["Q2"] = stats["肺活量_excellent"]
+        cells["R2"] = stats["50米跑_excellent"]
+        cells["S2"] = stats["坐位体前屈_excellent"]
+        cells["T2"] = stats["跳绳_excellent"]
+        cells["U2"] = stats["仰卧起坐_excellent"]
+        cells["V2"] = stats["往返跑_excellent"]
+        cells["W2"] = stats["excellent_total"]
 
         # 第3行：应查人数
-        ws["A3"] = "应查人数"
-        ws["B3"] = stats["male_count"]
-        ws["C3"] = stats["female_count"]
-        ws["D3"] = stats["total_count"]
-        ws["E3"] = "一级（优秀）"
-        ws["F3"] = "a ≥ 90.0 分"
-        ws["G3"] = stats["excellent_male"]
-        ws["H3"] = stats["excellent_female"]
-        ws["I3"] = stats["excellent_total"]
-        ws["J3"] = stats.get("excellent_ratio", "0%")
-        ws["L3"] = "二级（良好）"
-        ws["N3"] = "80.0 分≤a< 90.0分"
-        ws["P3"] = stats["BMI_good"]
-        ws["Q3"] = stats["肺活量_good"]
-        ws["R3"] = stats["50米跑_good"]
-        ws["S3"] = stats["坐位体前屈_good"]
-        ws["T3"] = stats["跳绳_good"]
-        ws["U3"] = stats["仰卧起坐_good"]
-        ws["V3"] = stats["往返跑_good"]
-        ws["W3"] = stats["good_total"]
+        cells["A3"] = "应查人数"
+        cells["B3"] = stats["male_count"]
+        cells["C3"] = stats["female_count"]
+        cells["D3"] = stats["total_count"]
+        cells["E3"] = "一级（优秀）"
+        cells["F3"] = "a ≥ 90.0 分"
+        cells["G3"] = stats["excellent_male"]
+        cells["H3"] = stats["excellent_female"]
+        cells["I3"] = stats["excellent_total"]
+        cells["J3"] = stats.get("excellent_ratio", "0%")
+        cells["L3"] = "二级（良好）"
+        cells["N3"] = "80.0 分≤a< 90.0分"
+        cells["P3"] = stats["BMI_good"]
+        cells["Q3"] = stats["肺活量_good"]
+        cells["R3"] = stats["50米跑_good"]
+        cells["S3"] = stats["坐位体前屈_good"]
+        cells["T3"] = stats["跳绳_good"]
+        cells["U3"] = stats["仰卧起坐_good"]
+        cells["V3"] = stats["往返跑_good"]
+        cells["W3"] = stats["good_total"]
 
         # 第4行：实查人数
-        ws["A4"] = "实查人数"
-        ws["B4"] = stats["tested_male"]
-        ws["C4"] = stats["tested_female"]
-        ws["D4"] = stats["tested_total"]
-        ws["E4"] = "二级（良好）"
-        ws["F4"] = "80.0 分≤a< 90.0分"
-        ws["G4"] = stats["good_male"]
-        ws["H4"] = stats["good_female"]
-        ws["I4"] = stats["good_total"]
-        ws["J4"] = stats.get("good_ratio", "0%")
-        ws["L4"] = "三级（及格）"
-        ws["N4"] = "60.0 分≤a< 80.0分"
-        ws["P4"] = stats["BMI_pass"]
-        ws["Q4"] = stats["肺活量_pass"]
-        ws["R4"] = stats["50米跑_pass"]
-        ws["S4"] = stats["坐位体前屈_pass"]
-        ws["T4"] = stats["跳绳_pass"]
-        ws["U4"] = stats["仰卧起坐_pass"]
-        ws["V4"] = stats["往返跑_pass"]
-        ws["W4"] = stats["pass_total"]
+        cells["A4"] = "实查人数"
+        cells["B4"] = stats["tested_male"]
+        cells["C4"] = stats["tested_female"]
+        cells["D4"] = stats["tested_total"]
+        cells["E4"] = "二级（良好）"
+        cells["F4"] = "80.0 分≤a< 90.0分"
+        cells["G4"] = stats["good_male"]
+        cells["H4"] = stats["good_female"]
+        cells["I4"] = stats["good_total"]
+        cells["J4"] = stats.get("good_ratio", "0%")
+        cells["L4"] = "三级（及格）"
+        cells["N4"] = "60.0 分≤a< 80.0分"
+        cells["P4"] = stats["BMI_pass"]
+        cells["Q4"] = stats["肺活量_pass"]
+        cells["R4"] = stats["50米跑_pass"]
+        cells["S4"] = stats["坐位体前屈_pass"]
+        cells["T4"] = stats["跳绳_pass"]
+        cells["U4"] = stats["仰卧起坐_pass"]
+        cells["V4"] = stats["往返跑_pass"]
+        cells["W4"] = stats["pass_total"]
 
         # 第5行：实查比率
-        ws["A5"] = "实查比率%"
-        ws["B5"] = stats["male_ratio"]
-        ws["C5"] = stats["female_ratio"]
-        ws["D5"] = stats["total_ratio"]
-        ws["E5"] = "三级（及格）"
-        ws["F5"] = "60.0 分≤a< 80.0分"
-        ws["G5"] = stats["pass_male"]
-        ws["H5"] = stats["pass_female"]
-        ws["I5"] = stats["pass_total"]
-        ws["J5"] = stats.get("pass_ratio", "0%")
-        ws["L5"] = "四级（不及格）"
-        ws["N5"] = "a < 60.0 分"
-        ws["P5"] = stats["BMI_fail"]
-        ws["Q5"] = stats["肺活量_fail"]
-        ws["R5"] = stats["50米跑_fail"]
-        ws["S5"] = stats["坐位体前屈_fail"]
-        ws["T5"] = stats["跳绳_fail"]
-        ws["U5"] = stats["仰卧起坐_fail"]
-        ws["V5"] = stats["往返跑_fail"]
-        ws["W5"] = stats["fail_total"]
+        cells["A5"] = "实查比率%"
+        cells["B5"] = stats["male_ratio"]
+        cells["C5"] = stats["female_ratio"]
+        cells["D5"] = stats["total_ratio"]
+        cells["E5"] = "三级（及格）"
+        cells["F5"] = "60.0 分≤a< 80.0分"
+        cells["G5"] = stats["pass_male"]
+        cells["H5"] = stats["pass_female"]
+        cells["I5"] = stats["pass_total"]
+        cells["J5"] = stats.get("pass_ratio", "0%")
+        cells["L5"] = "四级（不及格）"
+        cells["N5"] = "a < 60.0 分"
+        cells["P5"] = stats["BMI_fail"]
+        cells["Q5"] = stats["肺活量_fail"]
+        cells["R5"] = stats["50米跑_fail"]
+        cells["S5"] = stats["坐位体前屈_fail"]
+        cells["T5"] = stats["跳绳_fail"]
+        cells["U5"] = stats["仰卧起坐_fail"]
+        cells["V5"] = stats["往返跑_fail"]
+        cells["W5"] = stats["fail_total"]
 
         # 第6行
-        ws["E6"] = "四级（不及格）"
-        ws["F6"] = "a < 60.0 分"
-        ws["G6"] = stats["fail_male"]
-        ws["H6"] = stats["fail_female"]
-        ws["I6"] = stats["fail_total"]
-        ws["J6"] = stats.get("fail_ratio", "0%")
-        ws["L6"] = "单项实查人数合计"
-        ws["P6"] = stats["bmi_tested"]
-        ws["Q6"] = stats["lung_tested"]
-        ws["R6"] = stats["run50_tested"]
-        ws["S6"] = stats["sitreach_tested"]
-        ws["T6"] = stats["rope_tested"]
-        ws["U6"] = stats["situp_tested"]
-        ws["V6"] = stats["run8_tested"]
-        ws["W6"] = stats["tested_total"]
-
-        # 第7行留空
+        cells["E6"] = "四级（不及格）"
+        cells["F6"] = "a < 60.0 分"
+        cells["G6"] = stats["fail_male"]
+        cells["H6"] = stats["fail_female"]
+        cells["I6"] = stats["fail_total"]
+        cells["J6"] = stats.get("fail_ratio", "0%")
+        cells["L6"] = "单项实查人数合计"
+        cells["P6"] = stats["bmi_tested"]
+        cells["Q6"] = stats["lung_tested"]
+        cells["R6"] = stats["run50_tested"]
+        cells["S6"] = stats["sitreach_tested"]
+        cells["T6"] = stats["rope_tested"]
+        cells["U6"] = stats["situp_tested"]
+        cells["V6"] = stats["run8_tested"]
+        cells["W6"] = stats["tested_total"]
+
+        return cells
 
     def add_student_data_header(self, ws):
         """添加第8行学生数据表头"""
-        headers = [
-            "年级编号",
-            "班名",
-            "学号",
-            "姓名",
-            "性别",
-            "身高（cm)",
-            "体重（kg)",
-            "体重指数BMI\n（千克/米2）",
-            "得分",
-            "等级",
-            "肺活量（毫升）",
-            "得分",
-            "等级",
-            "50米跑（秒）",
-            "得分",
-            "等级",
-            "坐位体前屈(cm)",
-            "得分",
-            "等级",
-            "一分钟跳绳（次）",
-            "得分",
-            "加分",
-            "等级",
-            "一分钟仰卧起坐（次）",
-            "得分",
-            "等级",
-            "50米*8往返跑（分.秒）",
-            "得分",
-            "等级",
-            "标准分",
-            "附加分",
-            "综合得分",
-            "综合评级",
-            "备注",
-        ]
+        ws.append(self.STUDENT_DATA_HEADERS)
 
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=8, column=col, value=header)
+    def build_school_table(self, df):
+        """按总表第9行起的列顺序整理学生数据，按年级、班号、学号排序
 
-    def add_student_data(self, ws, df):
-        """添加学生数据（从第9行开始）"""
-        # 定义年级排序顺序
-        grade_order = ["一年级", "二年级", "三年级", "四年级", "五年级", "六年级"]
-        df["年级排序"] = df["年级"].apply(
-            lambda x: grade_order.index(x) if x in grade_order else 99
-        )
+        列名与 pd.read_excel(总表, skiprows=7) 读回的列名一致（重复的列名依次加 .1、.2 后缀）
+        """
+        # 年级排序：一年级到六年级，其他年级排在最后
+        grade_rank = pd.Categorical(df["年级"], dtype=GRADE_DTYPE).codes
+        grade_rank = np.where(grade_rank < 0, 99, grade_rank)
 
-        # 提取班号并转换班名格式
-        def extract_class_number_and_format(class_name, grade):
-            """提取班号并格式化班名"""
-            import re
-
-            # 从班级名称中提取班号（如"四年级1班" -> 1, "六年级10班" -> 10）
-            match = re.search(r"(\d+)班", class_name)
-            if match:
-                class_num = int(match.group(1))
-                # 转换年级名为数字
-                grade_map = {
-                    "一年级": "一",
-                    "二年级": "二",
-                    "三年级": "三",
-                    "四年级": "四",
-                    "五年级": "五",
-                    "六年级": "六",
-                }
-                grade_short = grade_map.get(grade, grade)
-                formatted_name = f"{grade_short}{class_num}班"
-                return class_num, formatted_name
-            return 99, class_name  # 默认值
-
-        df[["班号", "格式化班名"]] = df.apply(
-            lambda row: pd.Series(
-                extract_class_number_and_format(row["班级名称"], row["年级"])
-            ),
-            axis=1,
-        )
+        # 提取班号并转换班名格式（如"四年级1班" -> 1、"四1班"），没有班号时保留原班名
+        class_info = normalize_class_names(df["班级名称"])
+        class_numbers = class_info["班号"].fillna(99).to_numpy(dtype=np.int64)
+        class_names = class_info["班级简称"].fillna(df["班级名称"])
 
         # 按年级、班号、学号排序（从小到大）
-        df_sorted = df.sort_values(["年级排序", "班号", "学号"]).reset_index(drop=True)
-
-        for idx, row in df_sorted.iterrows():
-            row_num = idx + 9
+        keys = pd.DataFrame(
+            {
+                "年级排序": grade_rank,
+                "班号": class_numbers,
+                "学号": df["学号"].to_numpy(),
+            }
+        )
+        order = keys.sort_values(["年级排序", "班号", "学号"]).index
+        df_sorted = df.iloc[order]
+        blank = np.full(len(df_sorted), None, dtype=object)
+
+        def column(name):
+            """取排序后的列，数据中没有该列时为空"""
+            if name in df_sorted.columns:
+                return df_sorted[name].astype(object).to_numpy()
+            return blank
+
+        # 50米×8往返跑（原始成绩列不存在时整组留空）
+        if "50米×8往返跑(s)" in df_sorted.columns:
+            run8 = [
+                column("50米×8往返跑(s)"),
+                column("往返跑得分"),
+                column("往返跑等级"),
+            ]
+        else:
+            run8 = [blank, blank, blank]
 
-            # 基本信息
-            ws.cell(row=row_num, column=1, value=row["年级"])
-            ws.cell(row=row_num, column=2, value=row["格式化班名"])
-            ws.cell(row=row_num, column=3, value=row["学号"])
-            ws.cell(row=row_num, column=4, value=row["姓名"])
-            ws.cell(row=row_num, column=5, value=row["性别"])
+        # 跳绳加分只在大于0时填写
+        bonus = df_sorted["附加分"].to_numpy()
 
+        values = [
+            column("年级"),
+            class_names.to_numpy(dtype=object)[order],
+            column("学号"),
+            column("姓名"),
+            column("性别"),
             # 身高体重BMI
-            ws.cell(row=row_num, column=6, value=row["身高(cm)"])
-            ws.cell(row=row_num, column=7, value=row["体重(kg)"])
-            ws.cell(row=row_num, column=8, value=row["BMI"])
-            ws.cell(row=row_num, column=9, value=row["BMI得分"])
-            ws.cell(row=row_num, column=10, value=row["BMI等级"])
-
+            column("身高(cm)"),
+            column("体重(kg)"),
+            column("BMI"),
+            column("BMI得分"),
+            column("BMI等级"),
             # 肺活量
-            ws.cell(row=row_num, column=11, value=row["肺活量(ml)"])
-            ws.cell(row=row_num, column=12, value=row["肺活量得分"])
-            ws.cell(row=row_num, column=13, value=row["肺活量等级"])
-
+            column("肺活量(ml)"),
+            column("肺活量得分"),
+            column("肺活量等级"),
             # 50米跑
-            ws.cell(row=row_num, column=14, value=row["50米跑(s)"])
-            ws.cell(row=row_num, column=15, value=row["50米跑得分"])
-            ws.cell(row=row_num, column=16, value=row["50米跑等级"])
-
+            column("50米跑(s)"),
+            column("50米跑得分"),
+            column("50米跑等级"),
             # 坐位体前屈
-            ws.cell(row=row_num, column=17, value=row["坐位体前屈(cm)"])
-            ws.cell(row=row_num, column=18, value=row["坐位体前屈得分"])
-            ws.cell(row=row_num, column=19, value=row["坐位体前屈等级"])
-
+            column("坐位体前屈(cm)"),
+            column("坐位体前屈得分"),
+            column("坐位体前屈等级"),
             # 跳绳
-            ws.cell(row=row_num, column=20, value=row["一分钟跳绳(个）"])
-            ws.cell(row=row_num, column=21, value=row["跳绳得分"])
-            ws.cell(
-                row=row_num,
-                column=22,
-                value=row["附加分"] if row["附加分"] > 0 else None,
-            )
-            ws.cell(row=row_num, column=23, value=row["跳绳等级"])
-
+            column("一分钟跳绳(个）"),
+            column("跳绳得分"),
+            np.where(bonus > 0, bonus.astype(object), None),
+            column("跳绳等级"),
             # 仰卧起坐
-            ws.cell(row=row_num, column=24, value=row["一分钟仰卧起坐(个)"])
-            ws.cell(row=row_num, column=25, value=row["仰卧起坐得分"])
-            ws.cell(row=row_num, column=26, value=row["仰卧起坐等级"])
+            column("一分钟仰卧起坐(个)"),
+            column("仰卧起坐得分"),
+            column("仰卧起坐等级"),
+            *run8,
+            # 综合得分
+            column("标准分"),
+            column("附加分"),
+            column("综合得分"),
+            column("综合等级"),
+            np.full(len(df_sorted), "", dtype=object),  # 备注
+        ]
 
-            # 50米×8往返跑
-            if "50米×8往返跑(s)" in row.index:
-                ws.cell(row=row_num, column=27, value=row["50米×8往返跑(s)"])
-                ws.cell(row=row_num, column=28, value=row["往返跑得分"])
-                ws.cell(row=row_num, column=29, value=row["往返跑等级"])
+        return pd.DataFrame(dict(zip(self.school_table_columns(), values)))
 
-            # 综合得分
-            ws.cell(row=row_num, column=30, value=row["标准分"])
-            ws.cell(row=row_num, column=31, value=row["附加分"])
-            ws.cell(row=row_num, column=32, value=row["综合得分"])
-            ws.cell(row=row_num, column=33, value=row["综合等级"])
-            ws.cell(row=row_num, column=34, value="")  # 备注
+    def school_table_columns(self):
+        """总表学生数据的列名，重复的表头与 pandas 读取时一样依次加 .1、.2 后缀"""
+        return unique_columns(self.STUDENT_DATA_HEADERS)
 
-    def apply_formatting(self, ws):
-        """应用Excel格式化"""
-        from openpyxl.styles import Font, Alignment
+    def add_student_data(self, ws, school_table):
+        """添加学生数据（从第9行开始），school_table 由 build_school_table 生成"""
+        for row in school_table.itertuples(index=False, name=None):
+            ws.append(row)
 
+    def apply_formatting(self, ws):
+        """应用Excel格式化（合并单元格和列宽，表头样式由 add_header_info 设置）"""
         # 合并单元格
         # 第1行BCDE合并
-        ws.merge_cells("B1:E1")
+        ws.merge("B1:E1")
         # 第1行GH合并
-        ws.merge_cells("G1:H1")
+        ws.merge("G1:H1")
 
         # 第K栏(第11列)第1到6行合并
-        ws.merge_cells("K1:K6")
-
-        # 设置第1到6行全部居中和粗体
-        center_alignment = Alignment(horizontal="center", vertical="center")
-        bold_font = Font(bold=True)
-
-        for row in range(1, 7):
-            for col in range(1, 35):  # 假设有34列
-                cell = ws.cell(row=row, column=col)
-                cell.alignment = center_alignment
-                cell.font = bold_font
+        ws.merge("K1:K6")
 
         # 设置列宽
         column_widths = {
@@ -2360,7 +711,7 @@ class NationalStandardConverter:
         }
 
         for col_letter, width in column_widths.items():
-            ws.column_dimensions[col_letter].width = width
+            ws.set_column_width(col_letter, width)
 
 
 def parse_arguments():
@@ -2374,6 +725,22 @@ def parse_arguments():
     parser.add_argument(
         "--output-file", "-o", type=str, required=True, help="输出Excel文件路径"
     )
+    parser.add_argument(
+        "--grades",
+        "-g",
+        type=str,
+        help="参与评分的年级，逗号分隔（默认：四年级,六年级）",
+    )
+    parser.add_argument(
+        "--read-engine",
+        choices=READ_ENGINES,
+        help="Excel读取引擎（默认 auto：安装 python-calamine 时使用 calamine）",
+    )
+    parser.add_argument(
+        "--write-engine",
+        choices=WRITE_ENGINES,
+        help="Excel写入引擎（默认 auto：安装 xlsxwriter 时使用 xlsxwriter）",
+    )
     return parser.parse_args()
 
 
@@ -2389,6 +756,8 @@ def main():
     try:
         # 解析命令行参数
         args = parse_arguments()
+        set_read_engine(args.read_engine)
+        set_write_engine(args.write_engine)
 
         # 验证输入文件是否存在
         if not os.path.exists(args.input_file):
@@ -2402,7 +771,8 @@ def main():
             print(f"✓ 创建输出目录: {output_dir}".encode("utf-8"))
 
         # 创建转换器
-        converter = NationalStandardConverter()
+        target_grades = args.grades.split(",") if args.grades else None
+        converter = NationalStandardConverter(target_grades=target_grades)
 
         print(f"✓ 开始处理文件: {args.input_file}".encode("utf-8"))
         print(f"✓ 输出文件: {args.output_file}".encode("utf-8"))